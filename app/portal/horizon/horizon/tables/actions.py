@@ -34,6 +34,7 @@ from horizon import messages
 from horizon.utils import functions
 from horizon.utils import html
 from horizon.utils import settings as utils_settings
+from horizon.utils import urls
 
 
 LOG = logging.getLogger(__name__)
@@ -406,7 +407,8 @@ class LinkAction(BaseAction):
         try:
             if datum:
                 obj_id = self.table.get_object_id(datum)
-                return urlresolvers.reverse(self.url, args=(obj_id,))
+                return urls.reverse_with_id(self.table.request, self.url,
+                                            obj_id)
             else:
                 return urlresolvers.reverse(self.url)
         except urlresolvers.NoReverseMatch as ex:
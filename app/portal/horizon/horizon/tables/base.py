@@ -14,6 +14,7 @@
 
 import collections
 import copy
+import hashlib
 import inspect
 import json
 import logging
@@ -21,6 +22,7 @@ from operator import attrgetter
 import sys
 
 from django.conf import settings
+from django.core.cache import cache
 from django.core import exceptions as core_exceptions
 from django.core import urlresolvers
 from django import forms
@@ -34,6 +36,8 @@ from django.utils import http
 from django.utils.http import urlencode
 from django.utils.safestring import mark_safe
 from django.utils import termcolors
+from django.utils import timezone
+from django.utils import translation
 from django.utils.translation import ugettext_lazy as _
 import six
 
@@ -44,6 +48,7 @@ from horizon import messages
 from horizon.tables.actions import FilterAction
 from horizon.tables.actions import LinkAction
 from horizon.utils import html
+from horizon.utils import urls
 
 
 LOG = logging.getLogger(__name__)
@@ -51,6 +56,14 @@ PALETTE = termcolors.PALETTES[termcolors.DEFAULT_PALETTE]
 STRING_SEPARATOR = "__"
 
 
+def _id_to_text(obj_id):
+    if not isinstance(obj_id, six.text_type):
+        obj_id = str(obj_id)
+        if six.PY2:
+            obj_id = obj_id.decode('utf-8')
+    return obj_id
+
+
 @six.python_2_unicode_compatible
 class Column(html.HTMLElement):
     """A class which represents a single column in a :class:`.DataTable`.
@@ -471,7 +484,7 @@ class Column(html.HTMLElement):
                 return self.link(datum, request=self.table.request)
             return self.link(datum)
         try:
-            return urlresolvers.reverse(self.link, args=(obj_id,))
+            return urls.reverse_with_id(self.table.request, self.link, obj_id)
         except urlresolvers.NoReverseMatch:
             return self.link
 
@@ -583,6 +596,8 @@ class Row(html.HTMLElement):
         self.table = table
         self.datum = datum
         self.selected = False
+        self._rendered = None
+        self._cache_key = None
         if self.datum:
             self.load_cells()
         else:
@@ -663,9 +678,27 @@ class Row(html.HTMLElement):
         else:
             return ''
 
+    def load_rendered(self, datum, rendered):
+        """Sets the row up for ``datum`` from a cached rendering of it.
+
+        The cells are not loaded, :meth:`render` returns ``rendered``.
+        """
+        self.datum = datum
+        self.id = "%(table)s%(sep)srow%(sep)s%(id)s" % {
+            "table": self.table.name,
+            "sep": STRING_SEPARATOR,
+            "id": self.table.get_object_id(datum)}
+        self._rendered = rendered
+
     def render(self):
-        return render_to_string("horizon/common/_data_table_row.html",
-                                {"row": self})
+        if self._rendered is not None:
+            return self._rendered
+        rendered = render_to_string("horizon/common/_data_table_row.html",
+                                    {"row": self})
+        if self._cache_key is not None:
+            cache.set(self._cache_key, rendered,
+                      self.table._meta.row_cache_timeout)
+        return rendered
 
     def get_cells(self):
         """Returns the bound cells for this row in order."""
@@ -1068,6 +1101,16 @@ class DataTableOptions(object):
 
         A list of permission names which this table requires in order to be
         displayed. Defaults to an empty list (``[]``).
+
+    .. attribute:: row_cache_timeout
+
+        The number of seconds the rendered rows of the table are kept in the
+        Django cache, so that the rows of unchanged data objects are not
+        rendered again. Rows are cached per table, user, project, roles,
+        language, time zone and data object, as given by
+        :meth:`~horizon.tables.DataTable.get_object_fingerprint`. Only set it
+        when the rendering of a row, including whether its row actions are
+        allowed, depends on nothing else. Default: ``None`` (no caching).
     """
     def __init__(self, options):
         self.name = getattr(options, 'name', self.__class__.__name__)
@@ -1097,6 +1140,7 @@ class DataTableOptions(object):
                                        "no_data_message",
                                        _("No items to display."))
         self.permissions = getattr(options, 'permissions', [])
+        self.row_cache_timeout = getattr(options, 'row_cache_timeout', None)
 
         # Set self.filter if we have any FilterActions
         filter_actions = [action for action in self.table_actions if
@@ -1453,20 +1497,10 @@ class DataTable(object):
         comparison.
 
         Uses :meth:`~horizon.tables.DataTable.get_object_id` internally.
+        The objects are looked up in an index of the table's dataset, so
+        looking up the objects of many selected rows stays linear.
         """
-        if not isinstance(lookup, six.text_type):
-            lookup = str(lookup)
-            if six.PY2:
-                lookup = lookup.decode('utf-8')
-        matches = []
-        for datum in self.data:
-            obj_id = self.get_object_id(datum)
-            if not isinstance(obj_id, six.text_type):
-                obj_id = str(obj_id)
-                if six.PY2:
-                    obj_id = obj_id.decode('utf-8')
-            if obj_id == lookup:
-                matches.append(datum)
+        matches = self._get_object_index().get(_id_to_text(lookup), [])
         if len(matches) > 1:
             raise ValueError("Multiple matches were returned for that id: %s."
                              % matches)
@@ -1476,6 +1510,23 @@ class DataTable(object):
                                      % lookup)
         return matches[0]
 
+    def _get_object_index(self):
+        """Returns a dict of the lists of data objects by their ID as text.
+
+        The index is built on first use, and built again whenever ``data``
+        is replaced or its length changes.
+        """
+        data = self.data or []
+        index = getattr(self, '_object_index', None)
+        if index is None or index[0] is not data or index[1] != len(data):
+            objects = {}
+            for datum in data:
+                obj_id = _id_to_text(self.get_object_id(datum))
+                objects.setdefault(obj_id, []).append(datum)
+            index = (data, len(data), objects)
+            self._object_index = index
+        return index[2]
+
     @property
     def has_actions(self):
         """Indicates whether there are any available actions on this table.
@@ -1667,10 +1718,18 @@ class DataTable(object):
             if new_row.ajax and new_row.ajax_action_name == action_name:
                 try:
                     datum = new_row.get_data(request, obj_id)
+                    cache_key = None
                     if self.get_object_id(datum) == self.current_item_id:
                         self.selected = True
                         new_row.classes.append('current_selected')
-                    new_row.load_cells(datum)
+                    else:
+                        cache_key = self.get_row_cache_key(datum)
+                    rendered = cache.get(cache_key) if cache_key else None
+                    if rendered is not None:
+                        new_row.load_rendered(datum, rendered)
+                    else:
+                        new_row.load_cells(datum)
+                        new_row._cache_key = cache_key
                     error = False
                 except Exception:
                     datum = None
@@ -1802,6 +1861,66 @@ class DataTable(object):
         """
         return obj_id
 
+    def get_object_fingerprint(self, datum):
+        """Returns a string which changes whenever the data object changes.
+
+        It keys the cached renderings of the rows when the
+        ``row_cache_timeout`` option is set. By default it is the JSON of
+        the ``to_dict()`` of the object, if it has one, and of its other
+        attributes, slots included, but for the wrapped API resource and
+        the request. Returns ``None`` for objects which can not be
+        serialized, their rows are not cached.
+        """
+        data = {}
+        if hasattr(datum, 'to_dict'):
+            data['dict'] = datum.to_dict()
+        if isinstance(datum, dict):
+            data['attrs'] = datum
+        else:
+            attrs = dict(getattr(datum, '__dict__', {}))
+            for cls in type(datum).__mro__:
+                slots = getattr(cls, '__slots__', ())
+                if isinstance(slots, six.string_types):
+                    slots = (slots,)
+                for slot in slots:
+                    if hasattr(datum, slot):
+                        attrs[slot] = getattr(datum, slot)
+            attrs.pop('_apiresource', None)
+            attrs.pop('request', None)
+            data['attrs'] = attrs
+        try:
+            return json.dumps(data, sort_keys=True, default=repr)
+        except (TypeError, ValueError):
+            return None
+
+    def get_row_cache_key(self, datum):
+        """Returns the key of the cached rendering of the row of ``datum``.
+
+        Returns ``None`` if the rows of the table are not cached or the data
+        object has no fingerprint.
+        """
+        if not self._meta.row_cache_timeout:
+            return None
+        fingerprint = self.get_object_fingerprint(datum)
+        if fingerprint is None:
+            return None
+        request = self.request
+        user = request.user
+        context = [self.__class__.__module__, self.__class__.__name__,
+                   self.name, self.get_absolute_url(),
+                   request.GET.get(self._meta.pagination_param),
+                   request.GET.get(self._meta.prev_pagination_param),
+                   getattr(user, 'id', None),
+                   getattr(user, 'project_id', None),
+                   getattr(user, 'roles', None),
+                   getattr(user, 'services_region', None),
+                   translation.get_language(),
+                   timezone.get_current_timezone_name(),
+                   fingerprint]
+        digest = hashlib.sha256(json.dumps(context, default=repr)
+                                .encode('utf-8')).hexdigest()
+        return 'horizon:table_row:%s' % digest
+
     def get_object_id(self, datum):
         """Returns the identifier for the object this row will represent.
 
@@ -1923,11 +2042,22 @@ class DataTable(object):
         """Return the row data for this table broken out by columns."""
         rows = []
         try:
-            for datum in self.filtered_data:
-                row = self._meta.row_class(self, datum)
+            data = self.filtered_data
+            cache_keys = [self.get_row_cache_key(datum) for datum in data]
+            rendered = {}
+            if any(cache_keys):
+                rendered = cache.get_many([key for key in cache_keys if key])
+            for datum, cache_key in zip(data, cache_keys):
                 if self.get_object_id(datum) == self.current_item_id:
+                    row = self._meta.row_class(self, datum)
                     self.selected = True
                     row.classes.append('current_selected')
+                elif cache_key in rendered:
+                    row = self._meta.row_class(self)
+                    row.load_rendered(datum, rendered[cache_key])
+                else:
+                    row = self._meta.row_class(self, datum)
+                    row._cache_key = cache_key
                 rows.append(row)
         except Exception:
             # Exceptions can be swallowed at the template level here,
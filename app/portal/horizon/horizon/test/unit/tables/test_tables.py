@@ -18,6 +18,7 @@
 import unittest
 import uuid
 
+from django.core.cache import cache
 from django.core.urlresolvers import reverse
 from django import forms
 from django import http
@@ -488,6 +489,57 @@ class DataTableTests(test.TestCase):
                                  ['<Column: multi_select>',
                                   '<Column: id>'])
 
+    def test_get_object_by_id(self):
+        self.table = MyTable(self.request, TEST_DATA)
+        with mock.patch.object(self.table, 'get_object_id',
+                               wraps=self.table.get_object_id) as mock_id:
+            self.assertIs(TEST_DATA[1], self.table.get_object_by_id('2'))
+            self.assertIs(TEST_DATA[2], self.table.get_object_by_id(3))
+            self.assertIs(TEST_DATA[3], self.table.get_object_by_id(u'4'))
+            # The index of the objects is only built once.
+            self.assertEqual(len(TEST_DATA), mock_id.call_count)
+
+        self.assertRaises(exceptions.Http302,
+                          self.table.get_object_by_id, '5')
+        # The index is built again when the data changes.
+        self.table.data = TEST_DATA + (FakeObject('5', 'object_5', 'value_5',
+                                                  'up'),)
+        self.assertEqual('object_5', self.table.get_object_by_id('5').name)
+        self.table.data = TEST_DATA + TEST_DATA_2
+        self.assertRaises(ValueError, self.table.get_object_by_id, '1')
+
+    def test_table_row_cache(self):
+        class TempTable(MyTable):
+            class Meta(object):
+                name = "my_table"
+                columns = ('id', 'name', 'value', 'optional', 'status')
+                row_class = MyRow
+                row_actions = (MyAction, MyLinkAction)
+                row_cache_timeout = 60
+
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.table = TempTable(self.request, TEST_DATA)
+        rendered = [row.render() for row in self.table.get_rows()]
+
+        self.table = TempTable(self.request, TEST_DATA)
+        rows = self.table.get_rows()
+        self.assertEqual(rendered, [row.render() for row in rows])
+        self.assertEqual([], rows[0].cells)
+        self.assertEqual('my_table__row__1', rows[0].id)
+
+        # Changed objects are rendered again.
+        data = (FakeObject('1', 'object_1', 'value_changed', 'up',
+                           'optional_1', 'excluded_1'),)
+        self.table = TempTable(self.request, data)
+        row = self.table.get_rows()[0]
+        self.assertNotEqual([], row.cells)
+        self.assertIn('value_changed', row.render())
+
+    def test_table_row_cache_disabled(self):
+        self.table = MyTable(self.request, TEST_DATA)
+        self.assertIsNone(self.table.get_row_cache_key(TEST_DATA[0]))
+
     def test_table_natural_no_inline_editing(self):
         class TempTable(MyTable):
             name = tables.Column(get_name,
@@ -10,6 +10,12 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import gc
+import threading
+import warnings
+
+import mock
+
 from horizon.test import helpers as test
 from horizon.utils import memoized
 
@@ -81,3 +87,96 @@ class MemoizedTests(test.TestCase):
             self.assertEqual(output2[position], leader)
             # check that some_other_func returned a memoized list.
             self.assertIs(output1, output2)
+
+    def test_memoized_lru_eviction(self):
+        values_list = []
+
+        @memoized.memoized(max_size=2)
+        def cache_calls(param):
+            values_list.append(param)
+            return param
+
+        cache_calls(1)
+        cache_calls(2)
+        cache_calls(1)
+        cache_calls(3)
+        # 2 was the least recently used and got evicted.
+        cache_calls(1)
+        cache_calls(2)
+        self.assertEqual([1, 2, 3, 2], values_list)
+        info = cache_calls.cache_info()
+        self.assertEqual(2, info['hits'])
+        self.assertEqual(4, info['misses'])
+        self.assertEqual(2, info['evictions'])
+        self.assertEqual(2, info['size'])
+
+    def test_memoized_timeout(self):
+        values_list = []
+
+        @memoized.memoized(timeout=60)
+        def cache_calls(param):
+            values_list.append(param)
+            return param
+
+        with mock.patch('time.time', return_value=1000):
+            cache_calls(1)
+            cache_calls(1)
+        with mock.patch('time.time', return_value=1061):
+            cache_calls(1)
+        self.assertEqual([1, 1], values_list)
+        self.assertEqual(1, cache_calls.cache_info()['expirations'])
+
+    def test_memoized_drops_collected_arguments(self):
+        class Request(object):
+            pass
+
+        @memoized.memoized
+        def cache_calls(request):
+            return True
+
+        request = Request()
+        cache_calls(request)
+        self.assertEqual(1, cache_calls.cache_info()['size'])
+        del request
+        gc.collect()
+        self.assertEqual(0, cache_calls.cache_info()['size'])
+
+    def test_memoized_unhashable_key(self):
+        @memoized.memoized
+        def cache_calls(param):
+            return len(param)
+
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter('always')
+            self.assertEqual(2, cache_calls([1, 2]))
+        self.assertEqual(memoized.UnhashableKeyWarning,
+                         caught[0].category)
+        self.assertEqual(0, cache_calls.cache_info()['size'])
+
+    def test_memoized_cache_clear(self):
+        @memoized.memoized
+        def cache_calls(param):
+            return param
+
+        cache_calls(1)
+        cache_calls.cache_clear()
+        self.assertEqual(0, cache_calls.cache_info()['size'])
+        self.assertEqual(0, cache_calls.cache_info()['misses'])
+
+    def test_memoized_keys_computed_concurrently(self):
+        results = {}
+
+        @memoized.memoized
+        def cache_calls(param):
+            if param == 0:
+                # Computing another key from another thread does not wait
+                # for this one.
+                thread = threading.Thread(
+                    target=lambda: results.update(other=cache_calls(1)))
+                thread.start()
+                thread.join(5)
+                return thread.is_alive()
+            return param
+
+        self.assertFalse(cache_calls(0))
+        self.assertEqual(1, results['other'])
@@ -0,0 +1,64 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from django.conf.urls import url
+from django.core import urlresolvers
+from django import http
+from django.test.utils import override_settings
+import mock
+
+from horizon.test import helpers as test
+from horizon.utils import urls
+
+
+def _view(request, *args):
+    return http.HttpResponse()
+
+
+urlpatterns = [
+    url(r'^objects/([^/]+)/$', _view, name='object'),
+    url(r'^objects/([^/]+)/items/([^/]+)/$', _view, name='item'),
+    url(r'^numbers/(\d+)/$', _view, name='number'),
+]
+
+
+@override_settings(ROOT_URLCONF=__name__)
+class ReverseWithIdTests(test.TestCase):
+    def setUp(self):
+        super(ReverseWithIdTests, self).setUp()
+        self.request = http.HttpRequest()
+
+    def test_reverse_with_id(self):
+        with mock.patch.object(urlresolvers, 'reverse',
+                               wraps=urlresolvers.reverse) as mock_reverse:
+            self.assertEqual('/objects/abc-1/', urls.reverse_with_id(
+                self.request, 'object', 'abc-1'))
+            self.assertEqual('/objects/abc_2/', urls.reverse_with_id(
+                self.request, 'object', 'abc_2'))
+            self.assertEqual('/objects/a/items/3/', urls.reverse_with_id(
+                self.request, 'item', 3, args=['a']))
+            # The patterns are only reversed once per request.
+            self.assertEqual(2, mock_reverse.call_count)
+
+    def test_reverse_with_id_quoted(self):
+        self.assertEqual('/objects/a%20b/', urls.reverse_with_id(
+            self.request, 'object', 'a b'))
+
+    def test_reverse_with_id_rejected_by_pattern(self):
+        self.assertEqual('/numbers/42/', urls.reverse_with_id(
+            self.request, 'number', 42))
+        self.assertRaises(urlresolvers.NoReverseMatch, urls.reverse_with_id,
+                          self.request, 'number', 'abc')
+
+    def test_reverse_with_id_without_request(self):
+        self.assertEqual('/objects/abc/', urls.reverse_with_id(
+            None, 'object', 'abc'))
@@ -0,0 +1,119 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import threading
+import time
+
+from django.test.utils import override_settings
+
+from horizon.test import helpers as test
+from horizon.utils import workers
+
+
+def _fail():
+    raise ValueError('failed')
+
+
+class WorkersTests(test.TestCase):
+    def setUp(self):
+        super(WorkersTests, self).setUp()
+        workers.reset_executor()
+        workers.stats.reset()
+        self.addCleanup(workers.reset_executor)
+        self.release = threading.Event()
+        self.addCleanup(self.release.set)
+
+    def test_executor_is_shared(self):
+        self.assertIs(workers.get_executor(), workers.get_executor())
+
+    def test_gather(self):
+        ret = workers.gather({'one': lambda: 1,
+                              'two': (pow, 2, 5),
+                              'fail': _fail})
+
+        self.assertEqual({'one': 1, 'two': 32}, ret)
+        stats = workers.get_stats()
+        self.assertEqual(3, stats['submitted'])
+        self.assertEqual(3, stats['completed'])
+        self.assertEqual(1, stats['failed'])
+        self.assertEqual(0, stats['queued'])
+        self.assertEqual(0, stats['running'])
+
+    def test_gather_raise_errors(self):
+        self.assertRaises(ValueError, workers.gather,
+                          {'one': lambda: 1, 'fail': _fail},
+                          raise_errors=True)
+
+    def test_gather_timeout_per_call(self):
+        ret = workers.gather({'fast': (time.sleep, 0.05),
+                              'slow': self.release.wait},
+                             timeout={'fast': 5, 'slow': 0.1})
+
+        self.assertEqual({'fast': None}, ret)
+        self.assertEqual(1, workers.get_stats()['timed_out'])
+
+    @override_settings(HORIZON_WORKER_TIMEOUT=0.1)
+    def test_gather_default_timeout(self):
+        ret = workers.gather({'slow': self.release.wait})
+
+        self.assertEqual({}, ret)
+
+    def test_gather_deadline(self):
+        self.assertRaises(workers.DeadlineExceeded, workers.gather,
+                          {'slow': self.release.wait},
+                          deadline=time.time() + 0.1, raise_errors=True)
+
+    @override_settings(HORIZON_WORKER_POOL_SIZE=1)
+    def test_gather_cancels_queued_calls(self):
+        ret = workers.gather({'slow': self.release.wait,
+                              'queued': lambda: 1}, timeout=0.1)
+
+        self.assertEqual({}, ret)
+        stats = workers.get_stats()
+        self.assertEqual(2, stats['timed_out'])
+        self.assertEqual(1, stats['cancelled'])
+        self.assertEqual(0, stats['queued'])
+
+    @override_settings(HORIZON_WORKER_POOL_SIZE=1)
+    def test_gather_nested(self):
+        def outer():
+            return workers.gather({'inner': lambda: 1})
+
+        ret = workers.gather({'outer': outer})
+
+        self.assertEqual({'outer': {'inner': 1}}, ret)
+
+    @override_settings(HORIZON_WORKER_POOL_SIZE=2,
+                       HORIZON_WORKER_MAX_PENDING=2)
+    def test_gather_saturated_pool(self):
+        # Both calls are given up on but keep running.
+        workers.gather({'stuck1': self.release.wait,
+                        'stuck2': self.release.wait}, timeout=0.05)
+
+        started = time.time()
+        ret = workers.gather({'one': lambda: 1, 'two': (pow, 2, 5),
+                              'thread': threading.current_thread},
+                             timeout=0.05, raise_errors=True)
+
+        # The calls which can not be queued run in the current thread.
+        self.assertEqual({'one': 1, 'two': 32,
+                          'thread': threading.current_thread()}, ret)
+        self.assertLess(time.time() - started, 1)
+        stats = workers.get_stats()
+        self.assertEqual(3, stats['inline'])
+        self.assertEqual(2, stats['timed_out'])
+
+    @override_settings(HORIZON_WORKER_CALL_TIMEOUT=5)
+    def test_get_call_timeout(self):
+        self.assertIsNone(workers.get_call_timeout())
+        ret = workers.gather({'timeout': workers.get_call_timeout})
+        self.assertEqual({'timeout': 5}, ret)
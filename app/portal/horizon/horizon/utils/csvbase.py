@@ -104,7 +104,12 @@ class BaseCsvResponse(CsvDataMixin, HttpResponse):
 
 class BaseCsvStreamingResponse(CsvDataMixin, StreamingHttpResponse):
 
-    """Base CSV Streaming class. Provides streaming response for CSV data."""
+    """Base CSV Streaming class. Provides streaming response for CSV data.
+
+    The rows are written and sent as :meth:`get_row_data` yields them.  If
+    a ``footer_template`` is given, it is rendered once all the rows have
+    been written, so it can show data gathered while producing them.
+    """
 
     def __init__(self, request, template, context, content_type, **kwargs):
         super(BaseCsvStreamingResponse, self).__init__()
@@ -117,6 +122,11 @@ class BaseCsvStreamingResponse(CsvDataMixin, StreamingHttpResponse):
             # Display some header info if provided as a template
             header_template = django_template.loader.get_template(template)
             self.header = header_template.render(self.context, request)
+        self.footer_template = None
+        if kwargs.get("footer_template"):
+            self.footer_template = django_template.loader.get_template(
+                kwargs["footer_template"])
+        self._footer_request = request
 
         self._closable_objects.append(self.out)
 
@@ -124,6 +134,7 @@ class BaseCsvStreamingResponse(CsvDataMixin, StreamingHttpResponse):
 
     def buffer(self):
         buf = self.out.getvalue()
+        self.out.seek(0)
         self.out.truncate(0)
         return buf
 
@@ -138,5 +149,10 @@ class BaseCsvStreamingResponse(CsvDataMixin, StreamingHttpResponse):
             self.write_csv_row(row)
             yield self.buffer()
 
+        if self.footer_template:
+            self.out.write(self.encode(self.footer_template.render(
+                self.context, self._footer_request)))
+            yield self.buffer()
+
     def get_row_data(self):
         return []
@@ -15,9 +15,22 @@
 import collections
 import functools
 import threading
+import time
 import warnings
 import weakref
 
+import six
+
+
+# Default number of results kept by each memoized function.
+DEFAULT_MAX_SIZE = 1000
+
+# Argument types which are used in cache keys as they are. They can not be
+# weakly referenced, and checking for them is much cheaper than failing to
+# create a weak reference.
+_PLAIN_TYPES = (six.binary_type, six.text_type, float,
+                type(None)) + six.integer_types
+
 
 class UnhashableKeyWarning(RuntimeWarning):
     """Raised when trying to memoize a function with an unhashable argument."""
@@ -25,11 +38,13 @@ class UnhashableKeyWarning(RuntimeWarning):
 
 def _try_weakref(arg, remove_callback):
     """Return a weak reference to arg if possible, or arg itself if not."""
+    if isinstance(arg, _PLAIN_TYPES):
+        return arg
     try:
         arg = weakref.ref(arg, remove_callback)
     except TypeError:
-        # Not all types can have a weakref. That includes strings
-        # and floats and such, so just pass them through directly.
+        # Not all types can have a weakref. That includes tuples and such,
+        # so just pass them through directly.
         pass
     return arg
 
@@ -38,6 +53,8 @@ def _get_key(args, kwargs, remove_callback):
     """Calculate the cache key, using weak references where possible."""
     # Use tuples, because lists are not hashable.
     weak_args = tuple(_try_weakref(arg, remove_callback) for arg in args)
+    if not kwargs:
+        return weak_args, ()
     # Use a tuple of (key, values) pairs, because dict is not hashable.
     # Sort it, so that we don't depend on the order of keys.
     weak_kwargs = tuple(sorted(
@@ -46,7 +63,97 @@ def _get_key(args, kwargs, remove_callback):
     return weak_args, weak_kwargs
 
 
-def memoized(func):
+class _Cache(object):
+    """A bounded LRU mapping with optional expiry and usage counters.
+
+    Entries are dropped when their arguments are garbage collected, when
+    more than ``max_size`` entries are stored or ``timeout`` seconds after
+    they were stored.
+    """
+
+    def __init__(self, max_size, timeout):
+        self.max_size = max_size
+        self.timeout = timeout
+        self.data = collections.OrderedDict()
+        # Guards self.data and self.computing, held only for dictionary
+        # operations.
+        self.lock = threading.Lock()
+        # The lock serializing the computation of the value of each key
+        # being computed, and the number of threads using it.  The entry of
+        # a key is dropped once no thread uses it.
+        self.computing = {}
+        # Keys whose arguments were garbage collected. Weakref callbacks
+        # may run at any point, even while self.lock is held, so they only
+        # queue the keys for removal.
+        self.dead = collections.deque()
+        self.hits = self.misses = self.evictions = self.expirations = 0
+
+    def _purge(self):
+        while self.dead:
+            self.data.pop(self.dead.popleft(), None)
+
+    def get(self, key):
+        with self.lock:
+            self._purge()
+            try:
+                value, expires = self.data.pop(key)
+            except KeyError:
+                return False, None
+            if expires is not None and expires < time.time():
+                self.expirations += 1
+                return False, None
+            # Reinsert the entry to mark it as the most recently used.
+            self.data[key] = value, expires
+            self.hits += 1
+            return True, value
+
+    def acquire(self, key):
+        """Return the lock computing ``key``, once acquired."""
+        with self.lock:
+            entry = self.computing.get(key)
+            if entry is None:
+                entry = self.computing[key] = [threading.RLock(), 0]
+            entry[1] += 1
+        entry[0].acquire()
+        return entry[0]
+
+    def release(self, key, lock):
+        lock.release()
+        with self.lock:
+            entry = self.computing[key]
+            entry[1] -= 1
+            if not entry[1]:
+                del self.computing[key]
+
+    def set(self, key, value):
+        expires = None
+        if self.timeout is not None:
+            expires = time.time() + self.timeout
+        with self.lock:
+            self._purge()
+            self.misses += 1
+            self.data[key] = value, expires
+            while self.max_size is not None and \
+                    len(self.data) > self.max_size:
+                self.data.popitem(last=False)
+                self.evictions += 1
+
+    def info(self):
+        with self.lock:
+            self._purge()
+            return {'hits': self.hits, 'misses': self.misses,
+                    'evictions': self.evictions,
+                    'expirations': self.expirations,
+                    'size': len(self.data), 'max_size': self.max_size}
+
+    def clear(self):
+        with self.lock:
+            self.data.clear()
+            self.dead.clear()
+            self.hits = self.misses = self.evictions = self.expirations = 0
+
+
+def memoized(func=None, max_size=DEFAULT_MAX_SIZE, timeout=None):
     """Decorator that caches function calls.
 
     Caches the decorated function's return value the first time it is called
@@ -54,13 +161,22 @@ def memoized(func):
     cached value is returned instead of calling the decorated function again.
 
     The cache uses weak references to the passed arguments, so it doesn't keep
-    them alive in memory forever.
+    them alive in memory forever.  It holds at most ``max_size`` results,
+    dropping the least recently used ones first, and if ``timeout`` is set
+    results are recomputed that many seconds after they were cached.  Use
+    ``@memoized(max_size=None)`` for an unbounded cache.
+
+    The decorated function gets a ``cache_info()`` method returning the hit,
+    miss, eviction and expiration counters, and a ``cache_clear()`` method.
     """
-    # The dictionary in which all the data will be cached. This is a separate
+    if func is None:
+        return functools.partial(memoized, max_size=max_size,
+                                 timeout=timeout)
+
+    # The cache in which all the data will be stored. This is a separate
     # instance for every decorated function, and it's stored in a closure of
     # the wrapped function.
-    cache = {}
-    locks = collections.defaultdict(threading.Lock)
+    cache = _Cache(max_size, timeout)
 
     @functools.wraps(func)
     def wrapped(*args, **kwargs):
@@ -71,28 +187,12 @@ def memoized(func):
 
         def remove(ref):
             """A callback to remove outdated items from cache."""
-            try:
-                # The key here is from closure, and is calculated later.
-                del cache[key]
-                del locks[key]
-            except KeyError:
-                # Some other weak reference might have already removed that
-                # key -- in that case we don't need to do anything.
-                pass
+            # The key here is from closure, and is calculated later.
+            cache.dead.append(key)
 
         key = _get_key(args, kwargs, remove)
         try:
-            with locks[key]:
-                try:
-                    # We want cache hit to be as fast as possible, and don't
-                    # really care much about the speed of a cache miss, because
-                    # it will only happen once and likely calls some external
-                    # API, database, or some other slow thing. That's why the
-                    # hit is in straightforward code, and the miss is in an
-                    # exception.
-                    value = cache[key]
-                except KeyError:
-                    value = cache[key] = func(*args, **kwargs)
+            hash(key)
         except TypeError:
             # The calculated key may be unhashable when an unhashable
             # object, such as a list, is passed as one of the arguments. In
@@ -101,8 +201,25 @@ def memoized(func):
             warnings.warn(
                 "The key %r is not hashable and cannot be memoized."
                 % (key,), UnhashableKeyWarning, 2)
-            value = func(*args, **kwargs)
+            return func(*args, **kwargs)
+
+        found, value = cache.get(key)
+        if found:
+            return value
+        # Only the threads computing the same key wait on each other.
+        lock = cache.acquire(key)
+        try:
+            # Another thread may have computed the value while we waited.
+            found, value = cache.get(key)
+            if not found:
+                value = func(*args, **kwargs)
+                cache.set(key, value)
+        finally:
+            cache.release(key, lock)
         return value
+
+    wrapped.cache_info = cache.info
+    wrapped.cache_clear = cache.clear
     return wrapped
 
 # We can use @memoized for methods now too, because it uses weakref and so
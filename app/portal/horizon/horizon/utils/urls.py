@@ -0,0 +1,70 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Reversal of URLs which only differ by the id of an object.
+
+Tables reverse the same URL pattern for the links and actions of every row,
+with the id of the row's object as last argument.  :func:`reverse_with_id`
+reverses the pattern once per request with a placeholder in place of the
+id, and builds the URL of each object by putting its id in place of the
+placeholder.
+
+Ids are only put in place of the placeholder when they consist of letters,
+digits, underscores and hyphens, which need no quoting in a URL and which
+the patterns accepting the placeholder accept too.  Other ids, and patterns
+which do not accept the placeholder, such as numeric ones, are reversed as
+usual.
+"""
+
+import re
+
+from django.core import urlresolvers
+import six
+
+PLACEHOLDER = 'Horizon_URL-template0'
+_SIMPLE_ID = re.compile(r'^[A-Za-z0-9_-]+$')
+
+
+def _get_template(viewname, args):
+    try:
+        url = urlresolvers.reverse(viewname, args=args + (PLACEHOLDER,))
+    except urlresolvers.NoReverseMatch:
+        return None
+    if url.count(PLACEHOLDER) != 1:
+        return None
+    return tuple(url.split(PLACEHOLDER))
+
+
+def reverse_with_id(request, viewname, obj_id, args=()):
+    """Returns ``reverse(viewname, args=args + (obj_id,))``.
+
+    The URL patterns are reversed once for all the objects of ``request``.
+    Without a request this is the same as calling ``reverse``.
+    """
+    args = tuple(args)
+    text_id = six.text_type(obj_id)
+    if request is None or not _SIMPLE_ID.match(text_id):
+        return urlresolvers.reverse(viewname, args=args + (obj_id,))
+    templates = getattr(request, '_url_templates', None)
+    if templates is None:
+        templates = request._url_templates = {}
+    key = (viewname, args)
+    try:
+        template = templates[key]
+    except KeyError:
+        template = templates[key] = _get_template(viewname, args)
+    except TypeError:
+        # Unhashable arguments.
+        template = None
+    if template is None:
+        return urlresolvers.reverse(viewname, args=args + (obj_id,))
+    return template[0] + text_id + template[1]
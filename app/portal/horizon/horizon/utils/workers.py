@@ -0,0 +1,267 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""A process-wide worker pool for gathering data from several APIs at once.
+
+Views which need data from several services run the calls concurrently with
+:func:`gather`.  All calls share one bounded thread pool, so no threads are
+started or joined per request, and a call which does not finish within its
+timeout is given up on instead of holding up the whole page.
+
+A call given up on keeps its worker until it returns, so the API clients
+time out the requests made on the pool (see :func:`get_call_timeout`), and
+at most HORIZON_WORKER_MAX_PENDING calls are queued or running at once.
+Calls beyond that are run in the thread of their caller.
+
+The pool size is set by HORIZON_WORKER_POOL_SIZE and the default timeout of
+a call, in seconds, by HORIZON_WORKER_TIMEOUT (no timeout by default).
+"""
+
+import logging
+import threading
+import time
+
+from django.conf import settings
+import futurist
+from futurist import waiters
+
+LOG = logging.getLogger(__name__)
+
+
+class DeadlineExceeded(Exception):
+    """Raised when a call did not finish in time and errors are wanted."""
+
+
+class WorkerStats(object):
+    """Counters describing the use of the worker pool.
+
+    ``queued`` and ``running`` are the calls currently waiting for a worker
+    and being run.  ``inline`` counts the calls run in the thread of their
+    caller because the pool had too many pending calls.  Times are in
+    seconds.
+    """
+
+    _counters = ('submitted', 'queued', 'running', 'completed', 'failed',
+                 'timed_out', 'cancelled', 'inline', 'queue_time',
+                 'max_queue_time', 'run_time', 'max_run_time')
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            for counter in self._counters:
+                setattr(self, counter, 0)
+
+    def _add(self, **deltas):
+        with self._lock:
+            for counter, delta in deltas.items():
+                setattr(self, counter, getattr(self, counter) + delta)
+
+    def _started(self, queue_time):
+        with self._lock:
+            self.queued -= 1
+            self.running += 1
+            self.queue_time += queue_time
+            self.max_queue_time = max(self.max_queue_time, queue_time)
+
+    def _finished(self, run_time, failed):
+        with self._lock:
+            self.running -= 1
+            self.completed += 1
+            self.failed += int(failed)
+            self.run_time += run_time
+            self.max_run_time = max(self.max_run_time, run_time)
+
+    def to_dict(self):
+        with self._lock:
+            stats = dict((counter, getattr(self, counter))
+                         for counter in self._counters)
+        started = stats['completed'] + stats['running']
+        stats['avg_queue_time'] = (stats['queue_time'] / started
+                                   if started else 0)
+        stats['avg_run_time'] = (stats['run_time'] / stats['completed']
+                                 if stats['completed'] else 0)
+        return stats
+
+
+stats = WorkerStats()
+
+_executor = None
+# Counts the calls queued or running on _executor.
+_slots = None
+_executor_lock = threading.Lock()
+_local = threading.local()
+
+
+def get_executor():
+    """Return the thread pool shared by all requests of this process."""
+    global _executor, _slots
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                size = getattr(settings, 'HORIZON_WORKER_POOL_SIZE', 16)
+                max_pending = getattr(settings, 'HORIZON_WORKER_MAX_PENDING',
+                                      None)
+                _slots = threading.Semaphore(max_pending or 4 * size)
+                _executor = futurist.ThreadPoolExecutor(max_workers=size)
+    return _executor
+
+
+def reset_executor():
+    """Shut the shared thread pool down, a new one is built on next use."""
+    global _executor
+    with _executor_lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=False)
+
+
+def get_call_timeout():
+    """Return the timeout of the API requests made by the current thread.
+
+    A call run on the pool can not be stopped once it is given up on, so
+    the API clients give up its requests after HORIZON_WORKER_CALL_TIMEOUT
+    seconds to free its worker.  Returns None outside of the pool.
+    """
+    if getattr(_local, 'in_worker', False):
+        return getattr(settings, 'HORIZON_WORKER_CALL_TIMEOUT', 60)
+    return None
+
+
+def get_stats():
+    """Return a snapshot of the worker pool counters as a dict."""
+    return stats.to_dict()
+
+
+def _run(func, args, submitted):
+    started = time.time()
+    stats._started(started - submitted)
+    _local.in_worker = True
+    failed = True
+    try:
+        result = func(*args)
+        failed = False
+        return result
+    finally:
+        _local.in_worker = False
+        stats._finished(time.time() - started, failed)
+
+
+def _run_inline(func, args):
+    future = futurist.Future()
+    try:
+        future.set_result(func(*args))
+    except Exception as e:
+        future.set_exception(e)
+    return future
+
+
+def gather(calls, timeout=None, deadline=None, raise_errors=False,
+           name=None):
+    """Run ``calls`` concurrently and return their results.
+
+    ``calls`` maps a caller chosen key to a callable, or to a tuple of a
+    callable and its arguments.  The returned dict maps the keys of the
+    calls which finished in time to their results.
+
+    ``timeout`` is the number of seconds to wait for each call, either one
+    number for all calls or a dict keyed like ``calls``; it defaults to
+    HORIZON_WORKER_TIMEOUT.  ``deadline`` is an absolute ``time.time()``
+    after which no call is waited for.  Calls which did not finish in time
+    are cancelled if they did not start yet and left out of the results.
+
+    Calls which can not be queued because HORIZON_WORKER_MAX_PENDING calls
+    are already pending are run in the current thread once the others are
+    queued, they are never late.
+
+    Calls which raised are logged and left out, unless ``raise_errors`` is
+    set, in which case the first error is raised, or DeadlineExceeded if a
+    call did not finish in time.  ``name`` describes the caller in logs.
+
+    When called from a call already running on the pool, the calls are run
+    one after the other in the current thread, so that nested gathers can
+    not exhaust the pool while waiting on each other.
+    """
+    calls = dict((key, call if isinstance(call, tuple) else (call,))
+                 for key, call in calls.items())
+    if timeout is None:
+        timeout = getattr(settings, 'HORIZON_WORKER_TIMEOUT', None)
+
+    inline = []
+    if getattr(_local, 'in_worker', False):
+        futures = dict((key, _run_inline(call[0], call[1:]))
+                       for key, call in calls.items())
+    else:
+        executor = get_executor()
+        slots = _slots
+        futures = {}
+        for key, call in calls.items():
+            if not slots.acquire(False):
+                inline.append(key)
+                continue
+            submitted = time.time()
+            stats._add(submitted=1, queued=1)
+            try:
+                future = executor.submit(_run, call[0], call[1:], submitted)
+            except Exception:
+                stats._add(queued=-1)
+                slots.release()
+                raise
+            # Run or cancelled, the call is no longer pending.
+            future.add_done_callback(lambda future: slots.release())
+            futures[key] = future
+        if inline:
+            LOG.debug('Worker pool saturated, running %s in %s inline.',
+                      ', '.join(str(key) for key in inline),
+                      name or 'gather')
+            stats._add(inline=len(inline))
+        for key in inline:
+            futures[key] = _run_inline(calls[key][0], calls[key][1:])
+        start = time.time()
+        for key, future in futures.items():
+            call_timeout = (timeout.get(key) if isinstance(timeout, dict)
+                            else timeout)
+            end = deadline
+            if call_timeout is not None:
+                end = start + call_timeout if end is None else min(
+                    end, start + call_timeout)
+            remaining = None if end is None else max(end - time.time(), 0)
+            waiters.wait_for_all([future], timeout=remaining)
+
+    late = []
+    for key, future in futures.items():
+        if not future.done():
+            if future.cancel():
+                stats._add(queued=-1, cancelled=1)
+            stats._add(timed_out=1)
+            late.append(key)
+    if late and raise_errors:
+        raise DeadlineExceeded('Gave up waiting for %s' % ', '.join(
+            str(key) for key in late))
+
+    results = {}
+    for key, future in futures.items():
+        if key in late:
+            LOG.warning('Gave up waiting for %s in %s.', key,
+                        name or 'gather')
+            continue
+        error = future.exception()
+        if error is not None:
+            if raise_errors:
+                raise error
+            LOG.warning('Call %s in %s failed: %s', key, name or 'gather',
+                        error)
+            continue
+        results[key] = future.result()
+    return results
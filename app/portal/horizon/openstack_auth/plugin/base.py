@@ -81,7 +81,7 @@ class BasePlugin(object):
         :returns: A list of projects. This currently accepts returning both v2
                   or v3 keystoneclient projects objects.
         """
-        try:
+        def list_projects():
             if self.keystone_version >= 3:
                 client = v3_client.Client(session=session, auth=auth_plugin)
                 if auth_ref.is_federated:
@@ -93,6 +93,14 @@ class BasePlugin(object):
                 client = v2_client.Client(session=session, auth=auth_plugin)
                 return client.tenants.list()
 
+        try:
+            # The list is shared with User.authorized_tenants, which lists
+            # the projects with the same unscoped token.
+            return utils.get_cached_project_list(
+                getattr(auth_ref, 'auth_token', None),
+                getattr(auth_ref, 'expires', None),
+                list_projects,
+                user_id=getattr(auth_ref, 'user_id', None))
         except (keystone_exceptions.ClientException,
                 keystone_exceptions.AuthorizationFailure):
             msg = _('Unable to retrieve authorized projects.')
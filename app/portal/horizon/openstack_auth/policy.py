@@ -13,8 +13,10 @@
 
 """Policy engine for openstack_auth"""
 
+import collections
 import logging
 import os.path
+import threading
 
 from django.conf import settings
 from oslo_config import cfg
@@ -29,6 +31,16 @@ LOG = logging.getLogger(__name__)
 _ENFORCER = None
 _BASE_PATH = getattr(settings, 'POLICY_FILES_PATH', '')
 
+# Bumped whenever the enforcers are reset, so that decisions made with the
+# previous policy rules are never reused.
+_GENERATION = 0
+# Policy decisions kept across requests, per token id and generation.
+_DECISIONS = collections.OrderedDict()
+_DECISIONS_LOCK = threading.Lock()
+# Number of tokens whose decisions are kept, the least recently used ones
+# are dropped first.
+_DECISIONS_MAX_TOKENS = 1000
+
 
 def _get_policy_conf(policy_file, policy_dirs=None):
     conf = cfg.ConfigOpts()
@@ -71,8 +83,11 @@ def _get_enforcer():
 
 
 def reset():
-    global _ENFORCER
+    global _ENFORCER, _GENERATION
     _ENFORCER = None
+    with _DECISIONS_LOCK:
+        _GENERATION += 1
+        _DECISIONS.clear()
 
 
 def check(actions, request, target=None):
@@ -112,10 +127,18 @@ def check(actions, request, target=None):
                       representing the location of the object e.g.
                       {'project_id': object.project_id}
     :returns: boolean if the user has permission or not for the actions.
+
+    Decisions are cached per token, so a table checking the same actions
+    for many rows, or rendered again, enforces each action only once per
+    target.
     """
     if target is None:
         target = {}
-    user = auth_utils.get_user(request)
+    cache = _get_request_cache(request)
+    if cache is not None:
+        user = cache['user']
+    else:
+        user = auth_utils.get_user(request)
 
     # Several service policy engines default to a project id check for
     # ownership. Since the user is already scoped to a project, if a
@@ -146,6 +169,80 @@ def check(actions, request, target=None):
         if target.get(key) is None:
             target[key] = user.user_domain_id
 
+    decision_key = _decision_key(actions, target)
+    if cache is not None and decision_key is not None:
+        try:
+            return cache['decisions'][decision_key]
+        except KeyError:
+            pass
+    allowed = _enforce(actions, request, user, target)
+    if cache is not None and decision_key is not None:
+        cache['decisions'][decision_key] = allowed
+    return allowed
+
+
+def _get_request_cache(request):
+    """Return the user and the policy decisions cached on ``request``.
+
+    The user lasts as long as the request. The decisions are shared by the
+    requests made with the same token, see :func:`_get_decisions`. Both are
+    started afresh when the token in the session changes, e.g. when
+    switching projects, or when the policy enforcers are reset.
+    """
+    if request is None:
+        return None
+    token = getattr(request, 'session', {}).get('token')
+    token_id = getattr(token, 'id', None)
+    generation = _GENERATION
+    cache = getattr(request, '_policy_cache', None)
+    if (cache is None or cache['token_id'] != token_id or
+            cache['generation'] != generation):
+        cache = {'token_id': token_id,
+                 'generation': generation,
+                 'user': auth_utils.get_user(request),
+                 'decisions': _get_decisions(token_id, generation)}
+        request._policy_cache = cache
+    return cache
+
+
+def _get_decisions(token_id, generation):
+    """Return the decisions cached for a token and enforcer generation.
+
+    The token determines the credentials the rules are checked against, so
+    its decisions can be reused by any request made with it. At most
+    _DECISIONS_MAX_TOKENS tokens are kept. Requests without a token get
+    decisions of their own.
+    """
+    if token_id is None:
+        return {}
+    key = (token_id, generation)
+    with _DECISIONS_LOCK:
+        try:
+            decisions = _DECISIONS.pop(key)
+        except KeyError:
+            decisions = {}
+            while len(_DECISIONS) >= _DECISIONS_MAX_TOKENS:
+                _DECISIONS.popitem(last=False)
+        _DECISIONS[key] = decisions
+    return decisions
+
+
+def _decision_key(actions, target):
+    """Return the cache key of a decision, None if it can not be cached.
+
+    The target has its defaults filled in at this point, so targets which
+    only differ by giving the defaults explicitly share the same key.
+    """
+    try:
+        key = (tuple((action[0], action[1]) for action in actions),
+               frozenset(target.items()))
+        hash(key)
+    except TypeError:
+        return None
+    return key
+
+
+def _enforce(actions, request, user, target):
     credentials = _user_to_credentials(user)
     domain_credentials = _domain_to_credentials(request, user)
     # if there is a domain token use the domain_id instead of the user's domain
@@ -56,6 +56,9 @@ OPENSTACK_KEYSTONE_MULTIDOMAIN_SUPPORT = False
 
 OPENSTACK_KEYSTONE_DEFAULT_DOMAIN = 'domain'
 
+# Tests stub the project list call by call, do not serve it from cache.
+OPENSTACK_PROJECT_LIST_CACHE_TIMEOUT = 0
+
 # NOTE(saschpe): The openstack_auth.user.Token object isn't
 # JSON-serializable ATM
 SESSION_SERIALIZER = 'django.contrib.sessions.serializers.PickleSerializer'
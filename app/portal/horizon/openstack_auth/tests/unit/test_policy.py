@@ -213,3 +213,77 @@ class PolicyTestCaseV3Admin(PolicyTestCase):
         value = policy.check((("identity", "admin_or_cloud_admin"),),
                              request=self.request)
         self.assertTrue(value)
+
+
+class PolicyCacheTestCase(PolicyTestCase):
+    _roles = [{'id': '1', 'name': 'member'}]
+
+    def setUp(self):
+        super(PolicyCacheTestCase, self).setUp()
+        policy.reset()
+        patcher = mock.patch.object(policy, '_enforce',
+                                    wraps=policy._enforce)
+        self.mock_enforce = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _check(self, target=None):
+        return policy.check((("compute", "context_is_admin"),),
+                            request=self.request, target=target)
+
+    def test_check_cached_per_target(self):
+        self.assertFalse(self._check())
+        self.assertFalse(self._check({'project_id': None}))
+        self.assertFalse(self._check({'user_id': 1}))
+        self.assertEqual(1, self.mock_enforce.call_count)
+
+        self.assertFalse(self._check({'project_id': 'other'}))
+        self.assertEqual(2, self.mock_enforce.call_count)
+        # The user is only looked up once per request.
+        self.assertEqual(1, self.MockClass.call_count)
+
+    def test_check_unhashable_target_not_cached(self):
+        self._check({'tags': ['a']})
+        self._check({'tags': ['a']})
+        self.assertEqual(2, self.mock_enforce.call_count)
+
+    def test_check_cache_cleared_on_token_change(self):
+        self.request.session = {'token': mock.Mock(id='first')}
+        self._check()
+        self.request.session = {'token': mock.Mock(id='second')}
+        self._check()
+        self.assertEqual(2, self.mock_enforce.call_count)
+
+    def test_check_cache_cleared_on_reset(self):
+        self._check()
+        policy.reset()
+        self._check()
+        self.assertEqual(2, self.mock_enforce.call_count)
+
+    def test_check_cache_per_request(self):
+        self._check()
+        self.request = http.HttpRequest()
+        self._check()
+        self.assertEqual(2, self.mock_enforce.call_count)
+
+    def test_check_cache_shared_per_token(self):
+        self.request.session = {'token': mock.Mock(id='first')}
+        self._check()
+        self.request = http.HttpRequest()
+        self.request.session = {'token': mock.Mock(id='first')}
+        self._check()
+        self.assertEqual(1, self.mock_enforce.call_count)
+        # The user is still looked up by each request.
+        self.assertEqual(2, self.MockClass.call_count)
+
+        policy.reset()
+        self._check()
+        self.assertEqual(2, self.mock_enforce.call_count)
+
+    @mock.patch.object(policy, '_DECISIONS_MAX_TOKENS', 2)
+    def test_check_cache_bounded(self):
+        for token_id in ('first', 'second', 'third', 'first'):
+            self.request = http.HttpRequest()
+            self.request.session = {'token': mock.Mock(id=token_id)}
+            self._check()
+        self.assertEqual(4, self.mock_enforce.call_count)
+        self.assertEqual(2, len(policy._DECISIONS))
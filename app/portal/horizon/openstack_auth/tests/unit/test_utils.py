@@ -11,10 +11,16 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import datetime
+
 from django.conf import settings
+from django.core.cache import cache
 from django import http
 from django import test
 from django.test.utils import override_settings
+from django.utils import timezone
+from keystoneclient.v3 import projects
+import mock
 
 from openstack_auth import utils
 
@@ -113,3 +119,69 @@ class BehindProxyTestCase(test.TestCase):
         self.request.META['HTTP_X_REAL_IP'] = '192.168.15.33'
         self.request.META['HTTP_X_FORWARDED_FOR'] = '172.18.0.2'
         self.assertEqual('192.168.15.33', get_client_ip(self.request))
+
+
+@override_settings(OPENSTACK_PROJECT_LIST_CACHE_TIMEOUT=300)
+class ProjectListCacheTestCase(test.TestCase):
+
+    def setUp(self):
+        super(ProjectListCacheTestCase, self).setUp()
+        self.addCleanup(cache.clear)
+        self.expires = timezone.now() + datetime.timedelta(hours=1)
+        self.list_projects = mock.Mock(return_value=[
+            projects.Project(None, {'id': 'p1', 'name': 'one',
+                                    'enabled': True}, loaded=True)])
+
+    def test_get_cached_project_list(self):
+        for i in range(2):
+            ret = utils.get_cached_project_list('token', self.expires,
+                                                self.list_projects)
+            self.assertEqual(['p1'], [project.id for project in ret])
+            self.assertIsInstance(ret[0], projects.Project)
+        self.list_projects.assert_called_once_with()
+
+        utils.remove_project_cache('token')
+        utils.get_cached_project_list('token', self.expires,
+                                      self.list_projects)
+        self.assertEqual(2, self.list_projects.call_count)
+
+    def _get_list(self, token, user_id):
+        utils.get_cached_project_list(token, self.expires,
+                                      self.list_projects, user_id=user_id)
+        return self.list_projects.call_count
+
+    def test_forget_project_lists_of_user(self):
+        self.assertEqual(1, self._get_list('token1', 'user1'))
+        self.assertEqual(2, self._get_list('token2', 'user2'))
+
+        utils.forget_project_lists('user1')
+        self.assertEqual(3, self._get_list('token1', 'user1'))
+        self.assertEqual(3, self._get_list('token2', 'user2'))
+
+    def test_forget_project_lists_of_every_user(self):
+        self.assertEqual(1, self._get_list('token1', 'user1'))
+        self.assertEqual(2, self._get_list('token2', 'user2'))
+
+        utils.forget_project_lists()
+        self.assertEqual(3, self._get_list('token1', 'user1'))
+        self.assertEqual(4, self._get_list('token2', 'user2'))
+        self.assertEqual(4, self._get_list('token1', 'user1'))
+
+    def test_remove_project_cache_of_user(self):
+        self.assertEqual(1, self._get_list('token', 'user'))
+        utils.remove_project_cache('token', 'user')
+        self.assertEqual(2, self._get_list('token', 'user'))
+
+    def test_get_cached_project_list_expired_token(self):
+        expires = timezone.now() - datetime.timedelta(seconds=1)
+        for i in range(2):
+            utils.get_cached_project_list('token', expires,
+                                          self.list_projects)
+        self.assertEqual(2, self.list_projects.call_count)
+
+    @override_settings(OPENSTACK_PROJECT_LIST_CACHE_TIMEOUT=0)
+    def test_get_cached_project_list_disabled(self):
+        for i in range(2):
+            utils.get_cached_project_list('token', self.expires,
+                                          self.list_projects)
+        self.assertEqual(2, self.list_projects.call_count)
@@ -347,6 +347,7 @@ class User(models.AbstractBaseUser, models.AnonymousUser):
                     user_id=self.id,
                     auth_url=endpoint,
                     token=self.unscoped_token,
+                    expires=self.token.expires,
                     is_federated=self.is_federated)
             except (keystone_exceptions.ClientException,
                     keystone_exceptions.AuthorizationFailure):
@@ -12,12 +12,15 @@
 # limitations under the License.
 
 import datetime
+import hashlib
 import logging
 import re
+import uuid
 
 from django.conf import settings
 from django.contrib import auth
 from django.contrib.auth import models
+from django.core.cache import cache
 from django.utils import timezone
 from keystoneauth1.identity import v2 as v2_auth
 from keystoneauth1.identity import v3 as v3_auth
@@ -25,6 +28,7 @@ from keystoneauth1 import session
 from keystoneauth1 import token_endpoint
 from keystoneclient.v2_0 import client as client_v2
 from keystoneclient.v3 import client as client_v3
+import six
 from six.moves.urllib import parse as urlparse
 
 
@@ -116,11 +120,86 @@ def is_safe_url(url, host=None):
     return not netloc or netloc == host
 
 
-# DEPRECATED -- Mitaka
-# This method definition is included to prevent breaking backward compatibility
-# The original functionality was problematic and has been removed.
-def remove_project_cache(token):
-    pass
+def _hash(value):
+    return hashlib.sha256(value.encode('utf-8')).hexdigest()
+
+
+def _project_generation_key(user_id):
+    # The generation of every user when user_id is None.
+    if user_id is None:
+        return 'openstack_auth:projects:generation'
+    return 'openstack_auth:projects:generation:%s' % _hash(user_id)
+
+
+def _project_generations(user_id):
+    """Return the generations of the cached projects of ``user_id``.
+
+    A generation is replaced by :func:`forget_project_lists` to forget the
+    projects cached under it.  One missing from the cache, because it was
+    never set or was evicted, is replaced too.
+    """
+    keys = [_project_generation_key(None)]
+    if user_id is not None:
+        keys.append(_project_generation_key(user_id))
+    generations = cache.get_many(keys)
+    for key in keys:
+        if key not in generations:
+            cache.add(key, uuid.uuid4().hex, None)
+            generations[key] = cache.get(key)
+    return [generations[key] for key in keys]
+
+
+def _project_cache_key(token, user_id):
+    # Tokens are long and secret, only their hash is used in the key.
+    return ':'.join(['openstack_auth:projects:%s' % _hash(token)] +
+                    [six.text_type(generation)
+                     for generation in _project_generations(user_id)])
+
+
+def _project_cache_timeout(expires):
+    timeout = getattr(settings, 'OPENSTACK_PROJECT_LIST_CACHE_TIMEOUT', 300)
+    if timeout and expires is not None:
+        if settings.USE_TZ and timezone.is_naive(expires):
+            expires = timezone.make_aware(expires, timezone.utc)
+        timeout = min(timeout,
+                      int((expires - timezone.now()).total_seconds()))
+    return max(timeout, 0)
+
+
+def get_cached_project_list(token, expires, list_projects, user_id=None):
+    """Return the projects ``token`` gives access to.
+
+    The list is cached across requests and processes for the
+    OPENSTACK_PROJECT_LIST_CACHE_TIMEOUT seconds, or until the token
+    expires if it does sooner.  ``list_projects`` is called without
+    arguments to list the projects when they are not cached.  The list is
+    cached under the generations of ``user_id``, so that
+    :func:`forget_project_lists` can drop it.
+    """
+    timeout = _project_cache_timeout(expires)
+    if not token or not timeout:
+        return list_projects()
+    key = _project_cache_key(token, user_id)
+    cached = cache.get(key)
+    if cached is not None:
+        # The keystoneclient managers are not cached, only the attributes.
+        return [project_class(None, info, loaded=True)
+                for project_class, info in cached]
+    projects = list_projects()
+    cache.set(key, [(project.__class__, project.to_dict())
+                    for project in projects], timeout)
+    return projects
+
+
+def forget_project_lists(user_id=None):
+    """Forget the cached projects of ``user_id``, or of every user."""
+    cache.set(_project_generation_key(user_id), uuid.uuid4().hex, None)
+
+
+def remove_project_cache(token, user_id=None):
+    """Forget the cached projects of ``token``."""
+    if token:
+        cache.delete(_project_cache_key(token, user_id))
 
 
 # Helper for figuring out keystone version
@@ -359,18 +438,23 @@ def get_token_auth_plugin(auth_url, token, project_id=None, domain_name=None):
 
 def get_project_list(*args, **kwargs):
     is_federated = kwargs.get('is_federated', False)
-    sess = kwargs.get('session') or get_session()
-    auth_url, _ = fix_auth_url_version_prefix(kwargs['auth_url'])
-    auth = token_endpoint.Token(auth_url, kwargs['token'])
-    client = get_keystone_client().Client(session=sess, auth=auth)
 
-    if get_keystone_version() < 3:
-        projects = client.tenants.list()
-    elif is_federated:
-        projects = client.federation.projects.list()
-    else:
-        projects = client.projects.list(user=kwargs.get('user_id'))
+    def list_projects():
+        sess = kwargs.get('session') or get_session()
+        auth_url, _ = fix_auth_url_version_prefix(kwargs['auth_url'])
+        auth = token_endpoint.Token(auth_url, kwargs['token'])
+        client = get_keystone_client().Client(session=sess, auth=auth)
+
+        if get_keystone_version() < 3:
+            return client.tenants.list()
+        elif is_federated:
+            return client.federation.projects.list()
+        else:
+            return client.projects.list(user=kwargs.get('user_id'))
 
+    projects = get_cached_project_list(kwargs['token'], kwargs.get('expires'),
+                                       list_projects,
+                                       user_id=kwargs.get('user_id'))
     projects.sort(key=lambda project: project.name.lower())
     return projects
 
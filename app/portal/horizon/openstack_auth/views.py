@@ -173,6 +173,9 @@ def logout(request, login_url=None, **kwargs):
         {'username': request.user.username}
     LOG.info(msg)
 
+    utils.remove_project_cache(getattr(request.user, 'unscoped_token', None),
+                               getattr(request.user, 'id', None))
+
     """ Securely logs a user out. """
     return django_auth_views.logout_then_login(request, login_url=login_url,
                                                **kwargs)
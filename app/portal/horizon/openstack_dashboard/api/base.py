@@ -16,14 +16,22 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+from collections import OrderedDict
 from collections import Sequence
 import functools
+import threading
+import time
 
 from django.conf import settings
+from keystoneauth1 import session as ks_session
+from keystoneauth1 import token_endpoint
+import requests
 import semantic_version
 import six
+from six.moves import http_cookiejar
 
 from horizon import exceptions
+from horizon.utils import workers
 
 
 __all__ = ('APIResourceWrapper', 'APIDictWrapper',
@@ -318,42 +326,225 @@ def get_url_for_service(service, region, endpoint_type):
     return None
 
 
+class ServiceCatalogIndex(object):
+    """The endpoints of a service catalog indexed for direct lookups.
+
+    :meth:`url_for` returns the same URL as :func:`get_url_for_service`
+    called with the first service of the given type in the catalog, but
+    without walking the catalog.
+    """
+
+    def __init__(self, catalog):
+        self.catalog = catalog
+        self._versions = {}
+        self._regions = set()
+        self._has_endpoints = set()
+        self._urls = {}
+        # All the identity endpoints, used when there is none in the
+        # requested region.
+        self._identity_urls = {}
+        for service in catalog or []:
+            service_type = service.get('type')
+            if service_type is None or service_type in self._versions:
+                continue
+            version = get_version_from_service(service)
+            self._versions[service_type] = version
+            for endpoint in service.get('endpoints', []):
+                region = _get_endpoint_region(endpoint)
+                first = (service_type, region) not in self._regions
+                self._add(self._urls, service_type, region, version,
+                          endpoint, first)
+                self._regions.add((service_type, region))
+                if service_type == 'identity':
+                    self._add(self._identity_urls, service_type, None,
+                              version, endpoint,
+                              service_type not in self._has_endpoints)
+                self._has_endpoints.add(service_type)
+
+    @staticmethod
+    def _add(urls, service_type, region, version, endpoint, first):
+        if version < 3:
+            # Only the first endpoint of a region is used in v2 catalogs.
+            if first:
+                for endpoint_type, url in endpoint.items():
+                    urls[(service_type, region, endpoint_type)] = url
+        else:
+            urls.setdefault((service_type, region, endpoint.get('interface')),
+                            endpoint.get('url'))
+
+    def has_service(self, service_type, region):
+        """Whether the service has an endpoint in the region.
+
+        Identity endpoints are used for any region.
+        """
+        if service_type == 'identity':
+            return service_type in self._has_endpoints
+        return (service_type, region) in self._regions
+
+    def url_for(self, service_type, region, endpoint_type):
+        version = self._versions.get(service_type)
+        if version is None:
+            return None
+        urls = self._urls
+        if (service_type == 'identity' and
+                (service_type, region) not in self._regions):
+            urls = self._identity_urls
+            region = None
+        if version >= 3:
+            endpoint_type = ENDPOINT_TYPE_TO_INTERFACE.get(endpoint_type, '')
+        return urls.get((service_type, region, endpoint_type))
+
+
+def get_catalog_index(request):
+    """Return the :class:`ServiceCatalogIndex` of the user's catalog.
+
+    The index is built once per token and kept on the token, which is
+    stored in the session, so the following requests reuse it.
+    """
+    user = request.user
+    catalog = user.service_catalog
+    holder = getattr(user, 'token', None) or user
+    index = getattr(holder, 'catalog_index', None)
+    if index is None or index.catalog is not catalog:
+        index = ServiceCatalogIndex(catalog)
+        holder.catalog_index = index
+        if holder is not user and hasattr(request, 'session'):
+            request.session.modified = True
+    return index
+
+
 def url_for(request, service_type, endpoint_type=None, region=None):
     endpoint_type = endpoint_type or getattr(settings,
                                              'OPENSTACK_ENDPOINT_TYPE',
                                              'publicURL')
     fallback_endpoint_type = getattr(settings, 'SECONDARY_ENDPOINT_TYPE', None)
 
-    catalog = request.user.service_catalog
-    service = get_service_from_catalog(catalog, service_type)
-    if service:
-        if not region:
-            region = request.user.services_region
-        url = get_url_for_service(service,
-                                  region,
-                                  endpoint_type)
-        if not url and fallback_endpoint_type:
-            url = get_url_for_service(service,
-                                      region,
-                                      fallback_endpoint_type)
-        if url:
-            return url
+    if not region:
+        region = request.user.services_region
+    index = get_catalog_index(request)
+    url = index.url_for(service_type, region, endpoint_type)
+    if not url and fallback_endpoint_type:
+        url = index.url_for(service_type, region, fallback_endpoint_type)
+    if url:
+        return url
     raise exceptions.ServiceCatalogException(service_type)
 
 
 def is_service_enabled(request, service_type):
-    service = get_service_from_catalog(request.user.service_catalog,
-                                       service_type)
-    if service:
-        region = request.user.services_region
-        for endpoint in service.get('endpoints', []):
-            if 'type' not in service:
-                continue
-            # ignore region for identity
-            if service['type'] == 'identity' or \
-               _get_endpoint_region(endpoint) == region:
-                return True
-    return False
+    return get_catalog_index(request).has_service(
+        service_type, request.user.services_region)
+
+
+class _RejectCookiesPolicy(http_cookiejar.DefaultCookiePolicy):
+    """A cookie policy which neither stores nor sends any cookie."""
+
+    def set_ok(self, cookie, request):
+        return False
+
+    def return_ok(self, cookie, request):
+        return False
+
+
+class _PooledSession(ks_session.Session):
+    """A keystoneauth session which times out the requests of workers.
+
+    Calls run on :mod:`horizon.utils.workers` keep their worker until they
+    return, even when they are given up on, so their requests time out.
+    """
+
+    def request(self, url, method, **kwargs):
+        timeout = workers.get_call_timeout()
+        if timeout is not None and self.timeout is None:
+            kwargs.setdefault('timeout', timeout)
+        return super(_PooledSession, self).request(url, method, **kwargs)
+
+
+class SessionPool(object):
+    """A bounded pool of keystoneauth sessions shared by all the requests.
+
+    Sessions are keyed by service endpoint and token.  Each of them has its
+    own requests session, which keeps no cookies, but all of them send their
+    requests through the same HTTP adapters, so connections to the services
+    stay open from one request to the next.  At most ``max_size`` sessions
+    are kept, the least recently used ones are dropped first, and sessions
+    not used for ``idle_timeout`` seconds are dropped.
+    """
+
+    def __init__(self, max_size, idle_timeout):
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        # Sessions and the time they were last used, least recently used
+        # first.
+        self._sessions = OrderedDict()
+        self._lock = threading.Lock()
+        self._adapters = None
+
+    def _create(self, endpoint, token_id):
+        insecure = getattr(settings, 'OPENSTACK_SSL_NO_VERIFY', False)
+        verify = getattr(settings, 'OPENSTACK_SSL_CACERT', True)
+        if insecure:
+            verify = False
+        if self._adapters is None:
+            # keystoneauth mounts keep-alive adapters on the requests
+            # session it creates, they hold the connection pools shared by
+            # the sessions of the pool.
+            self._adapters = dict(
+                ks_session.Session(verify=verify).session.adapters)
+        http = requests.Session()
+        http.cookies.set_policy(_RejectCookiesPolicy())
+        for prefix, adapter in self._adapters.items():
+            http.mount(prefix, adapter)
+        return _PooledSession(
+            auth=token_endpoint.Token(endpoint, token_id),
+            session=http, verify=verify)
+
+    def _evict_idle(self, now):
+        while self._sessions:
+            key, (session, last_used) = next(iter(self._sessions.items()))
+            if last_used + self.idle_timeout > now:
+                break
+            del self._sessions[key]
+
+    def get(self, endpoint, token_id):
+        """Return the session for ``token_id`` on ``endpoint``."""
+        now = time.time()
+        key = (endpoint, token_id)
+        with self._lock:
+            self._evict_idle(now)
+            entry = self._sessions.pop(key, None)
+            if entry is None:
+                session = self._create(endpoint, token_id)
+            else:
+                session = entry[0]
+            self._sessions[key] = (session, now)
+            while len(self._sessions) > self.max_size:
+                self._sessions.popitem(last=False)
+        return session
+
+    def clear(self):
+        with self._lock:
+            self._sessions.clear()
+
+
+_session_pool = None
+_session_pool_lock = threading.Lock()
+
+
+def get_session_pool():
+    """Return the session pool shared by the requests of this process."""
+    global _session_pool
+    if _session_pool is None:
+        with _session_pool_lock:
+            if _session_pool is None:
+                _session_pool = SessionPool(
+                    getattr(settings, 'OPENSTACK_SESSION_POOL_SIZE', 200),
+                    getattr(settings, 'OPENSTACK_SESSION_IDLE_TIMEOUT', 300))
+    return _session_pool
+
+
+def get_session(request, endpoint):
+    """Return a pooled keystoneauth session for the user on ``endpoint``."""
+    return get_session_pool().get(endpoint, request.user.token.id)
 
 
 def _get_endpoint_region(endpoint):
@@ -199,8 +199,6 @@ def cinderclient(request_auth_params, version=None):
     if version is None:
         api_version = VERSIONS.get_active_version()
         version = api_version['version']
-    insecure = getattr(settings, 'OPENSTACK_SSL_NO_VERIFY', False)
-    cacert = getattr(settings, 'OPENSTACK_SSL_CACERT', None)
 
     username, token_id, tenant_id, cinder_urls, auth_url = request_auth_params
     version = base.Version(version)
@@ -221,16 +219,10 @@ def cinderclient(request_auth_params, version=None):
         )
     c = cinder_client.Client(
         version,
-        username,
-        token_id,
-        project_id=tenant_id,
-        auth_url=auth_url,
-        insecure=insecure,
-        cacert=cacert,
+        session=base.get_session_pool().get(cinder_url, token_id),
+        os_endpoint=cinder_url,
         http_log_debug=settings.DEBUG,
     )
-    c.client.auth_token = token_id
-    c.client.management_url = cinder_url
     return c
 
 
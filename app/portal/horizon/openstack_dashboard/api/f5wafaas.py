@@ -1,63 +1,594 @@
-import requests
+import codecs
+import functools
+import hashlib
 import json
-import os
+import logging
+import re
+import threading
 
 from django.conf import settings
+from django.core.cache import cache
+import requests
+from requests import adapters
+from urllib3.util import retry as urllib3_retry
+
+from horizon.utils import functions as utils
 
 from openstack_dashboard.api import base
 from openstack_dashboard.contrib.developer.profiler import api as profiler
+from openstack_dashboard.utils import fanout
+
+LOG = logging.getLogger(__name__)
 
 ADCAAS_ENDPOINT = getattr(settings, 'ADCAAS_ENDPOINT')
 
-class ADCInstance(base.APIResourceWrapper):
-    """Wrapper for the "console" dictionary.
+# Defaults for the ADCAAS_CONNECTION setting. ``timeout`` is passed straight
+# to requests, so it may be a single number or a (connect, read) tuple.
+# Retries only apply to idempotent verbs (GET, PUT, DELETE, ...), never to
+# POST or PATCH.
+DEFAULT_CONNECTION = {
+    'pool_connections': 4,
+    'pool_maxsize': 16,
+    'timeout': (3.05, 30),
+    'retries': 3,
+    'backoff_factor': 0.3,
+    'status_forcelist': (502, 503, 504),
+}
+
+# Upper bound, in seconds, for ADCAAS_CACHE_TIMEOUT. Cached ADCaaS
+# responses are shared by all users of a tenant, so they must not be kept
+# around for long whatever the deployment configures.
+MAX_CACHE_TIMEOUT = 300
+
+ADC_SORT_KEYS = ('createdAt', 'updatedAt', 'name', 'type', 'status')
+
+# Size, in bytes, of the chunks read from streamed list responses.
+STREAM_CHUNK_SIZE = 64 * 1024
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def _connection_config():
+    config = dict(DEFAULT_CONNECTION)
+    config.update(getattr(settings, 'ADCAAS_CONNECTION', {}))
+    return config
+
+
+def get_session():
+    """Return the process-wide session used to talk to ADCaaS.
+
+    The session keeps a pool of keep-alive connections to ADCAAS_ENDPOINT,
+    so page renders and the worker threads of the f5services views reuse
+    established TCP/TLS connections instead of reconnecting on every call.
+    """
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                config = _connection_config()
+                max_retries = urllib3_retry.Retry(
+                    total=config['retries'],
+                    connect=config['retries'],
+                    read=config['retries'],
+                    backoff_factor=config['backoff_factor'],
+                    status_forcelist=config['status_forcelist'],
+                    raise_on_status=False)
+                adapter = adapters.HTTPAdapter(
+                    pool_connections=config['pool_connections'],
+                    pool_maxsize=config['pool_maxsize'],
+                    max_retries=max_retries)
+                session = requests.Session()
+                session.mount('http://', adapter)
+                session.mount('https://', adapter)
+                session.verify = not getattr(settings,
+                                             'OPENSTACK_SSL_NO_VERIFY', False)
+                _session = session
+    return _session
+
+
+def reset_session():
+    """Drop the shared session, closing its pooled connections."""
+    global _session
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+        _session = None
+
+
+def _headers(request):
+    return {
+        'tenant-id': request.user.tenant_id,
+        'x-auth-token': request.user.token.id,
+        'content-type': 'application/json'
+    }
+
+
+def _request(request, method, path, expected=200, **kwargs):
+    url = '%s/adcaas/v1/%s' % (ADCAAS_ENDPOINT, path)
+    kwargs.setdefault('timeout', _connection_config()['timeout'])
+    response = get_session().request(method, url, headers=_headers(request),
+                                     **kwargs)
+    if response.status_code != expected:
+        # TODO: use horizon exceptions.handle()..
+        raise Exception('Failed to request: %s' % response.reason)
+    return response
+
+
+def _cache_timeout():
+    timeout = getattr(settings, 'ADCAAS_CACHE_TIMEOUT', 10)
+    return max(0, min(timeout, MAX_CACHE_TIMEOUT))
+
+
+def _cache_generation_key(request, collection):
+    return 'f5wafaas:%s:%s:generation' % (request.user.tenant_id, collection)
+
+
+def _cache_key(request, collection, *parts):
+    """Build a cache key scoped to the tenant and collection generation.
+
+    Every write to a collection bumps its generation, which makes all list
+    and detail entries cached for it unreachable at once.
+    """
+    generation = cache.get(_cache_generation_key(request, collection), 0)
+    digest = hashlib.md5(json.dumps(parts, sort_keys=True).encode('utf-8'))
+    return 'f5wafaas:%s:%s:%s:%s' % (request.user.tenant_id, collection,
+                                     generation, digest.hexdigest())
+
+
+def _cached(request, collection, parts, fetch):
+    timeout = _cache_timeout()
+    if not timeout:
+        return fetch()
+    key = _cache_key(request, collection, *parts)
+    value = cache.get(key)
+    if value is None:
+        value = fetch()
+        cache.set(key, value, timeout)
+    return value
+
+
+def invalidate_cache(request, resource_class):
+    """Drop the cached responses of resource_class for the current tenant.
+
+    The parent collection of nested resources is invalidated as well, since
+    it may embed them (e.g. pools listed with their members).  Writes call
+    this even when they fail, as the server may have applied them anyway.
+    """
+    for collection in (resource_class._collection, resource_class._parent):
+        if not collection:
+            continue
+        key = _cache_generation_key(request, collection)
+        # Generation keys never expire, otherwise a stale generation could
+        # come back and expose entries cached before the write.
+        if not cache.add(key, 1, None):
+            try:
+                cache.incr(key)
+            except ValueError:
+                cache.set(key, 1, None)
+
+
+class ADCaaSResource(base.APIResourceWrapper):
+    """Base wrapper for the dictionaries returned by the ADCaaS API.
 
-    Returned by the novaclient.servers.get_mks_console method.
+    Subclasses set ``_collection`` to the URL segment of the resource, which
+    is also the key of list responses, and ``_resource`` to the key of single
+    object responses.  Resources nested below another one (pool members,
+    application declarations) set ``_parent`` to the parent's collection.
     """
-    _attrs = ['id', 'type', 'name', 'networks', 'compute', 'management', 'status', 'lastErr', 'tenantId']
+    _collection = None
+    _resource = None
+    _parent = None
+    _attrs = ['id', 'name', 'description', 'tenantId', 'createdAt',
+              'updatedAt']
 
     def __init__(self, apiresource, request):
-        super(ADCInstance, self).__init__(apiresource)
+        super(ADCaaSResource, self).__init__(apiresource)
         self.request = request
 
+    # Skip APIResourceWrapper.__getattribute__, __getattr__ below is only
+    # reached for the properties of the API dictionary.
+    __getattribute__ = object.__getattribute__
+
+    def __getattr__(self, attr):
+        if attr.startswith('_'):
+            raise AttributeError(attr)
+        try:
+            return self._apiresource[attr]
+        except KeyError:
+            raise AttributeError(attr)
+
+    def to_dict(self):
+        return self._apiresource
+
+
+class ADCaaSRecord(object):
+    """Compact wrapper for ADCaaS resources listed in large numbers.
+
+    The properties named in ``_fields`` are copied into slots, so reading
+    them while rendering a table is a plain attribute access.  Other
+    properties of the API dictionary are still reachable as attributes.
+    Subclasses define ``__slots__`` as ``_fields`` plus any attribute the
+    dashboard sets on the wrapper itself.
+    """
+    __slots__ = ('_apiresource', 'request')
+    _collection = None
+    _resource = None
+    _parent = None
+    _fields = ()
+
+    def __init__(self, apiresource, request):
+        self._apiresource = apiresource
+        self.request = request
+        for field in self._fields:
+            if field in apiresource:
+                setattr(self, field, apiresource[field])
 
-    def __getattribute__(self, attr):
+    def __getattr__(self, attr):
+        if attr.startswith('_'):
+            raise AttributeError(attr)
         try:
-            return object.__getattribute__(self, attr)
-        except AttributeError: 
             return self._apiresource[attr]
+        except KeyError:
+            raise AttributeError(attr)
+
+    def __repr__(self):
+        return "<%s: %s>" % (self.__class__.__name__,
+                             dict((field, getattr(self, field))
+                                  for field in self._fields
+                                  if hasattr(self, field)))
+
+    def to_dict(self):
+        return self._apiresource
+
+
+class ADCInstance(ADCaaSRecord):
+    """Wrapper for the ADC dictionary returned by the ADCaaS API."""
+    _collection = 'adcs'
+    _resource = 'adc'
+    _fields = ('id', 'name', 'description', 'type', 'networks', 'compute',
+               'management', 'status', 'lastErr', 'tenantId', 'createdAt',
+               'updatedAt')
+    # image_name and full_flavor are filled in by the f5adc panel.
+    __slots__ = _fields + ('image_name', 'full_flavor')
+
+
+class Application(ADCaaSResource):
+    _collection = 'applications'
+    _resource = 'application'
+    _attrs = ADCaaSResource._attrs + ['status', 'adcId',
+                                      'defaultDeclarationId', 'services']
+
+
+class Declaration(ADCaaSResource):
+    _collection = 'declarations'
+    _resource = 'declaration'
+    _parent = 'applications'
+    _attrs = ADCaaSResource._attrs + ['applicationId', 'content']
+
+
+class Service(ADCaaSResource):
+    _collection = 'services'
+    _resource = 'service'
+    _attrs = ADCaaSResource._attrs + ['type', 'applicationId', 'enable',
+                                      'virtualAddresses', 'virtualPort',
+                                      'defaultPoolId']
+
+
+class Pool(ADCaaSResource):
+    _collection = 'pools'
+    _resource = 'pool'
+    _attrs = ADCaaSResource._attrs + ['loadBalancingMode', 'members',
+                                      'monitors']
+
+
+class Member(ADCaaSResource):
+    _collection = 'members'
+    _resource = 'member'
+    _parent = 'pools'
+    _attrs = ADCaaSResource._attrs + ['address', 'port', 'poolId']
+
+
+class Monitor(ADCaaSResource):
+    _collection = 'monitors'
+    _resource = 'monitor'
+    _attrs = ADCaaSResource._attrs + ['monitorType', 'interval', 'timeout',
+                                      'targetAddress', 'targetPort']
+
+
+class Rule(ADCaaSResource):
+    _collection = 'rules'
+    _resource = 'rule'
+    _attrs = ADCaaSResource._attrs + ['endpointpolicyId', 'conditions',
+                                      'actions']
+
+
+class EndpointPolicy(ADCaaSResource):
+    _collection = 'endpointpolicies'
+    _resource = 'endpointpolicy'
+    _attrs = ADCaaSResource._attrs + ['rules']
+
+
+class Cert(ADCaaSResource):
+    _collection = 'certs'
+    _resource = 'cert'
+    _attrs = ADCaaSResource._attrs + ['remotepath', 'installed']
+
+
+class Key(ADCaaSResource):
+    _collection = 'keys'
+    _resource = 'key'
+    _attrs = ADCaaSResource._attrs + ['remotepath', 'installed']
+
+
+class WafPolicy(ADCaaSResource):
+    _collection = 'wafpolicies'
+    _resource = 'wafpolicy'
+    _attrs = ADCaaSResource._attrs + ['url', 'public', 'ignoreChanges']
+
+
+def _resource_path(resource_class, obj_id=None, parent_id=None):
+    if resource_class._parent:
+        if parent_id is None:
+            raise ValueError('%s requires the id of its parent %s.'
+                             % (resource_class.__name__,
+                                resource_class._parent))
+        path = '%s/%s/%s' % (resource_class._parent, parent_id,
+                             resource_class._collection)
+    else:
+        path = resource_class._collection
+    if obj_id is not None:
+        path = '%s/%s' % (path, obj_id)
+    return path
+
+
+def _filter_params(where=None, limit=None, skip=None, order=None,
+                   fields=None, include=None):
+    """Build the ``filter`` query parameter understood by ADCaaS.
+
+    ``where`` is a dict of property conditions, ``order`` a list such as
+    ``['name ASC']``, ``fields`` a list of properties to return and
+    ``include`` a list of relations to embed in each returned object.
+    """
+    query = {}
+    if where:
+        query['where'] = where
+    if limit is not None:
+        query['limit'] = limit
+    if skip:
+        query['skip'] = skip
+    if order:
+        query['order'] = order
+    if fields:
+        query['fields'] = dict((field, True) for field in fields)
+    if include:
+        query['include'] = [{'relation': relation} for relation in include]
+    if not query:
+        return {}
+    return {'filter': json.dumps(query)}
 
-    def __setattribute__(self, name, value):
-        self.__dict__[name] = value
 
 @profiler.trace
-def adc_list(request):
-    url = '%s/adcaas/v1/adcs' % ADCAAS_ENDPOINT
-    headers = {
-        'tenant-id': request.user.tenant_id, 
-        'x-auth-token': request.user.token.id,
-        'content-type': 'application/json'
-    }
+def resource_list(request, resource_class, parent_id=None, cached=True,
+                  **filters):
+    """List resources of ``resource_class``.
+
+    Keyword arguments are turned into a server-side filter, see
+    :func:`_filter_params`.  Results are cached per tenant for
+    ADCAAS_CACHE_TIMEOUT seconds, unless ``cached`` is false.
+    """
+    path = _resource_path(resource_class, parent_id=parent_id)
+    params = _filter_params(**filters)
+
+    def fetch():
+        response = _request(request, 'GET', path, params=params)
+        return json.loads(response.content)[resource_class._collection]
+
+    if cached:
+        items = _cached(request, resource_class._collection,
+                        ('list', path, params), fetch)
+    else:
+        items = fetch()
+    return [resource_class(item, request) for item in items]
+
+
+def _iter_collection(chunks, key):
+    """Yield the items of the ``key`` array of a JSON list response.
+
+    ``chunks`` is an iterable of text chunks which together hold a JSON
+    object such as ``{"adcs": [{...}, {...}]}``.  Every item is decoded and
+    yielded as soon as it is complete, so neither the whole body nor the
+    whole decoded list has to be kept in memory.
+    """
+    decoder = json.JSONDecoder()
+    start = re.compile(r'"%s"\s*:\s*\[' % re.escape(key))
+    chunks = iter(chunks)
+    buf = ''
+    pos = None
+    while pos is None:
+        chunk = next(chunks, None)
+        if chunk is None:
+            raise ValueError('No "%s" list in response' % key)
+        buf += chunk
+        match = start.search(buf)
+        if match:
+            pos = match.end()
+
+    while True:
+        while pos < len(buf) and buf[pos] in ' \t\r\n,':
+            pos += 1
+        if pos < len(buf) and buf[pos] == ']':
+            return
+        try:
+            if pos == len(buf):
+                raise ValueError('Need more data')
+            item, pos = decoder.raw_decode(buf, pos)
+        except ValueError:
+            chunk = next(chunks, None)
+            if chunk is None:
+                raise ValueError('Truncated "%s" list in response' % key)
+            buf = buf[pos:] + chunk
+            pos = 0
+            continue
+        yield item
+
+
+def resource_iter(request, resource_class, parent_id=None, **filters):
+    """Iterate over resources of ``resource_class`` as they are received.
+
+    Unlike :func:`resource_list` the response is streamed and decoded item
+    by item, which keeps memory flat for tenants with many resources.
+    Streamed lists are not cached.  The request is only sent once
+    iteration starts.
+    """
+    path = _resource_path(resource_class, parent_id=parent_id)
+    response = _request(request, 'GET', path, stream=True,
+                        params=_filter_params(**filters))
+    try:
+        decoder = codecs.getincrementaldecoder('utf-8')()
+        chunks = (decoder.decode(chunk)
+                  for chunk in response.iter_content(STREAM_CHUNK_SIZE))
+        for item in _iter_collection(chunks, resource_class._collection):
+            yield resource_class(item, request)
+    finally:
+        response.close()
+
+
+@profiler.trace
+def resource_get(request, resource_class, obj_id, parent_id=None):
+    path = _resource_path(resource_class, obj_id, parent_id)
+
+    def fetch():
+        response = _request(request, 'GET', path)
+        return json.loads(response.content)[resource_class._resource]
+
+    item = _cached(request, resource_class._collection, ('get', path), fetch)
+    return resource_class(item, request)
+
+
+@profiler.trace
+def resource_count(request, resource_class, where=None):
+    params = {'where': json.dumps(where)} if where else {}
+    response = _request(request, 'GET',
+                        '%s/count' % _resource_path(resource_class),
+                        params=params)
+    return json.loads(response.content)['count']
+
+
+@profiler.trace
+def resource_create(request, resource_class, data, parent_id=None):
+    try:
+        response = _request(request, 'POST',
+                            _resource_path(resource_class,
+                                           parent_id=parent_id),
+                            data=json.dumps(data))
+    finally:
+        invalidate_cache(request, resource_class)
+    item = json.loads(response.content)[resource_class._resource]
+    return resource_class(item, request)
+
+
+@profiler.trace
+def resource_update(request, resource_class, obj_id, data, parent_id=None):
+    try:
+        _request(request, 'PATCH',
+                 _resource_path(resource_class, obj_id, parent_id),
+                 expected=204, data=json.dumps(data))
+    finally:
+        invalidate_cache(request, resource_class)
 
-    response = requests.get(url, headers=headers)
-    if response.status_code != 200: 
-        # TODO: use horizon exceptions.handle()..
-        raise Exception('Failed to request: %s' % response.reason)
-    
-    rlt = []
-    adcs = json.loads(response.content)['adcs']
-    for n in adcs:
-        adc = ADCInstance(n, request)
-        rlt.append(adc)
 
-    return rlt
+@profiler.trace
+def resource_delete(request, resource_class, obj_id, parent_id=None):
+    try:
+        _request(request, 'DELETE',
+                 _resource_path(resource_class, obj_id, parent_id),
+                 expected=204)
+    finally:
+        invalidate_cache(request, resource_class)
+
+
+@profiler.trace
+def resource_list_many(request, queries):
+    """Fetch several resource collections concurrently.
+
+    ``queries`` maps a caller chosen key to a ``(resource_class, kwargs)``
+    tuple, where kwargs are passed on to :func:`resource_list`.  Returns a
+    dict with the same keys and the listed resources as values.  If any of
+    the calls fails, its exception is raised once all calls have finished.
+    """
+    calls = dict(
+        (key, (functools.partial(resource_list, **kwargs), request,
+               resource_class))
+        for key, (resource_class, kwargs) in queries.items())
+    return fanout.gather(request, calls, raise_errors=True)
+
+
+@profiler.trace
+def adc_list(request, **filters):
+    return resource_list(request, ADCInstance, **filters)
+
+
+def adc_iter(request, **filters):
+    return resource_iter(request, ADCInstance, **filters)
+
+
+@profiler.trace
+def adc_list_paged(request, offset=0, sort_key='createdAt', sort_dir='desc',
+                   filters=None, paginate=False):
+    """List one page of ADCs, filtered and sorted by ADCaaS.
+
+    ``offset`` is the number of ADCs to skip, ``filters`` a dict of
+    property values the ADCs must match and ``sort_key`` one of
+    ``ADC_SORT_KEYS``.  The id is always used as a secondary sort key so
+    that pages stay stable when the primary key has duplicates.
+
+    If ``paginate`` is set, at most API_RESULT_PAGE_SIZE ADCs are returned,
+    otherwise up to API_RESULT_LIMIT.  Returns a tuple of the ADCs and
+    whether there is more data after and before this page.
+    """
+    if sort_key not in ADC_SORT_KEYS:
+        raise ValueError('Unsupported sort key: %s' % sort_key)
+    if sort_dir not in ('asc', 'desc'):
+        raise ValueError('Unsupported sort direction: %s' % sort_dir)
+
+    limit = getattr(settings, 'API_RESULT_LIMIT', 1000)
+    page_size = utils.get_page_size(request)
+    request_size = page_size + 1 if paginate else limit
+    offset = max(offset, 0)
+
+    adcs = adc_list(request,
+                    where=filters or None,
+                    order=['%s %s' % (sort_key, sort_dir.upper()), 'id ASC'],
+                    limit=request_size,
+                    skip=offset)
+
+    has_more_data = False
+    has_prev_data = False
+    if paginate:
+        if len(adcs) > page_size:
+            adcs = adcs[:page_size]
+            has_more_data = True
+        has_prev_data = offset > 0
+    return adcs, has_more_data, has_prev_data
+
+
+@profiler.trace
+def adc_get(request, adc_id):
+    return resource_get(request, ADCInstance, adc_id)
+
+
+@profiler.trace
+def adc_update(request, adc_id, data):
+    resource_update(request, ADCInstance, adc_id, data)
+
 
 @profiler.trace
 def adc_create(request):
 
     def net2json(request):
         rlt = {}
-        for (k, v) in request.DATA['networkSettings'].items(): 
+        for (k, v) in request.DATA['networkSettings'].items():
             for n in range(0, len(v)):
                 rlt['%s%d' % (k, n)] = {
                     'type': k,
@@ -65,12 +596,6 @@ def adc_create(request):
                 }
         return rlt
 
-    url = '%s/adcaas/v1/adcs' % ADCAAS_ENDPOINT
-    headers = {
-        'tenant-id': request.user.tenant_id, 
-        'x-auth-token': request.user.token.id,
-        'content-type': 'application/json'
-    }
     json_data = {
         'name': request.DATA['name'],
         'description': 'should not be shorter than 1 characters.. why?!',
@@ -82,23 +607,9 @@ def adc_create(request):
         }
     }
 
-    response = requests.post(url, headers=headers, data=json.dumps(json_data))
-    if response.status_code != 200: 
-        # TODO: use horizon exceptions.handle()..
-        raise Exception('Failed to request: %s' % response.reason)
-    
-    return json.loads(response.content)['adc']
+    return resource_create(request, ADCInstance, json_data).to_dict()
+
 
 @profiler.trace
 def adc_delete(request, obj_id):
-    url = '%s/adcaas/v1/adcs/%s' % (ADCAAS_ENDPOINT, obj_id)
-    headers = {
-        'tenant-id': request.user.tenant_id, 
-        'x-auth-token': request.user.token.id,
-        'content-type': 'application/json'
-    }
-
-    response = requests.delete(url, headers=headers)
-    if response.status_code != 204: 
-        # TODO: use horizon exceptions.handle()..
-        raise Exception('Failed to request: %s' % response.reason)
+    resource_delete(request, ADCInstance, obj_id)
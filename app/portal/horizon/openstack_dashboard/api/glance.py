@@ -23,15 +23,17 @@ import itertools
 import json
 import logging
 import os
+import threading
+import time
 
 from django.conf import settings
+from django.core.cache import cache
 from django.core.files.uploadedfile import InMemoryUploadedFile
-from django.core.files.uploadedfile import SimpleUploadedFile
 from django.core.files.uploadedfile import TemporaryUploadedFile
 
+import futurist
 import glanceclient as glance_client
 import six
-from six.moves import _thread as thread
 
 from horizon.utils import functions as utils
 from horizon.utils.memoized import memoized
@@ -135,18 +137,15 @@ def glanceclient(request, version=None):
     api_version = VERSIONS.get_active_version()
 
     url = base.url_for(request, 'image')
-    insecure = getattr(settings, 'OPENSTACK_SSL_NO_VERIFY', False)
-    cacert = getattr(settings, 'OPENSTACK_SSL_CACERT', None)
+    session = base.get_session(request, url)
 
     # TODO(jpichon): Temporarily keep both till we update the API calls
     # to stop hardcoding a version in this file. Once that's done we
     # can get rid of the deprecated 'version' parameter.
     if version is None:
-        return api_version['client'].Client(url, token=request.user.token.id,
-                                            insecure=insecure, cacert=cacert)
+        return api_version['client'].Client(url, session=session)
     else:
-        return glance_client.Client(version, url, token=request.user.token.id,
-                                    insecure=insecure, cacert=cacert)
+        return glance_client.Client(version, url, session=session)
 
 
 # Note: Glance is adding more than just public and private in Newton or later
@@ -426,6 +425,183 @@ class ExternallyUploadedImage(Image):
         return self._token_id
 
 
+# Seconds between two saves of the progress of an upload to the cache.
+UPLOAD_PROGRESS_INTERVAL = 1
+# Seconds the progress of an upload is kept once it is finished.
+UPLOAD_PROGRESS_TIMEOUT = 24 * 3600
+
+_upload_executor = None
+_upload_executor_lock = threading.Lock()
+
+
+def _get_upload_executor():
+    """Return the thread pool uploading image data for this process."""
+    global _upload_executor
+    if _upload_executor is None:
+        with _upload_executor_lock:
+            if _upload_executor is None:
+                _upload_executor = futurist.ThreadPoolExecutor(
+                    max_workers=getattr(settings, 'IMAGE_UPLOAD_WORKERS', 2))
+    return _upload_executor
+
+
+def _upload_progress_key(image_id):
+    return 'glance_image_upload:%s' % image_id
+
+
+class ImageUploadProgress(object):
+    """Progress of the upload of image data by Horizon.
+
+    The progress is saved to the Django cache at most every
+    UPLOAD_PROGRESS_INTERVAL seconds, so that any dashboard process can
+    report it while the upload runs in another one.  ``status`` is one of
+    ``queued``, ``uploading``, ``retrying``, ``active`` and ``failed``.
+    """
+
+    def __init__(self, image_id, project_id, size):
+        self.image_id = image_id
+        self.project_id = project_id
+        self.size = size
+        self.uploaded = 0
+        self.attempt = 0
+        self.status = 'queued'
+        self.error = None
+        self.started_at = None
+        self.updated_at = time.time()
+        self._saved_at = 0
+
+    def start(self, attempt):
+        self.attempt = attempt
+        self.status = 'uploading' if attempt == 1 else 'retrying'
+        self.uploaded = 0
+        self.started_at = time.time()
+        self.save()
+
+    def add(self, nbytes):
+        self.uploaded += nbytes
+        self.updated_at = time.time()
+        if self.updated_at - self._saved_at >= UPLOAD_PROGRESS_INTERVAL:
+            self.save()
+
+    def finish(self, error=None):
+        self.status = 'failed' if error else 'active'
+        self.error = error and six.text_type(error)
+        self.updated_at = time.time()
+        self.save()
+
+    def to_dict(self):
+        elapsed = (self.updated_at - self.started_at
+                   if self.started_at else 0)
+        rate = self.uploaded / elapsed if elapsed > 0 else 0
+        return {
+            'image_id': self.image_id,
+            'project_id': self.project_id,
+            'status': self.status,
+            'size': self.size,
+            'uploaded': self.uploaded,
+            'percent': (100 * self.uploaded // self.size
+                        if self.size else None),
+            'attempt': self.attempt,
+            'bytes_per_second': rate,
+            'eta': ((self.size - self.uploaded) / rate
+                    if self.size and rate else None),
+            'error': self.error,
+        }
+
+    def save(self):
+        self._saved_at = time.time()
+        cache.set(_upload_progress_key(self.image_id), self.to_dict(),
+                  UPLOAD_PROGRESS_TIMEOUT)
+
+
+class _ProgressReader(object):
+    """File-like wrapper counting the bytes read from the image data."""
+
+    def __init__(self, data, progress):
+        self._data = data
+        self._progress = progress
+
+    def read(self, size=-1):
+        chunk = self._data.read(size)
+        self._progress.add(len(chunk))
+        return chunk
+
+    def __getattr__(self, attr):
+        return getattr(self._data, attr)
+
+
+def _spool_to_disk(data):
+    """Copy an uploaded file kept in memory to a temporary file.
+
+    The in-memory file is closed by Django once the request is over, so
+    the upload thread needs its own copy, which is written in chunks.
+    """
+    spooled = TemporaryUploadedFile(data.name, data.content_type,
+                                    data.size, data.charset)
+    for chunk in data.chunks():
+        spooled.write(chunk)
+    spooled.seek(0)
+    return spooled
+
+
+def _upload_image_data(request, image_id, data, progress):
+    """Upload the data of an image, starting over after a failure.
+
+    Glance can not resume a partial upload, but with v2 an image whose
+    upload failed goes back to queued and accepts the data again, so the
+    upload is retried from the start of the file up to
+    IMAGE_UPLOAD_RETRIES times.
+    """
+    attempts = 1
+    if VERSIONS.active >= 2:
+        attempts += getattr(settings, 'IMAGE_UPLOAD_RETRIES', 2)
+    try:
+        for attempt in range(1, attempts + 1):
+            data.seek(0)
+            progress.start(attempt)
+            reader = _ProgressReader(data, progress)
+            try:
+                if VERSIONS.active < 2:
+                    glanceclient(request).images.update(
+                        image_id, data=reader, purge_props=False)
+                else:
+                    glanceclient(request).images.upload(image_id, reader)
+            except Exception as e:
+                if attempt == attempts:
+                    LOG.warning('Failed to upload the data of image %s '
+                                '(%s)', image_id, e)
+                    progress.finish(error=e)
+                    return
+                LOG.info('Upload of the data of image %s failed, retrying '
+                         '(%s)', image_id, e)
+            else:
+                progress.finish()
+                return
+    finally:
+        filename = str(data.file.name)
+        try:
+            os.remove(filename)
+        except OSError as e:
+            LOG.warning('Failed to remove temporary image file '
+                        '%(file)s (%(e)s)',
+                        {'file': filename, 'e': e})
+
+
+def image_upload_progress(request, image_id):
+    """Return the progress of an image upload started by Horizon.
+
+    Returns a dict with the ``status`` of the upload, the ``size`` of the
+    data and the bytes ``uploaded`` so far, the ``percent`` done, the
+    ``attempt`` being made, the throughput in ``bytes_per_second``, the
+    ``eta`` in seconds and the ``error`` of a failed upload, or None if
+    no upload of the image by Horizon is known.
+    """
+    progress = cache.get(_upload_progress_key(image_id))
+    if progress is None or progress['project_id'] != request.user.project_id:
+        return None
+    return progress
+
+
 def create_image_metadata(data):
     """Generate metadata dict for a new image from a given form data."""
 
@@ -509,7 +685,8 @@ def image_create(request, **kwargs):
     asynchronously.
 
     In the case of 'data' the process of uploading the data may take
-    some time and is handed off to a separate thread.
+    some time and is handed off to a bounded pool of upload threads, its
+    progress can be followed with :func:`image_upload_progress`.
     """
     data = kwargs.pop('data', None)
     location = None
@@ -525,32 +702,16 @@ def image_create(request, **kwargs):
             # The image data is meant to be uploaded externally, return a
             # special wrapper to bypass the web server in a subsequent upload
             return ExternallyUploadedImage(image, request)
-        elif isinstance(data, TemporaryUploadedFile):
+        elif isinstance(data, InMemoryUploadedFile):
+            data = _spool_to_disk(data)
+        if isinstance(data, TemporaryUploadedFile):
             # Hack to fool Django, so we can keep file open in the new thread.
             data.file.close_called = True
-        elif isinstance(data, InMemoryUploadedFile):
-            # Clone a new file for InMemeoryUploadedFile.
-            # Because the old one will be closed by Django.
-            data = SimpleUploadedFile(data.name,
-                                      data.read(),
-                                      data.content_type)
-        if VERSIONS.active < 2:
-            thread.start_new_thread(image_update,
-                                    (request, image.id),
-                                    {'data': data})
-        else:
-            def upload():
-                try:
-                    return glanceclient(request).images.upload(image.id, data)
-                finally:
-                    filename = str(data.file.name)
-                    try:
-                        os.remove(filename)
-                    except OSError as e:
-                        LOG.warning('Failed to remove temporary image file '
-                                    '%(file)s (%(e)s)',
-                                    {'file': filename, 'e': e})
-            thread.start_new_thread(upload, ())
+        progress = ImageUploadProgress(image.id, request.user.project_id,
+                                       data.size)
+        progress.save()
+        _get_upload_executor().submit(_upload_image_data, request, image.id,
+                                      data, progress)
 
     return Image(image)
 
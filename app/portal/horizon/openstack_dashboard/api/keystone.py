@@ -345,10 +345,17 @@ def tenant_get(request, project, admin=True):
         raise
 
 
+def _forget_project_lists(user=None):
+    """Drop the cached projects of ``user``, or of every user if None."""
+    auth_utils.forget_project_lists(getattr(user, 'id', user))
+
+
 @profiler.trace
 def tenant_delete(request, project):
     manager = VERSIONS.get_project_manager(request, admin=True)
-    return manager.delete(project)
+    ret = manager.delete(project)
+    _forget_project_lists()
+    return ret
 
 
 @profiler.trace
@@ -400,13 +407,15 @@ def tenant_update(request, project, name=None, description=None,
     manager = VERSIONS.get_project_manager(request, admin=True)
     try:
         if VERSIONS.active < 3:
-            return manager.update(project, name, description, enabled,
-                                  **kwargs)
+            ret = manager.update(project, name, description, enabled,
+                                 **kwargs)
         else:
-            return manager.update(project, name=name, description=description,
-                                  enabled=enabled, domain=domain, **kwargs)
+            ret = manager.update(project, name=name, description=description,
+                                 enabled=enabled, domain=domain, **kwargs)
     except keystone_exceptions.Conflict:
         raise exceptions.Conflict()
+    _forget_project_lists()
+    return ret
 
 
 @profiler.trace
@@ -632,13 +641,17 @@ def group_update(request, group_id, name=None, description=None):
 @profiler.trace
 def add_group_user(request, group_id, user_id):
     manager = keystoneclient(request, admin=True).users
-    return manager.add_to_group(group=group_id, user=user_id)
+    ret = manager.add_to_group(group=group_id, user=user_id)
+    _forget_project_lists(user_id)
+    return ret
 
 
 @profiler.trace
 def remove_group_user(request, group_id, user_id):
     manager = keystoneclient(request, admin=True).users
-    return manager.remove_from_group(group=group_id, user=user_id)
+    ret = manager.remove_from_group(group=group_id, user=user_id)
+    _forget_project_lists(user_id)
+    return ret
 
 
 def get_project_groups_roles(request, project):
@@ -806,10 +819,13 @@ def add_tenant_user_role(request, project=None, user=None, role=None,
     """Adds a role for a user on a tenant."""
     manager = keystoneclient(request, admin=True).roles
     if VERSIONS.active < 3:
-        return manager.add_user_role(user, role, project)
+        ret = manager.add_user_role(user, role, project)
     else:
-        return manager.grant(role, user=user, project=project,
-                             group=group, domain=domain)
+        ret = manager.grant(role, user=user, project=project,
+                            group=group, domain=domain)
+    # A role of a group changes the projects of all its members.
+    _forget_project_lists(None if group else user)
+    return ret
 
 
 @profiler.trace
@@ -818,10 +834,12 @@ def remove_tenant_user_role(request, project=None, user=None, role=None,
     """Removes a given single role for a user from a tenant."""
     manager = keystoneclient(request, admin=True).roles
     if VERSIONS.active < 3:
-        return manager.remove_user_role(user, role, project)
+        ret = manager.remove_user_role(user, role, project)
     else:
-        return manager.revoke(role, user=user, project=project,
-                              group=group, domain=domain)
+        ret = manager.revoke(role, user=user, project=project,
+                             group=group, domain=domain)
+    _forget_project_lists(None if group else user)
+    return ret
 
 
 def remove_tenant_user(request, project=None, user=None, domain=None):
@@ -843,16 +861,20 @@ def roles_for_group(request, group, domain=None, project=None):
 def add_group_role(request, role, group, domain=None, project=None):
     """Adds a role for a group on a domain or project."""
     manager = keystoneclient(request, admin=True).roles
-    return manager.grant(role=role, group=group, domain=domain,
-                         project=project)
+    ret = manager.grant(role=role, group=group, domain=domain,
+                        project=project)
+    _forget_project_lists()
+    return ret
 
 
 @profiler.trace
 def remove_group_role(request, role, group, domain=None, project=None):
     """Removes a given single role for a group from a domain or project."""
     manager = keystoneclient(request, admin=True).roles
-    return manager.revoke(role=role, group=group, project=project,
-                          domain=domain)
+    ret = manager.revoke(role=role, group=group, project=project,
+                         domain=domain)
+    _forget_project_lists()
+    return ret
 
 
 @profiler.trace
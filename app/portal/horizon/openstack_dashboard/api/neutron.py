@@ -762,15 +762,24 @@ def get_ipver_str(ip_version):
 
 @memoized
 def neutronclient(request):
-    insecure = getattr(settings, 'OPENSTACK_SSL_NO_VERIFY', False)
-    cacert = getattr(settings, 'OPENSTACK_SSL_CACERT', None)
-    c = neutron_client.Client(token=request.user.token.id,
-                              auth_url=base.url_for(request, 'identity'),
-                              endpoint_url=base.url_for(request, 'network'),
-                              insecure=insecure, ca_cert=cacert)
+    network_url = base.url_for(request, 'network')
+    c = neutron_client.Client(session=base.get_session(request, network_url),
+                              endpoint_override=network_url)
     return c
 
 
+@profiler.trace
+def resource_count(request, resource, **params):
+    """Return the number of neutron resources matching ``params``.
+
+    ``resource`` is the plural name of the resource in the neutron API,
+    such as ``networks`` or ``security_groups``.  Only the ids of the
+    resources are retrieved.
+    """
+    list_method = getattr(neutronclient(request), 'list_%s' % resource)
+    return len(list_method(fields='id', **params)[resource])
+
+
 @profiler.trace
 def list_resources_with_long_filters(list_method,
                                      filter_attr, filter_values, **params):
@@ -21,9 +21,12 @@
 from __future__ import absolute_import
 
 import collections
+import datetime
+import itertools
 import logging
 
 from django.conf import settings
+from django.core.cache import cache
 from django.utils.translation import ugettext_lazy as _
 
 from novaclient import api_versions
@@ -32,11 +35,13 @@ from novaclient import exceptions as nova_exceptions
 from novaclient.v2 import instance_action as nova_instance_action
 from novaclient.v2 import list_extensions as nova_list_extensions
 from novaclient.v2 import servers as nova_servers
+from novaclient.v2 import usage as nova_usage
 
 from horizon import exceptions as horizon_exceptions
 from horizon.utils import functions as utils
 from horizon.utils.memoized import memoized
 from horizon.utils.memoized import memoized_with_request
+from horizon.utils import workers
 
 from openstack_dashboard.api import base
 from openstack_dashboard.api import microversions
@@ -53,8 +58,6 @@ VERSIONS.load_supported_version(2, {"client": nova_client, "version": 2})
 INSTANCE_ACTIVE_STATE = 'ACTIVE'
 VOLUME_STATE_AVAILABLE = "available"
 DEFAULT_QUOTA_NAME = 'default'
-INSECURE = getattr(settings, 'OPENSTACK_SSL_NO_VERIFY', False)
-CACERT = getattr(settings, 'OPENSTACK_SSL_CACERT', None)
 
 
 @memoized
@@ -281,15 +284,9 @@ def novaclient(request_auth_params, version=None):
     if version is None:
         version = VERSIONS.get_active_version()['version']
     c = nova_client.Client(version,
-                           username,
-                           token_id,
-                           project_id=project_id,
-                           project_domain_id=project_domain_id,
-                           auth_url=auth_url,
-                           insecure=INSECURE,
-                           cacert=CACERT,
+                           session=base.get_session_pool().get(nova_url,
+                                                               token_id),
                            http_log_debug=settings.DEBUG,
-                           auth_token=token_id,
                            endpoint_override=nova_url)
     return c
 
@@ -787,6 +784,196 @@ def usage_list(request, start, end):
     return [NovaUsage(u) for u in usage_list]
 
 
+@profiler.trace
+def usage_get_iter(request, tenant_id, start, end):
+    """Yield the usage of a tenant one page at a time.
+
+    Each page is a NovaUsage with the servers of that page and the totals
+    for these servers.  The pages are fetched from Nova only as they are
+    consumed.
+    """
+    client = upgrade_api(request, novaclient(request), '2.40')
+    usage = client.usage.get(tenant_id, start, end)
+    yield NovaUsage(usage)
+    if client.api_version >= api_versions.APIVersion('2.40'):
+        marker = _get_usage_marker(usage)
+        while marker:
+            usage = client.usage.get(tenant_id, start, end, marker=marker)
+            marker = _get_usage_marker(usage)
+            if marker:
+                yield NovaUsage(usage)
+
+
+@profiler.trace
+def usage_list_iter(request, start, end):
+    """Yield the usage of each tenant as the pages arrive from Nova.
+
+    The pages are fetched only as the usages are consumed and only one
+    page is kept at a time.  A tenant whose servers are split across
+    pages is yielded once, when its last page has been read.
+    """
+    client = upgrade_api(request, novaclient(request), '2.40')
+    usage_list = client.usage.list(start, end, True)
+    paginated = client.api_version >= api_versions.APIVersion('2.40')
+    pending = None
+    while usage_list:
+        for usage in usage_list:
+            if pending is not None and pending.tenant_id == usage.tenant_id:
+                _merge_usage(pending, usage)
+                continue
+            if pending is not None:
+                yield NovaUsage(pending)
+            pending = usage
+        marker = paginated and _get_usage_list_marker(usage_list)
+        if not marker:
+            break
+        usage_list = client.usage.list(start, end, True, marker=marker)
+    if pending is not None:
+        yield NovaUsage(pending)
+
+
+USAGE_TOTALS = ('total_hours', 'total_memory_mb_usage',
+                'total_vcpus_usage', 'total_local_gb_usage')
+
+
+def _usage_info(usage):
+    """Return the data of a NovaUsage as a dict which can be cached."""
+    # Read the attributes of the novaclient resource rather than its _info,
+    # which does not include the pages merged by usage_get and usage_list.
+    resource = vars(usage._apiresource)
+    return dict((attr, resource[attr]) for attr in NovaUsage._attrs
+                if attr in resource)
+
+
+def _merge_usage_infos(infos):
+    """Merge usage dicts of one tenant for consecutive periods.
+
+    Totals are summed, as are the hours of each server, and the other
+    server fields are taken from the latest period.
+    """
+    merged = {}
+    server_usages = None
+    for info in infos:
+        for attr in ('start', 'tenant_id'):
+            if attr in info:
+                merged.setdefault(attr, info[attr])
+        if 'stop' in info:
+            merged['stop'] = info['stop']
+        for attr in USAGE_TOTALS:
+            if attr in info:
+                merged[attr] = merged.get(attr, 0) + info[attr]
+        if 'server_usages' not in info:
+            continue
+        if server_usages is None:
+            server_usages = collections.OrderedDict()
+        for server_usage in info['server_usages']:
+            server_usage = dict(server_usage)
+            previous = server_usages.get(server_usage.get('instance_id'))
+            if previous is not None:
+                server_usage['hours'] = (previous.get('hours', 0) +
+                                         server_usage.get('hours', 0))
+            server_usages[server_usage.get('instance_id')] = server_usage
+    if server_usages is not None:
+        merged['server_usages'] = list(server_usages.values())
+    return NovaUsage(nova_usage.Usage(nova_usage.UsageManager(None), merged,
+                                      loaded=True))
+
+
+def _usage_periods(request, tenant_id, start, end):
+    """Split start..end into days which are over and the remaining period.
+
+    Returns a list of (cache key, start, end) tuples in time order.  Only
+    days which are over get a cache key, their usage can not change any
+    more.  The remaining period, from the start of today, is fetched
+    every time.
+    """
+    periods = []
+    day = start
+    if start.time() == datetime.time():
+        today = datetime.datetime.combine(datetime.datetime.utcnow().date(),
+                                          datetime.time())
+        while day < today and day.date() <= end.date():
+            key = 'nova_usage:%s:%s:%s:%s' % (
+                request.user.services_region, request.user.project_id,
+                tenant_id or '*', day.date().isoformat())
+            periods.append((key, day, day + datetime.timedelta(days=1)))
+            day += datetime.timedelta(days=1)
+    if day <= end:
+        periods.append((None, day, end))
+    return periods
+
+
+def _usage_by_day(request, tenant_id, start, end, fetch):
+    """Return the usage dicts of each period of start..end, in time order.
+
+    ``fetch`` is called with the start and end of a period and returns the
+    usage dicts of that period.  Days which are over are taken from the
+    cache when possible.  The other periods are fetched concurrently,
+    OVERVIEW_USAGE_CONCURRENCY at a time, so that a cold cache does not
+    take the whole worker pool.
+    """
+    periods = _usage_periods(request, tenant_id, start, end)
+    cached = cache.get_many([key for key, _start, _end in periods if key])
+    missing = [index for index, (key, _start, _end) in enumerate(periods)
+               if key not in cached]
+    batch_size = max(1, getattr(settings, 'OVERVIEW_USAGE_CONCURRENCY', 4))
+    timeout = getattr(settings, 'OVERVIEW_USAGE_CACHE_TIMEOUT', 86400)
+    fetched = {}
+    for batch_start in range(0, len(missing), batch_size):
+        calls = dict((index, (fetch, periods[index][1], periods[index][2]))
+                     for index in missing[batch_start:
+                                          batch_start + batch_size])
+        results = workers.gather(calls, raise_errors=True, name='usage')
+        # Each batch is cached as it is fetched, the next request does not
+        # fetch it again if a later batch fails.
+        cache.set_many(dict((periods[index][0], infos)
+                            for index, infos in results.items()
+                            if periods[index][0]), timeout)
+        fetched.update(results)
+    return [cached[key] if key in cached else fetched[index]
+            for index, (key, _start, _end) in enumerate(periods)]
+
+
+@profiler.trace
+def usage_get_by_day(request, tenant_id, start, end):
+    """Get the usage of a tenant, caching it for the days which are over.
+
+    Returns the same as :func:`usage_get`, but the usage is gathered day
+    by day and the days before today are cached for
+    OVERVIEW_USAGE_CACHE_TIMEOUT seconds, so that only today is fetched
+    from Nova again.  Days which are over are counted up to midnight.
+    """
+    if not getattr(settings, 'OVERVIEW_USAGE_CACHE_TIMEOUT', 86400):
+        return usage_get(request, tenant_id, start, end)
+
+    def fetch(period_start, period_end):
+        return [_usage_info(usage_get(request, tenant_id, period_start,
+                                      period_end))]
+
+    infos = _usage_by_day(request, tenant_id, start, end, fetch)
+    return _merge_usage_infos(itertools.chain(*infos))
+
+
+@profiler.trace
+def usage_list_by_day(request, start, end):
+    """Get the usage of all tenants, caching it for the days which are over.
+
+    See :func:`usage_get_by_day`.
+    """
+    if not getattr(settings, 'OVERVIEW_USAGE_CACHE_TIMEOUT', 86400):
+        return usage_list(request, start, end)
+
+    def fetch(period_start, period_end):
+        return [_usage_info(usage)
+                for usage in usage_list(request, period_start, period_end)]
+
+    tenants = collections.OrderedDict()
+    for info in itertools.chain(*_usage_by_day(request, None, start, end,
+                                               fetch)):
+        tenants.setdefault(info.get('tenant_id'), []).append(info)
+    return [_merge_usage_infos(infos) for infos in tenants.values()]
+
+
 @profiler.trace
 def get_password(request, instance_id, private_key=None):
     return novaclient(request).servers.get_password(instance_id, private_key)
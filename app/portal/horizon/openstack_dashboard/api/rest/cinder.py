@@ -88,6 +88,7 @@ class Volumes(generic.View):
             availability_zone=request.DATA['availability_zone'],
             source_volid=request.DATA['source_volid']
         )
+        quotas.invalidate_tenant_quota_usages(request)
 
         return rest_utils.CreatedResponse(
             '/api/cinder/volumes/%s' % volume.id,
@@ -6,6 +6,10 @@ from six.moves import zip as izip
 from openstack_dashboard import api
 from openstack_dashboard.api.rest import urls
 from openstack_dashboard.api.rest import utils as rest_utils
+from openstack_dashboard.usage import quotas
+
+# Properties of the ADCs returned to status polls.
+STATUS_FIELDS = ['id', 'status', 'lastErr', 'management']
 
 @urls.register
 class ADC(generic.View):
@@ -18,4 +22,37 @@ class ADC(generic.View):
         """
 
         rlt = api.f5wafaas.adc_create(request)
-        return rest_utils.CreatedResponse('/api/f5services/adcs/%s' % rlt['id'], rlt)
\ No newline at end of file
+        quotas.invalidate_tenant_quota_usages(request)
+        return rest_utils.CreatedResponse('/api/f5services/adcs/%s' % rlt['id'], rlt)
+
+
+@urls.register
+class ADCStatuses(generic.View):
+    """API for polling the status of many ADCs at once"""
+    url_regex = r'f5services/adcs/status/$'
+
+    @rest_utils.ajax()
+    def get(self, request):
+        """Get the status of the ADCs listed in the ``ids`` parameter.
+
+        ``ids`` is a comma separated list of ADC ids. Only those ADCs are
+        requested, with a single adc_list call filtered by ADCaaS, so polling
+        every transitional row of the ADC table costs one request however
+        many rows there are. The response is not cached, otherwise a status
+        change could be hidden for ADCAAS_CACHE_TIMEOUT seconds. ADCs which
+        no longer exist are left out of the result.
+        """
+        ids = set(i for i in request.GET.get('ids', '').split(',') if i)
+        items = []
+        if ids:
+            adcs = api.f5wafaas.adc_list(
+                request, cached=False, where={'id': {'inq': sorted(ids)}},
+                fields=STATUS_FIELDS)
+            for adc in adcs:
+                items.append({
+                    'id': adc.id,
+                    'status': getattr(adc, 'status', None),
+                    'lastErr': getattr(adc, 'lastErr', None),
+                    'management': getattr(adc, 'management', None),
+                })
+        return {'items': items}
@@ -111,6 +111,26 @@ class ImageProperties(generic.View):
         )
 
 
+@urls.register
+class ImageUpload(generic.View):
+    """API for the progress of an image upload through Horizon."""
+    url_regex = r'glance/images/(?P<image_id>[^/]+)/upload/$'
+
+    @rest_utils.ajax()
+    def get(self, request, image_id):
+        """Get the progress of the upload of the data of an image.
+
+        The result is an object with the upload ``status``, the ``size``,
+        ``uploaded`` bytes and ``percent`` done, the ``attempt`` being
+        made, ``bytes_per_second``, ``eta`` and ``error``, see
+        api.glance.image_upload_progress.
+        """
+        progress = api.glance.image_upload_progress(request, image_id)
+        if progress is None:
+            raise rest_utils.AjaxError(404, 'No upload of this image found')
+        return progress
+
+
 class UploadObjectForm(forms.Form):
     data = forms.FileField(required=False)
 
@@ -377,6 +377,7 @@ class Servers(generic.View):
                 kw[name] = request.DATA[name]
 
         new = api.nova.server_create(*args, **kw)
+        quotas.invalidate_tenant_quota_usages(request)
         return rest_utils.CreatedResponse(
             '/api/nova/servers/%s' % utils_http.urlquote(new.id),
             new.to_dict()
@@ -415,6 +416,7 @@ class Server(generic.View):
     @rest_utils.ajax()
     def delete(self, request, server_id):
         api.nova.server_delete(request, server_id)
+        quotas.invalidate_tenant_quota_usages(request)
 
 
 @urls.register
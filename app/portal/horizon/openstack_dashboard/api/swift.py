@@ -17,11 +17,18 @@
 #    under the License.
 
 from datetime import datetime
+import functools
+import json
+import threading
+import time
 
+import futurist
+from futurist import waiters
 import six.moves.urllib.parse as urlparse
 import swiftclient
 
 from django.conf import settings
+from django.core.cache import cache
 from django.utils.translation import ugettext_lazy as _
 
 from horizon import exceptions
@@ -31,6 +38,15 @@ from openstack_dashboard.contrib.developer.profiler import api as profiler
 
 FOLDER_DELIMITER = "/"
 CHUNK_SIZE = getattr(settings, 'SWIFT_FILE_TRANSFER_CHUNK_SIZE', 512 * 1024)
+# Objects larger than this are uploaded in segments of this size.
+SEGMENT_SIZE = getattr(settings, 'SWIFT_SEGMENT_SIZE', 512 * 1024 * 1024)
+# Objects larger than twice this are downloaded in ranges of this size.
+DOWNLOAD_RANGE_SIZE = getattr(settings, 'SWIFT_DOWNLOAD_RANGE_SIZE',
+                              16 * 1024 * 1024)
+# Number of segments or ranges of one object transferred at once.
+TRANSFER_CONCURRENCY = getattr(settings, 'SWIFT_TRANSFER_CONCURRENCY', 4)
+TRANSFER_POOL_SIZE = getattr(settings, 'SWIFT_TRANSFER_POOL_SIZE', 16)
+SEGMENTS_CONTAINER_SUFFIX = '_segments'
 # Swift ACL
 GLOBAL_READ_ACL = ".r:*"
 LIST_CONTENTS_ACL = ".rlistings"
@@ -282,6 +298,129 @@ def swift_copy_object(request, orig_container_name, orig_object_name,
                                          headers=headers)
 
 
+_transfer_executor = None
+_transfer_executor_lock = threading.Lock()
+
+
+def _get_transfer_executor():
+    """Return the thread pool transferring segments and ranges of objects.
+
+    The pool of SWIFT_TRANSFER_POOL_SIZE threads is shared by the transfers
+    of this process.  Each transfer submits at most
+    SWIFT_TRANSFER_CONCURRENCY segments or ranges to it at once.
+    """
+    global _transfer_executor
+    if _transfer_executor is None:
+        with _transfer_executor_lock:
+            if _transfer_executor is None:
+                _transfer_executor = futurist.ThreadPoolExecutor(
+                    max_workers=TRANSFER_POOL_SIZE)
+    return _transfer_executor
+
+
+def _submit(executor, func, *args):
+    """Submit a segment or range transfer, returns it for :func:`_result`."""
+    return executor.submit(func, *args), functools.partial(func, *args)
+
+
+def _result(transfer):
+    """Return the result of a transfer.
+
+    A transfer still queued behind the transfers of other objects is run in
+    the current thread rather than waited for.
+    """
+    future, call = transfer
+    if future.cancel():
+        return call()
+    return future.result()
+
+
+class _SegmentReader(object):
+    """File-like view of one segment of a file shared by several threads."""
+
+    def __init__(self, object_file, lock, offset, length):
+        self._file = object_file
+        self._lock = lock
+        self._position = offset
+        self._remaining = length
+
+    def read(self, size=-1):
+        if size < 0 or size > self._remaining:
+            size = self._remaining
+        if not size:
+            return b''
+        with self._lock:
+            self._file.seek(self._position)
+            data = self._file.read(size)
+        self._position += len(data)
+        self._remaining -= len(data)
+        return data
+
+
+def _upload_segment(request, container_name, segment_name, segment):
+    return swift_api(request).put_object(container_name, segment_name,
+                                         segment, chunk_size=CHUNK_SIZE)
+
+
+def _upload_segmented_object(request, container_name, object_name,
+                             object_file, headers):
+    """Upload a large file as segments and a manifest object.
+
+    The segments go to the "<container>_segments" container, at most
+    SWIFT_TRANSFER_CONCURRENCY at a time.  A static large object manifest
+    is written when the cluster supports it, a dynamic one otherwise.  The
+    segments already uploaded are deleted if one of them fails.
+    """
+    size = object_file.size
+    segments_container = container_name + SEGMENTS_CONTAINER_SUFFIX
+    prefix = '%s/slo/%s/%s/%s/' % (object_name, time.time(), size,
+                                   SEGMENT_SIZE)
+    swift_api(request).put_container(segments_container)
+
+    lock = threading.Lock()
+    segments = []
+    for index, offset in enumerate(range(0, size, SEGMENT_SIZE)):
+        length = min(SEGMENT_SIZE, size - offset)
+        segments.append(('%s%08d' % (prefix, index), length,
+                         _SegmentReader(object_file, lock, offset, length)))
+
+    executor = _get_transfer_executor()
+    pending = []
+    etags = []
+    try:
+        for name, length, segment in segments:
+            if len(pending) >= TRANSFER_CONCURRENCY:
+                etags.append(_result(pending.pop(0)))
+            pending.append(_submit(executor, _upload_segment, request,
+                                   segments_container, name, segment))
+        while pending:
+            etags.append(_result(pending.pop(0)))
+    except Exception:
+        for future, call in pending:
+            future.cancel()
+        waiters.wait_for_all([future for future, call in pending])
+        for name, length, segment in segments:
+            try:
+                swift_api(request).delete_object(segments_container, name)
+            except swiftclient.client.ClientException:
+                pass
+        raise
+
+    if 'slo' in swift_get_capabilities(request):
+        manifest = [{'path': '/%s/%s' % (segments_container, name),
+                     'etag': etag,
+                     'size_bytes': length}
+                    for (name, length, segment), etag in zip(segments, etags)]
+        return swift_api(request).put_object(
+            container_name, object_name, json.dumps(manifest),
+            query_string='multipart-manifest=put', headers=headers)
+    headers = dict(headers)
+    headers['X-Object-Manifest'] = '%s/%s' % (
+        urlparse.quote(segments_container), urlparse.quote(prefix))
+    return swift_api(request).put_object(container_name, object_name, '',
+                                         content_length=0, headers=headers)
+
+
 @profiler.trace
 def swift_upload_object(request, container_name, object_name,
                         object_file=None):
@@ -291,6 +430,12 @@ def swift_upload_object(request, container_name, object_name,
         headers['X-Object-Meta-Orig-Filename'] = object_file.name
         size = object_file.size
 
+    if size > SEGMENT_SIZE:
+        etag = _upload_segmented_object(request, container_name, object_name,
+                                        object_file, headers)
+        obj_info = {'name': object_name, 'bytes': size, 'etag': etag}
+        return StorageObject(obj_info, container_name)
+
     etag = swift_api(request).put_object(container_name,
                                          object_name,
                                          object_file,
@@ -320,9 +465,41 @@ def swift_create_pseudo_folder(request, container_name, pseudo_folder_name):
     return PseudoFolder(obj_info, container_name)
 
 
+def _supports_slo(request):
+    """Whether the Swift cluster of ``request`` has static large objects.
+
+    The capabilities of a cluster are the same for all its projects, the
+    answer is cached for an hour per cluster.
+    """
+    key = 'swift_slo:%s' % urlparse.urlsplit(
+        base.url_for(request, 'object-store')).netloc
+    supported = cache.get(key)
+    if supported is None:
+        supported = 'slo' in swift_get_capabilities(request)
+        cache.set(key, supported, 3600)
+    return supported
+
+
 @profiler.trace
 def swift_delete_object(request, container_name, object_name):
-    swift_api(request).delete_object(container_name, object_name)
+    api = swift_api(request)
+    if _supports_slo(request):
+        # The segments of a static large object are deleted along with its
+        # manifest, Swift ignores the query for other objects.
+        api.delete_object(container_name, object_name,
+                          query_string='multipart-manifest=delete')
+        return True
+    # Large objects are uploaded with a dynamic manifest to such clusters,
+    # its segments are deleted after it.
+    headers = api.head_object(container_name, object_name)
+    api.delete_object(container_name, object_name)
+    if headers.get('x-object-manifest'):
+        segments_container, prefix = urlparse.unquote(
+            headers['x-object-manifest']).split('/', 1)
+        segments = api.get_container(segments_container, prefix=prefix,
+                                     full_listing=True)[1]
+        for segment in segments:
+            api.delete_object(segments_container, segment['name'])
     return True
 
 
@@ -346,12 +523,74 @@ def swift_delete_folder(request, container_name, object_name):
     return True
 
 
+def _get_range(request, container_name, object_name, start, end, etag):
+    headers = {'Range': 'bytes=%d-%d' % (start, end)}
+    if etag:
+        # Fail rather than mix the data of two versions of the object.
+        headers['If-Match'] = etag
+    return swift_api(request).get_object(container_name, object_name,
+                                         headers=headers)[1]
+
+
+def _iter_ranges(request, container_name, object_name, size, etag, body):
+    """Yield the data of an object, fetching its ranges concurrently.
+
+    The first range is read from ``body``, the response already opened for
+    the whole object.  The next SWIFT_TRANSFER_CONCURRENCY ranges are
+    fetched ahead with ranged GETs, so at most that many ranges are held in
+    memory.
+    """
+    ranges = [(start, min(start + DOWNLOAD_RANGE_SIZE, size) - 1)
+              for start in range(DOWNLOAD_RANGE_SIZE, size,
+                                 DOWNLOAD_RANGE_SIZE)]
+    ranges.reverse()
+    executor = _get_transfer_executor()
+
+    def fetch_next():
+        start, end = ranges.pop()
+        return _submit(executor, _get_range, request, container_name,
+                       object_name, start, end, etag)
+
+    pending = []
+    try:
+        while ranges and len(pending) < TRANSFER_CONCURRENCY:
+            pending.append(fetch_next())
+        remaining = DOWNLOAD_RANGE_SIZE
+        for chunk in body:
+            if len(chunk) >= remaining:
+                yield chunk[:remaining]
+                break
+            remaining -= len(chunk)
+            yield chunk
+        body.close()
+        while pending:
+            data = _result(pending.pop(0))
+            if ranges:
+                pending.append(fetch_next())
+            yield data
+    finally:
+        for future, call in pending:
+            future.cancel()
+
+
 @profiler.trace
 def swift_get_object(request, container_name, object_name, with_data=True,
                      resp_chunk_size=CHUNK_SIZE):
     if with_data:
         headers, data = swift_api(request).get_object(
             container_name, object_name, resp_chunk_size=resp_chunk_size)
+        size = int(headers.get('content-length') or 0)
+        if (resp_chunk_size and TRANSFER_CONCURRENCY > 1 and
+                size > 2 * DOWNLOAD_RANGE_SIZE):
+            # The ETag of a manifest is not the one conditional requests
+            # for its ranges are checked against, only plain objects are
+            # fetched on the condition it did not change.
+            etag = None
+            if not (headers.get('x-object-manifest') or
+                    headers.get('x-static-large-object')):
+                etag = headers.get('etag')
+            data = _iter_ranges(request, container_name, object_name, size,
+                                etag, data)
     else:
         data = None
         headers = swift_api(request).head_object(container_name,
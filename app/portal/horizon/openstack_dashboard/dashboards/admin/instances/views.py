@@ -17,7 +17,6 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
-import futurist
 
 from django.conf import settings
 from django.core.urlresolvers import reverse
@@ -28,6 +27,7 @@ from horizon import exceptions
 from horizon import forms
 from horizon import tables
 from horizon.utils import memoized
+from horizon.utils import workers
 
 from openstack_dashboard import api
 
@@ -155,10 +155,10 @@ class AdminIndexView(tables.DataTableView):
                 # don't call api.network
                 return
 
-        with futurist.ThreadPoolExecutor(max_workers=3) as e:
-            e.submit(fn=_task_get_tenants)
-            e.submit(fn=_task_get_images)
-            e.submit(fn=_task_get_flavors)
+        workers.gather({'tenants': _task_get_tenants,
+                        'images': _task_get_images,
+                        'flavors': _task_get_flavors},
+                       name=self.request.path)
 
         non_api_filter_info = (
             ('project', 'tenant_id', tenants),
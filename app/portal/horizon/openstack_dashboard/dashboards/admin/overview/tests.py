@@ -160,6 +160,7 @@ class UsageViewTests(test.BaseAdminViewTests):
 
     def _test_usage_csv(self, nova_stu_enabled=True, overview_days_range=1):
         self._stub_api_calls(nova_stu_enabled)
+        self.mox.StubOutWithMock(api.nova, 'usage_list_iter')
         api.nova.extension_supported(
             'SimpleTenantUsage', IsA(http.HttpRequest)) \
             .AndReturn(nova_stu_enabled)
@@ -168,23 +169,26 @@ class UsageViewTests(test.BaseAdminViewTests):
                     .AndReturn([self.tenants.list(), False])
         if nova_stu_enabled:
             start_day, now = self._get_start_end_range(overview_days_range)
-            api.nova.usage_list(IsA(http.HttpRequest),
-                                datetime.datetime(start_day.year,
-                                                  start_day.month,
-                                                  start_day.day,
-                                                  0, 0, 0, 0),
-                                datetime.datetime(now.year,
-                                                  now.month,
-                                                  now.day, 23, 59, 59, 0)) \
-                .AndReturn(usage_obj)
+            api.nova.usage_list_iter(IsA(http.HttpRequest),
+                                     datetime.datetime(start_day.year,
+                                                       start_day.month,
+                                                       start_day.day,
+                                                       0, 0, 0, 0),
+                                     datetime.datetime(now.year,
+                                                       now.month,
+                                                       now.day,
+                                                       23, 59, 59, 0)) \
+                .AndReturn(iter(usage_obj))
         self.mox.ReplayAll()
 
         csv_url = reverse('horizon:admin:overview:index') + "?format=csv"
         res = self.client.get(csv_url)
+        self.assertTrue(res.streaming)
         self.assertTemplateUsed(res, 'admin/overview/usage.csv')
         self.assertIsInstance(res.context['usage'], usage.GlobalUsage)
+        content = b''.join(res.streaming_content).decode('utf-8')
         hdr = 'Project Name,VCPUs,RAM (MB),Disk (GB),Usage (Hours)'
-        self.assertContains(res, '%s\r\n' % hdr)
+        self.assertIn('%s\r\n' % hdr, content)
 
         if nova_stu_enabled:
             for obj in usage_obj:
@@ -193,4 +197,40 @@ class UsageViewTests(test.BaseAdminViewTests):
                                                             obj.memory_mb,
                                                             obj.disk_gb_hours,
                                                             obj.vcpu_hours)
-                self.assertContains(res, row)
+                self.assertIn(row, content)
+            # The summary is added up while the rows are written.
+            self.assertTrue(content.endswith(
+                'Total Disk Usage (Hours):,%.2f\n' % sum(
+                    obj.disk_gb_hours for obj in usage_obj)))
+
+    def test_usage_csv_page_error(self):
+        self._stub_api_calls(True)
+        self.mox.StubOutWithMock(api.nova, 'usage_list_iter')
+        api.nova.extension_supported(
+            'SimpleTenantUsage', IsA(http.HttpRequest)) \
+            .AndReturn(True)
+        usage_obj = [api.nova.NovaUsage(u) for u in self.usages.list()]
+        api.keystone.tenant_list(IsA(http.HttpRequest)) \
+                    .AndReturn([self.tenants.list(), False])
+
+        def usage_pages():
+            # The first page is fetched, the next one fails.
+            yield usage_obj[0]
+            raise self.exceptions.nova
+
+        api.nova.usage_list_iter(IsA(http.HttpRequest), IsA(datetime.datetime),
+                                 IsA(datetime.datetime)) \
+            .AndReturn(usage_pages())
+        self.mox.ReplayAll()
+
+        csv_url = reverse('horizon:admin:overview:index') + "?format=csv"
+        res = self.client.get(csv_url)
+        self.assertTrue(res.streaming)
+        chunks = []
+        with self.assertRaises(type(self.exceptions.nova)):
+            for chunk in res.streaming_content:
+                chunks.append(chunk)
+        content = b''.join(chunks).decode('utf-8')
+        self.assertIn(usage_obj[0].project_name, content)
+        # The stream is aborted without the totals of the partial rows.
+        self.assertNotIn('Total Disk Usage (Hours):', content)
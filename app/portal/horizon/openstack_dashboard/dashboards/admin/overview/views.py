@@ -28,14 +28,25 @@ from openstack_dashboard import api
 from openstack_dashboard import usage
 
 
-class GlobalUsageCsvRenderer(csvbase.BaseCsvResponse):
+def get_project_name(project_names, tenant_id):
+    # If we could not get the project name, show the tenant_id with
+    # a 'Deleted' identifier instead.
+    if tenant_id in project_names:
+        return project_names[tenant_id]
+    deleted = _("Deleted")
+    return translation.string_concat(tenant_id, " (", deleted, ")")
+
+
+class GlobalUsageCsvRenderer(csvbase.BaseCsvStreamingResponse):
 
     columns = [_("Project Name"), _("VCPUs"), _("RAM (MB)"),
                _("Disk (GB)"), _("Usage (Hours)")]
 
     def get_row_data(self):
 
-        for u in self.context['usage'].usage_list:
+        project_names = self.context['project_names']
+        for u in self.context['usage'].usage_iter:
+            u.project_name = get_project_name(project_names, u.tenant_id)
             yield (u.project_name or u.tenant_id,
                    u.vcpus,
                    u.memory_mb,
@@ -52,6 +63,7 @@ class GlobalOverview(usage.UsageView):
     def get_context_data(self, **kwargs):
         context = super(GlobalOverview, self).get_context_data(**kwargs)
         context['monitoring'] = getattr(settings, 'EXTERNAL_MONITORING', [])
+        context['project_names'] = self.project_names
         return context
 
     def get_data(self):
@@ -63,14 +75,9 @@ class GlobalOverview(usage.UsageView):
             projects = []
             exceptions.handle(self.request,
                               _('Unable to retrieve project list.'))
+        self.project_names = dict((t.id, getattr(t, "name", None))
+                                  for t in projects)
         for instance in data:
-            project = [t for t in projects if t.id == instance.tenant_id]
-            # If we could not get the project name, show the tenant_id with
-            # a 'Deleted' identifier instead.
-            if project:
-                instance.project_name = getattr(project[0], "name", None)
-            else:
-                deleted = _("Deleted")
-                instance.project_name = translation.string_concat(
-                    instance.tenant_id, " (", deleted, ")")
+            instance.project_name = get_project_name(self.project_names,
+                                                     instance.tenant_id)
         return data
@@ -36,15 +36,18 @@ from horizon import messages
 from horizon import tables
 from horizon.templatetags import sizeformat
 from horizon.utils import filters
+from horizon.utils import urls
 
 from openstack_dashboard import api
 from openstack_dashboard.dashboards.project.floating_ips import workflows
 from openstack_dashboard.dashboards.f5services.f5adc import tabs
+from openstack_dashboard.dashboards.f5services.f5adc import utils as adc_utils
 from openstack_dashboard.dashboards.f5services.f5adc.workflows \
     import resize_instance
 from openstack_dashboard.dashboards.f5services.f5adc.workflows \
     import update_instance
 from openstack_dashboard import policy
+from openstack_dashboard.usage import quotas
 from openstack_dashboard.views import get_url_with_pagination
 
 LOG = logging.getLogger(__name__)
@@ -112,6 +115,7 @@ class DeleteInstance(policy.PolicyTargetMixin, tables.DeleteAction):
     def action(self, request, obj_id):
         #api.nova.server_delete(request, obj_id)
         api.f5wafaas.adc_delete(request, obj_id)
+        quotas.invalidate_tenant_quota_usages(request)
 
 
 class RebootInstance(policy.PolicyTargetMixin, tables.BatchAction):
@@ -457,7 +461,8 @@ class EditInstance(policy.PolicyTargetMixin, tables.LinkAction):
         return self._get_link_url(project, 'instance_info')
 
     def _get_link_url(self, project, step_slug):
-        base_url = urlresolvers.reverse(self.url, args=[project.id])
+        base_url = urls.reverse_with_id(self.table.request, self.url,
+                                        project.id)
         next_url = self.table.get_full_url()
         params = {"step": step_slug,
                   update_instance.UpdateInstance.redirect_param_name: next_url}
@@ -545,7 +550,8 @@ class ResizeLink(policy.PolicyTargetMixin, tables.LinkAction):
         return self._get_link_url(project, 'flavor_choice')
 
     def _get_link_url(self, project, step_slug):
-        base_url = urlresolvers.reverse(self.url, args=[project.id])
+        base_url = urls.reverse_with_id(self.table.request, self.url,
+                                        project.id)
         next_url = self.table.get_full_url()
         params = {"step": step_slug,
                   resize_instance.ResizeInstance.redirect_param_name: next_url}
@@ -599,7 +605,8 @@ class RebuildInstance(policy.PolicyTargetMixin, tables.LinkAction):
 
     def get_link_url(self, datum):
         instance_id = self.table.get_object_id(datum)
-        return urlresolvers.reverse(self.url, args=[instance_id])
+        return urls.reverse_with_id(self.table.request, self.url,
+                                    instance_id)
 
 
 class DecryptInstancePassword(tables.LinkAction):
@@ -755,29 +762,27 @@ def get_instance_error(instance):
 
 
 class UpdateRow(tables.Row):
+    """Row of an ADC which is refreshed while it is in a transitional state.
+
+    Transitional rows are not polled one by one. They are marked with the
+    ``ajax-batch-update`` class instead, and horizon.f5adc.js polls the
+    status of all of them with a single call to the f5services REST API.
+    The row itself is only re-rendered, through ``get_data``, once its
+    status has changed.
+    """
     ajax = True
 
-    def get_data(self, request, instance_id):
-        instance = api.nova.server_get(request, instance_id)
-        try:
-            instance.full_flavor = api.nova.flavor_get(request,
-                                                       instance.flavor["id"])
-        except Exception:
-            exceptions.handle(request,
-                              _('Unable to retrieve flavor information '
-                                'for instance "%s".') % instance_id,
-                              ignore=True)
-        try:
-            api.network.servers_update_addresses(request, [instance])
-        except Exception:
-            exceptions.handle(request,
-                              _('Unable to retrieve Network information '
-                                'for instance "%s".') % instance_id,
-                              ignore=True)
-        error = get_instance_error(instance)
-        if error:
-            messages.error(request, error)
-        return instance
+    def load_cells(self, datum=None):
+        super(UpdateRow, self).load_cells(datum)
+        self.classes.remove("ajax-update")
+        if self.status is None:
+            self.classes.append("ajax-batch-update")
+            self.attrs['data-status'] = getattr(self.datum, 'status', '')
+
+    def get_data(self, request, adc_id):
+        adc = api.f5wafaas.adc_get(request, adc_id)
+        adc_utils.resolve_images_and_flavors(request, [adc])
+        return adc
 
 
 class StartInstance(policy.PolicyTargetMixin, tables.BatchAction):
@@ -956,7 +961,8 @@ class AttachInterface(policy.PolicyTargetMixin, tables.LinkAction):
 
     def get_link_url(self, datum):
         instance_id = self.table.get_object_id(datum)
-        return urlresolvers.reverse(self.url, args=[instance_id])
+        return urls.reverse_with_id(self.table.request, self.url,
+                                    instance_id)
 
 
 class DetachInterface(policy.PolicyTargetMixin, tables.LinkAction):
@@ -982,7 +988,8 @@ class DetachInterface(policy.PolicyTargetMixin, tables.LinkAction):
 
     def get_link_url(self, datum):
         instance_id = self.table.get_object_id(datum)
-        return urlresolvers.reverse(self.url, args=[instance_id])
+        return urls.reverse_with_id(self.table.request, self.url,
+                                    instance_id)
 
 
 def get_ips(instance):
@@ -1225,6 +1232,20 @@ POWER_DISPLAY_CHOICES = (
     ("BUILDING", pgettext_lazy("Power state of an Instance", u"Building")),
 )
 
+# ADCaaS states of an ADC. ACTIVE and the error states are final, every
+# other state is transitional and keeps the row polled.
+ADC_STATUS_CHOICES = (
+    ("ACTIVE", True),
+    ("POWERERROR", False),
+    ("DOINSTALLERR", False),
+    ("LICENSERROR", False),
+    ("ONBOARDERROR", False),
+    ("TRUSTERROR", False),
+    ("INSTALLERROR", False),
+    ("PARTITIONERROR", False),
+    ("RECLAIMERROR", False),
+)
+
 INSTANCE_FILTER_CHOICES = (
     ('uuid', _("Instance ID ="), True),
     ('name', _("Instance Name ="), True),
@@ -1244,9 +1265,17 @@ INSTANCE_FILTER_CHOICES = (
 )
 
 
+ADC_FILTER_CHOICES = (
+    ('id', _("ADC ID ="), True),
+    ('name', _("ADC Name ="), True),
+    ('type', _("Type ="), True),
+    ('status', _("Status ="), True),
+)
+
+
 class InstancesFilterAction(tables.FilterAction):
     filter_type = "server"
-    filter_choices = INSTANCE_FILTER_CHOICES
+    filter_choices = ADC_FILTER_CHOICES
 
 
 def render_locked(instance):
@@ -1326,7 +1355,8 @@ class InstancesTable(tables.DataTable):
 
     status = tables.Column("status",
                            verbose_name=_("Status"),
-                           status=True)
+                           status=True,
+                           status_choices=ADC_STATUS_CHOICES)
     lastErr = tables.Column('lastErr', 
                             verbose_name=_('Last Error'),
                             truncate=30)
@@ -1351,12 +1381,31 @@ class InstancesTable(tables.DataTable):
     #                                  filters.timesince_sortable),
     #                         attrs={'data-type': 'timesince'})    
 
+    # Offset of the first row on the current page, set by the view.  ADCaaS
+    # pages by offset, so the markers are offsets rather than ADC ids.
+    page_offset = 0
+    sort_params = ''
+
+    def get_marker(self):
+        return str(self.page_offset + len(self.data))
+
+    def get_prev_marker(self):
+        return str(self.page_offset)
+
+    def get_pagination_string(self):
+        return super(InstancesTable, self).get_pagination_string() + \
+            self.sort_params
+
+    def get_prev_pagination_string(self):
+        return super(InstancesTable, self).get_prev_pagination_string() + \
+            self.sort_params
+
     class Meta(object):
         name = "instances"
         verbose_name = _("Instances")
         # status_columns = ["status", "task"]
         status_columns = ["status"]
-        # row_class = UpdateRow
+        row_class = UpdateRow
         table_actions_menu = (StartInstance, StopInstance, SoftRebootInstance)
         launch_actions = ()
         # if getattr(settings, 'LAUNCH_INSTANCE_LEGACY_ENABLED', False):
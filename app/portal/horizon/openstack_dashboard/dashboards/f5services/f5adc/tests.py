@@ -23,12 +23,14 @@ import sys
 
 import django
 from django.conf import settings
+from django.core.cache import cache
 from django.core.urlresolvers import reverse
 from django.forms import widgets
 from django import http
 import django.test
 from django.test.utils import override_settings
 from django.utils.http import urlencode
+import mock
 from mox3.mox import IgnoreArg
 from mox3.mox import IsA
 import six
@@ -41,6 +43,7 @@ from openstack_dashboard.api import cinder
 from openstack_dashboard.dashboards.f5services.f5adc import console
 from openstack_dashboard.dashboards.f5services.f5adc import tables
 from openstack_dashboard.dashboards.f5services.f5adc import tabs
+from openstack_dashboard.dashboards.f5services.f5adc import utils
 from openstack_dashboard.dashboards.f5services.f5adc import workflows
 from openstack_dashboard.test import helpers
 from openstack_dashboard.usage import quotas
@@ -4603,3 +4606,94 @@ class ConsoleManagerTests(helpers.ResetImageAPIVersionMixin, helpers.TestCase):
 
         self.assertNoFormErrors(res)
         self.assertRedirectsNoFollow(res, INDEX_URL)
+
+
+class ADCLookupTests(helpers.ResetImageAPIVersionMixin, helpers.TestCase):
+    def setUp(self):
+        super(ADCLookupTests, self).setUp()
+        cache.clear()
+
+    def _adcs(self):
+        image = self.imagesV2.first()
+        flavor = self.flavors.first()
+        return [
+            api.f5wafaas.ADCInstance(
+                {'id': 'adc%d' % i,
+                 'compute': {'imageRef': image.id, 'flavorRef': flavor.id}},
+                self.request)
+            for i in range(3)]
+
+    @helpers.create_mocks(api.glance, ['image_list_detailed'])
+    @helpers.create_mocks(api.nova, ['flavor_get'])
+    def test_resolve_images_and_flavors(self):
+        image = self.imagesV2.first()
+        flavor = self.flavors.first()
+        self.mock_image_list_detailed.return_value = [[image], False, False]
+        self.mock_flavor_get.return_value = flavor
+
+        adcs = utils.resolve_images_and_flavors(self.request, self._adcs())
+
+        for adc in adcs:
+            self.assertEqual(image.name, adc.image_name)
+            self.assertEqual(flavor.ram, adc.full_flavor.ram)
+        self.mock_image_list_detailed.assert_called_once_with(
+            helpers.IsHttpRequest(), filters={'id': 'in:%s' % image.id})
+        self.mock_flavor_get.assert_called_once_with(
+            helpers.IsHttpRequest(), flavor.id)
+
+    @helpers.create_mocks(api.glance, ['image_list_detailed'])
+    @helpers.create_mocks(api.nova, ['flavor_get'])
+    def test_resolve_images_and_flavors_cached(self):
+        image = self.imagesV2.first()
+        self.mock_image_list_detailed.return_value = [[image], False, False]
+        self.mock_flavor_get.return_value = self.flavors.first()
+
+        utils.resolve_images_and_flavors(self.request, self._adcs())
+        utils.resolve_images_and_flavors(self.request, self._adcs())
+
+        self.assertEqual(1, self.mock_image_list_detailed.call_count)
+        self.assertEqual(1, self.mock_flavor_get.call_count)
+
+    @helpers.create_mocks(api.glance, ['image_list_detailed'])
+    @helpers.create_mocks(api.nova, ['flavor_get'])
+    def test_resolve_images_cached_per_project(self):
+        image = self.imagesV2.first()
+        self.mock_image_list_detailed.return_value = [[image], False, False]
+        self.mock_flavor_get.return_value = self.flavors.first()
+
+        utils.resolve_images_and_flavors(self.request, self._adcs())
+        self.request.user.project_id = 'other-project'
+        utils.resolve_images_and_flavors(self.request, self._adcs())
+
+        # Images may be private to a project, flavors are shared.
+        self.assertEqual(2, self.mock_image_list_detailed.call_count)
+        self.assertEqual(1, self.mock_flavor_get.call_count)
+
+    @helpers.create_mocks(api.glance, ['image_list_detailed'])
+    @helpers.create_mocks(api.nova, ['flavor_get'])
+    def test_resolve_images_and_flavors_not_found(self):
+        self.mock_image_list_detailed.return_value = [[], False, False]
+        self.mock_flavor_get.side_effect = self.exceptions.nova
+
+        adcs = utils.resolve_images_and_flavors(self.request, self._adcs())
+
+        for adc in adcs:
+            self.assertFalse(hasattr(adc, 'image_name'))
+            self.assertFalse(hasattr(adc, 'full_flavor'))
+
+    @helpers.create_mocks(api.glance, ['image_list_detailed'])
+    @helpers.create_mocks(api.nova, ['flavor_get'])
+    def test_resolve_images_and_flavors_no_flavor(self):
+        image = self.imagesV2.first()
+        self.mock_image_list_detailed.return_value = [[image], False, False]
+        adc = api.f5wafaas.ADCInstance(
+            {'id': 'adc', 'compute': {'imageRef': image.id}}, self.request)
+
+        with mock.patch.object(utils, 'LOG') as log:
+            utils.resolve_images_and_flavors(self.request, [adc])
+
+        self.assertEqual(image.name, adc.image_name)
+        self.assertFalse(hasattr(adc, 'full_flavor'))
+        self.mock_flavor_get.assert_not_called()
+        log.debug.assert_not_called()
+        log.info.assert_not_called()
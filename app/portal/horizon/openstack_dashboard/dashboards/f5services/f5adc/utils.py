@@ -14,12 +14,15 @@ import logging
 from operator import itemgetter
 
 from django.conf import settings
+from django.core.cache import cache
 from django.utils.translation import ugettext_lazy as _
 import six
 
 from horizon import exceptions
 
 from openstack_dashboard import api
+from openstack_dashboard.api import base
+from openstack_dashboard.utils import fanout
 
 LOG = logging.getLogger(__name__)
 
@@ -234,3 +237,113 @@ def server_group_field_data(request):
         return [("", _("Select Server Group")), ] + server_groups_list
 
     return [("", _("No server groups available")), ]
+
+
+FLAVOR_INDEX_ATTRS = ('id', 'name', 'ram', 'disk', 'vcpus')
+
+
+def _index_key(request, kind, obj_id):
+    # Flavor ids such as "1" are only unique within a region. Images are
+    # also scoped to the project, as private and shared images are only
+    # visible to some projects.
+    scope = request.user.services_region
+    if kind == 'image':
+        scope = '%s:%s' % (scope, request.user.project_id)
+    return 'f5adc:%s:%s:%s' % (kind, scope, obj_id)
+
+
+def _index_timeout():
+    return getattr(settings, 'F5ADC_LOOKUP_CACHE_TIMEOUT', 300)
+
+
+def _fetch_image_names(request, image_ids):
+    if api.glance.VERSIONS.active >= 2:
+        filters = {'id': 'in:%s' % ','.join(image_ids)}
+        images = api.glance.image_list_detailed(request, filters=filters)[0]
+    else:
+        images = fanout.gather(request, dict(
+            (image_id, (api.glance.image_get, request, image_id))
+            for image_id in image_ids)).values()
+    return dict((image.id, image.name) for image in images)
+
+
+def _fetch_flavors(request, flavor_ids):
+    found = fanout.gather(request, dict(
+        (flavor_id, (api.nova.flavor_get, request, flavor_id))
+        for flavor_id in flavor_ids))
+    flavors = {}
+    for flavor in found.values():
+        flavors[str(flavor.id)] = dict(
+            (attr, getattr(flavor, attr)) for attr in FLAVOR_INDEX_ATTRS)
+    return flavors
+
+
+def _lookup(request, kind, obj_ids, fetch):
+    """Map obj_ids to their cached values, fetching only the missing ones.
+
+    The id index lives in the Django cache and is shared by all requests,
+    so the cost of a lookup depends on the number of ids referenced rather
+    than on the size of the whole image or flavor catalog.
+    """
+    keys = dict((_index_key(request, kind, obj_id), obj_id)
+                for obj_id in obj_ids)
+    found = dict((keys[key], value)
+                 for key, value in cache.get_many(list(keys)).items())
+    missing = [obj_id for obj_id in obj_ids if obj_id not in found]
+    if missing:
+        try:
+            fetched = fetch(request, missing)
+        except Exception:
+            exceptions.handle(request, ignore=True)
+            fetched = {}
+        cache.set_many(dict((_index_key(request, kind, obj_id), value)
+                            for obj_id, value in fetched.items()),
+                       _index_timeout())
+        found.update(fetched)
+    return found
+
+
+def resolve_images_and_flavors(request, adcs):
+    """Set ``image_name`` and ``full_flavor`` on each of the given ADCs.
+
+    Only the distinct images and flavors referenced by the ADCs are looked
+    up. Attributes are left unset when their image or flavor can not be
+    found.
+    """
+    image_ids = set()
+    flavor_ids = set()
+    for adc in adcs:
+        compute = getattr(adc, 'compute', None) or {}
+        if compute.get('imageRef'):
+            image_ids.add(compute['imageRef'])
+        if compute.get('flavorRef'):
+            flavor_ids.add(str(compute['flavorRef']))
+
+    image_names = {}
+    flavors = {}
+
+    def _task_get_images():
+        image_names.update(_lookup(request, 'image', sorted(image_ids),
+                                   _fetch_image_names))
+
+    def _task_get_flavors():
+        flavors.update(_lookup(request, 'flavor', sorted(flavor_ids),
+                               _fetch_flavors))
+
+    fanout.gather(request, {'images': _task_get_images,
+                            'flavors': _task_get_flavors})
+
+    for adc in adcs:
+        compute = getattr(adc, 'compute', None) or {}
+        image_id = compute.get('imageRef')
+        if image_id in image_names:
+            adc.image_name = image_names[image_id]
+        if not compute.get('flavorRef'):
+            continue
+        flavor_id = str(compute['flavorRef'])
+        if flavor_id in flavors:
+            adc.full_flavor = base.APIDictWrapper(flavors[flavor_id])
+        else:
+            LOG.debug('Unable to retrieve flavor "%s" for ADC "%s".',
+                      flavor_id, adc.id)
+    return adcs
@@ -22,13 +22,12 @@ Views for managing instances.
 from collections import OrderedDict
 import logging
 
-import futurist
-
 from django.conf import settings
 from django.core.urlresolvers import reverse
 from django.core.urlresolvers import reverse_lazy
 from django import http
 from django import shortcuts
+from django.utils.http import urlencode
 from django.utils.translation import ugettext_lazy as _
 from django.views import generic
 
@@ -37,11 +36,13 @@ from horizon import forms
 from horizon import messages
 from horizon import tables
 from horizon import tabs
+from horizon.utils import functions as utils
 from horizon.utils import memoized
 from horizon import workflows
 
 from openstack_dashboard import api
 from openstack_dashboard.utils import filters
+from openstack_dashboard.utils import fanout
 
 from openstack_dashboard.dashboards.f5services.f5adc \
     import console as project_console
@@ -51,6 +52,8 @@ from openstack_dashboard.dashboards.f5services.f5adc \
     import tables as adc_tables
 from openstack_dashboard.dashboards.f5services.f5adc \
     import tabs as adc_tabs
+from openstack_dashboard.dashboards.f5services.f5adc \
+    import utils as adc_utils
 from openstack_dashboard.dashboards.f5services.f5adc \
     import workflows as project_workflows
 from openstack_dashboard.views import get_url_with_pagination
@@ -168,59 +171,59 @@ LOG = logging.getLogger(__name__)
 
 #         return instances
 
-class IndexView(tables.DataTableView):
+class IndexView(tables.PagedTableMixin, tables.DataTableView):
     table_class = adc_tables.InstancesTable
     page_title = _("Application Delivery Controller")
 
+    def _get_offset(self):
+        marker, sort_dir = self._get_marker()
+        try:
+            offset = max(int(marker), 0) if marker else 0
+        except ValueError:
+            offset = 0
+        if sort_dir == "asc":
+            # The previous page ends where the current one starts.
+            offset = max(offset - utils.get_page_size(self.request), 0)
+        return offset
+
+    def _get_sort(self):
+        sort_key = self.request.GET.get('sort_key', 'createdAt')
+        if sort_key not in api.f5wafaas.ADC_SORT_KEYS:
+            sort_key = 'createdAt'
+        sort_dir = self.request.GET.get('sort_dir', 'desc')
+        if sort_dir not in ('asc', 'desc'):
+            sort_dir = 'desc'
+        return sort_key, sort_dir
+
+    def get_filters(self, filters=None, filters_map=None):
+        filters = super(IndexView, self).get_filters(filters, filters_map)
+        if 'status' in filters:
+            # ADCaaS statuses are upper case, e.g. ACTIVE.
+            filters['status'] = filters['status'].upper()
+        return filters
+
     def get_data(self):
+        offset = self._get_offset()
+        sort_key, sort_dir = self._get_sort()
+        self.table.page_offset = offset
+        if 'sort_key' in self.request.GET or 'sort_dir' in self.request.GET:
+            self.table.sort_params = '&' + urlencode(
+                OrderedDict([('sort_key', sort_key), ('sort_dir', sort_dir)]))
         try:
-            adcs = api.f5wafaas.adc_list(self.request)
-        except Exception as e:
+            adcs, self._has_more_data, self._has_prev_data = \
+                api.f5wafaas.adc_list_paged(self.request,
+                                            offset=offset,
+                                            sort_key=sort_key,
+                                            sort_dir=sort_dir,
+                                            filters=self.get_filters(),
+                                            paginate=True)
+        except Exception:
+            self._has_more_data = self._has_prev_data = False
             exceptions.handle(self.request,
-                                _('Unable to retrieve instances.'))
-            # In case of exception when calling nova.server_list
-            # don't call api.network
+                              _('Unable to retrieve instances.'))
             return []
-        
-        images = []
-        image_map = {}
-        flavors = []
-        full_flavors = {}
-
-        def _task_get_flavors():
-            # Gather our flavors to correlate our instances to them
-            try:
-                tmp_flavors = api.nova.flavor_list(self.request)
-                flavors.extend(tmp_flavors)
-                full_flavors.update([(str(flavor.id), flavor)
-                                     for flavor in flavors])
-            except Exception:
-                exceptions.handle(self.request, ignore=True)
-
-        def _task_get_images():
-            # Gather our images to correlate our instances to them
-            try:
-                # TODO(gabriel): Handle pagination.
-                tmp_images = api.glance.image_list_detailed(self.request)[0]
-                images.extend(tmp_images)
-                image_map.update([(str(image.id), image) for image in images])
-            except Exception:
-                exceptions.handle(self.request, ignore=True)
-        
-        with futurist.ThreadPoolExecutor(max_workers=3) as e:
-            e.submit(fn=_task_get_flavors)
-            e.submit(fn=_task_get_images)
-
-        for n in adcs: 
-            try:
-                image_id = n.compute['imageRef']
-                flavor_id = n.compute['flavorRef']
-                n.image_name = image_map[image_id].name
-                n.full_flavor = full_flavors[flavor_id]
-            except Exception as e:
-                exceptions.handle(self.request, _("Unable to retrieve instance's image or flavor. %s" % e.message))
 
-        return adcs
+        return adc_utils.resolve_images_and_flavors(self.request, adcs)
 
     # def get_data(self):
     #     marker = self.request.GET.get(
@@ -639,11 +642,11 @@ class DetailView(tabs.TabView):
                     % {'name': instance.name, 'id': instance_id}
                 exceptions.handle(self.request, msg, ignore=True)
 
-        with futurist.ThreadPoolExecutor(max_workers=4) as e:
-            e.submit(fn=_task_get_volumes)
-            e.submit(fn=_task_get_flavor)
-            e.submit(fn=_task_get_security_groups)
-            e.submit(fn=_task_update_addresses)
+        fanout.gather(self.request,
+                      {'volumes': _task_get_volumes,
+                       'flavor': _task_get_flavor,
+                       'security_groups': _task_get_security_groups,
+                       'addresses': _task_update_addresses})
 
         return instance
 
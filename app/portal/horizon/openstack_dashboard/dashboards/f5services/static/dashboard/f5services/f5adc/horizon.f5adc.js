@@ -0,0 +1,112 @@
+/**
+ * Licensed under the Apache License, Version 2.0 (the "License"); you may
+ * not use this file except in compliance with the License. You may obtain
+ * a copy of the License at
+ *
+ *    http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing, software
+ * distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+ * WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+ * License for the specific language governing permissions and limitations
+ * under the License.
+ */
+
+/* Batched status polling for the rows of the ADC table.
+ *
+ * Rows of ADCs in a transitional state carry the "ajax-batch-update" class.
+ * Instead of polling each of them separately, the status of all of them is
+ * fetched with one request to the f5services REST API. A row is only
+ * re-rendered by the server once its status has changed, and it is removed
+ * once its ADC is gone.
+ */
+horizon.f5adc = {
+  status_url: 'api/f5services/adcs/status/',
+
+  update: function () {
+    var $rows = $('tr.ajax-batch-update');
+    var $table = $rows.closest('table');
+    var interval = $rows.attr('data-update-interval');
+    var decay_constant = $table.attr('decay_constant');
+
+    if ($rows.length <= 0) { return; }
+
+    var ids = $rows.map(function () {
+      return $(this).attr('data-object-id');
+    }).get();
+
+    horizon.ajax.queue({
+      url: WEBROOT + horizon.f5adc.status_url,
+      data: {ids: ids.join(',')},
+      success: function (data) {
+        var statuses = {};
+        $.each(data.items, function (index, item) {
+          statuses[item.id] = item;
+        });
+        $rows.each(function () {
+          var $row = $(this);
+          var item = statuses[$row.attr('data-object-id')];
+          if (!item) {
+            horizon.f5adc.remove_row($row);
+          } else if (item.status !== $row.attr('data-status')) {
+            horizon.f5adc.refresh_row($row);
+            $table.removeAttr('decay_constant');
+          }
+        });
+      },
+      error: function () {
+        console.log(gettext("An error occurred while updating."));
+      },
+      complete: function () {
+        decay_constant = parseInt($table.attr('decay_constant') || 0, 10) + 1;
+        $table.attr('decay_constant', decay_constant);
+        var next_poll = interval * decay_constant;
+        // Limit the interval to 30 secs
+        if (next_poll > 30 * 1000) { next_poll = 30 * 1000; }
+        setTimeout(horizon.f5adc.update, next_poll);
+      }
+    });
+  },
+
+  refresh_row: function ($row) {
+    horizon.ajax.queue({
+      url: $row.attr('data-update-url'),
+      success: function (data) {
+        var $table = $row.closest('table');
+        var $new_row = $(data);
+        var $checkbox = $row.find('.table-row-multi-select');
+        if ($checkbox.length && $checkbox[0].checked) {
+          $new_row.find('.table-row-multi-select').prop('checked', true);
+        }
+        $row.replaceWith($new_row);
+        $table.trigger("update");
+        horizon.datatables.validate_button();
+      },
+      error: function (jqXHR) {
+        if (jqXHR.status === 404) {
+          horizon.f5adc.remove_row($row);
+        }
+      }
+    });
+  },
+
+  remove_row: function ($row) {
+    var $table = $row.closest('table');
+    var row_count = horizon.datatables.update_footer_count($table, -1);
+    if (row_count === 0) {
+      var template = horizon.templates.compiled_templates["#empty_row_template"];
+      $row.replaceWith(template.render({
+        colspan: $table.find('.table_column_header th').length,
+        no_items_label: gettext("No items to display.")
+      }));
+    } else {
+      $row.remove();
+    }
+    $table.trigger("update");
+    horizon.datatables.update_actions();
+  }
+};
+
+horizon.addInitFunction(horizon.f5adc.init = function () {
+  horizon.f5adc.update();
+});
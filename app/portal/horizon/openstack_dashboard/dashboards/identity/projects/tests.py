@@ -1532,7 +1532,7 @@ class UpdateProjectWorkflowTests(test.BaseAdminViewTests):
 
 class UsageViewTests(test.BaseAdminViewTests):
     def _stub_nova_api_calls(self, nova_stu_enabled=True):
-        self.mox.StubOutWithMock(api.nova, 'usage_get')
+        self.mox.StubOutWithMock(api.nova, 'usage_get_iter')
         self.mox.StubOutWithMock(api.nova, 'extension_supported')
 
         api.nova.extension_supported(
@@ -1565,9 +1565,9 @@ class UsageViewTests(test.BaseAdminViewTests):
         end = datetime.datetime(now.year, now.month, now.day, 23, 59, 59, 0)
 
         if nova_stu_enabled:
-            api.nova.usage_get(IsA(http.HttpRequest),
-                               self.tenant.id,
-                               start, end).AndReturn(usage_obj)
+            api.nova.usage_get_iter(IsA(http.HttpRequest),
+                                    self.tenant.id,
+                                    start, end).AndReturn(iter([usage_obj]))
         self.mox.ReplayAll()
 
         project_id = self.tenants.first().id
@@ -1580,6 +1580,10 @@ class UsageViewTests(test.BaseAdminViewTests):
         hdr = ('Instance Name,VCPUs,RAM (MB),Disk (GB),Usage (Hours),'
                'Time since created (Seconds),State')
         self.assertContains(res, '%s\r\n' % hdr)
+        if nova_stu_enabled:
+            # The summary is added up while the rows are streamed.
+            self.assertEqual(usage_obj.get_summary()['vcpu_hours'],
+                             res.context['usage'].summary['vcpu_hours'])
 
 
 class DetailProjectViewTests(test.BaseAdminViewTests):
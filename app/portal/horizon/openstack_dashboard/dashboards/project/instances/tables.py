@@ -44,6 +44,7 @@ from openstack_dashboard.dashboards.project.instances.workflows \
 from openstack_dashboard.dashboards.project.instances.workflows \
     import update_instance
 from openstack_dashboard import policy
+from openstack_dashboard.usage import quotas
 from openstack_dashboard.views import get_url_with_pagination
 
 LOG = logging.getLogger(__name__)
@@ -109,6 +110,7 @@ class DeleteInstance(policy.PolicyTargetMixin, tables.DeleteAction):
 
     def action(self, request, obj_id):
         api.nova.server_delete(request, obj_id)
+        quotas.invalidate_tenant_quota_usages(request)
 
 
 class RebootInstance(policy.PolicyTargetMixin, tables.BatchAction):
@@ -22,8 +22,6 @@ Views for managing instances.
 from collections import OrderedDict
 import logging
 
-import futurist
-
 from django.conf import settings
 from django.core.urlresolvers import reverse
 from django.core.urlresolvers import reverse_lazy
@@ -38,6 +36,7 @@ from horizon import messages
 from horizon import tables
 from horizon import tabs
 from horizon.utils import memoized
+from horizon.utils import workers
 from horizon import workflows
 
 from openstack_dashboard import api
@@ -129,9 +128,9 @@ class IndexView(tables.DataTableView):
             except Exception:
                 exceptions.handle(self.request, ignore=True)
 
-        with futurist.ThreadPoolExecutor(max_workers=3) as e:
-            e.submit(fn=_task_get_flavors)
-            e.submit(fn=_task_get_images)
+        workers.gather({'flavors': _task_get_flavors,
+                        'images': _task_get_images},
+                       name=self.request.path)
 
         non_api_filter_info = (
             ('image_name', 'image', images),
@@ -469,11 +468,11 @@ class DetailView(tabs.TabView):
                     % {'name': instance.name, 'id': instance_id}
                 exceptions.handle(self.request, msg, ignore=True)
 
-        with futurist.ThreadPoolExecutor(max_workers=4) as e:
-            e.submit(fn=_task_get_volumes)
-            e.submit(fn=_task_get_flavor)
-            e.submit(fn=_task_get_security_groups)
-            e.submit(fn=_task_update_addresses)
+        workers.gather({'volumes': _task_get_volumes,
+                        'flavor': _task_get_flavor,
+                        'security_groups': _task_get_security_groups,
+                        'addresses': _task_update_addresses},
+                       name=self.request.path)
 
         return instance
 
@@ -970,6 +970,7 @@ class LaunchInstance(workflows.Workflow):
                                    disk_config=context.get('disk_config'),
                                    config_drive=context.get('config_drive'),
                                    scheduler_hints=scheduler_hints)
+            quotas.invalidate_tenant_quota_usages(request)
             return True
         except Exception:
             exceptions.handle(request)
@@ -77,12 +77,19 @@ class NetworkTopologyTests(test.TestCase):
             api.neutron.router_list(
                 IsA(http.HttpRequest),
                 tenant_id=self.tenant.id).AndReturn(routers)
-        api.neutron.port_list(
-            IsA(http.HttpRequest)).AndReturn(self.ports.list())
         if router_enable:
             api.neutron.network_list(
                 IsA(http.HttpRequest),
                 **{'router:external': True}).AndReturn(external_networks)
+            valid_networks = external_networks + tenant_networks
+        else:
+            valid_networks = tenant_networks
+        valid_network_ids = [net.id for net in valid_networks]
+        api.neutron.port_list(
+            request=IsA(http.HttpRequest),
+            network_id=tuple(valid_network_ids)).AndReturn(
+                [port for port in self.ports.list()
+                 if port.network_id in valid_network_ids])
 
         self.mox.ReplayAll()
 
@@ -160,9 +167,6 @@ class NetworkTopologyTests(test.TestCase):
                 del exp_net['url']
         self.assertEqual(expect_net_urls, data['networks'])
 
-        valid_network_ids = [net.id for net in tenant_networks]
-        if router_enable:
-            valid_network_ids = [net.id for net in self.networks.list()]
         # ports
         expect_port_urls = [
             {'id': port.id,
@@ -186,6 +190,100 @@ class NetworkTopologyTests(test.TestCase):
                  'fixed_ips': []})
         self.assertEqual(expect_port_urls, data['ports'])
 
+    @test.create_stubs({api.nova: ('server_list',),
+                        api.neutron: ('network_list_for_tenant',
+                                      'network_list',
+                                      'router_list',
+                                      'port_list')})
+    def test_json_view_not_modified(self):
+        api.nova.server_list(
+            IsA(http.HttpRequest)).MultipleTimes().AndReturn([[], False])
+        api.neutron.network_list_for_tenant(
+            IsA(http.HttpRequest),
+            self.tenant.id).MultipleTimes().AndReturn([])
+        api.neutron.network_list(
+            IsA(http.HttpRequest),
+            **{'router:external': True}).MultipleTimes().AndReturn([])
+        api.neutron.router_list(
+            IsA(http.HttpRequest),
+            tenant_id=self.tenant.id).MultipleTimes().AndReturn([])
+        self.mox.ReplayAll()
+
+        res = self.client.get(JSON_URL)
+        self.assertEqual(200, res.status_code)
+        etag = res['ETag']
+
+        res = self.client.get(JSON_URL, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(304, res.status_code)
+        self.assertEqual(etag, res['ETag'])
+        self.assertEqual(b'', res.content)
+
+    @django.test.utils.override_settings(FORCE_SCRIPT_NAME='/dashboard')
+    @test.create_stubs({api.nova: ('server_list',),
+                        api.neutron: ('network_list_for_tenant',
+                                      'network_list',
+                                      'router_list')})
+    def test_json_view_script_prefix(self):
+        api.nova.server_list(
+            IsA(http.HttpRequest)).AndReturn([self.servers.list(), False])
+        api.neutron.network_list_for_tenant(
+            IsA(http.HttpRequest), self.tenant.id).AndReturn([])
+        api.neutron.network_list(
+            IsA(http.HttpRequest),
+            **{'router:external': True}).AndReturn([])
+        api.neutron.router_list(
+            IsA(http.HttpRequest),
+            tenant_id=self.tenant.id).AndReturn(self.routers.list())
+        self.mox.ReplayAll()
+
+        res = self.client.get(JSON_URL)
+        data = jsonutils.loads(res.content)
+
+        # The data is fetched on the worker pool, the URLs keep the script
+        # prefix of the request.
+        self.assertEqual(
+            ['/dashboard/project/instances/%s/' % server.id
+             for server in self.servers.list()],
+            [server['url'] for server in data['servers']])
+        self.assertEqual(
+            ['/dashboard/project/routers/%s/' % router.id
+             for router in self.routers.list()],
+            [router['url'] for router in data['routers']])
+
+    @test.create_stubs({api.nova: ('server_list',),
+                        api.neutron: ('network_list_for_tenant',
+                                      'network_list',
+                                      'router_list',
+                                      'port_list')})
+    def test_json_view_delta(self):
+        servers = self.servers.list()
+        api.nova.server_list(
+            IsA(http.HttpRequest)).AndReturn([servers, False])
+        api.nova.server_list(
+            IsA(http.HttpRequest)).AndReturn([servers[1:], False])
+        api.neutron.network_list_for_tenant(
+            IsA(http.HttpRequest),
+            self.tenant.id).MultipleTimes().AndReturn([])
+        api.neutron.network_list(
+            IsA(http.HttpRequest),
+            **{'router:external': True}).MultipleTimes().AndReturn([])
+        api.neutron.router_list(
+            IsA(http.HttpRequest),
+            tenant_id=self.tenant.id).MultipleTimes().AndReturn([])
+        self.mox.ReplayAll()
+
+        res = self.client.get(JSON_URL)
+        since = res['ETag'].strip('"')
+
+        res = self.client.get(JSON_URL, {'since': since})
+        data = jsonutils.loads(res.content)
+        self.assertEqual(since, data['since'])
+        self.assertEqual({'changed': [], 'removed': [servers[0].id]},
+                         data['delta']['servers'])
+        self.assertEqual({'changed': [], 'removed': []},
+                         data['delta']['networks'])
+        self.assertNotEqual(since, res['ETag'].strip('"'))
+
 
 class NetworkTopologyCreateTests(test.TestCase):
 
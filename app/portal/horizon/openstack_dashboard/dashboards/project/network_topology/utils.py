@@ -17,6 +17,36 @@ from openstack_dashboard import policy
 from openstack_dashboard.usage import quotas
 
 
+def _index_by_id(items):
+    index = dict((item['id'], item) for item in items)
+    if len(index) != len(items):
+        return None
+    return index
+
+
+def get_topology_delta(old, new):
+    """Return the changes between two topology snapshots.
+
+    ``old`` and ``new`` map a kind of node ("servers", "networks", "ports"
+    or "routers") to its list of nodes.  For each kind, the returned dict
+    lists the nodes of ``new`` which were added or changed since ``old`` in
+    "changed" and the ids of the nodes which are gone in "removed".  None is
+    returned when the nodes of a kind can not be told apart by their ids.
+    """
+    delta = {}
+    for kind, nodes in new.items():
+        old_index = _index_by_id(old.get(kind, []))
+        new_index = _index_by_id(nodes)
+        if old_index is None or new_index is None:
+            return None
+        delta[kind] = {
+            'changed': [node for node in nodes
+                        if old_index.get(node['id']) != node],
+            'removed': [node_id for node_id in old_index
+                        if node_id not in new_index]}
+    return delta
+
+
 def _quota_exceeded(request, quota):
     usages = quotas.tenant_quota_usages(request, targets=(quota, ))
     available = usages.get(quota, {}).get('available', 1)
@@ -16,17 +16,22 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import hashlib
 import json
 
 from django.conf import settings
+from django.core.cache import cache
 from django.core.urlresolvers import reverse
 from django.core.urlresolvers import reverse_lazy
 from django.http import HttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.cache import quote_etag
 from django.utils.translation import ugettext_lazy as _
 from django.views.generic import View
 
 from horizon import exceptions
 from horizon import tabs
+from horizon.utils import workers
 from horizon.utils.lazy_encoder import LazyTranslationEncoder
 
 from openstack_dashboard import api
@@ -209,6 +214,13 @@ class NetworkTopologyView(tabs.TabView):
 
 
 class JSONView(View):
+    """The topology of the project as JSON.
+
+    Each version of the topology is identified by its ETag.  When the
+    request names the version the browser has in its "since" parameter and
+    that version is still cached, only the nodes which changed since are
+    returned, under "delta".
+    """
     trans = TranslationHelper()
 
     @property
@@ -253,7 +265,6 @@ class JSONView(View):
                     server_data['console'] = 'auto_console'
 
             data.append(server_data)
-        self.add_resource_url('horizon:project:instances:detail', data)
         return data
 
     def _get_networks(self, request):
@@ -278,8 +289,6 @@ class JSONView(View):
                    'status': self.trans.network[network.status],
                    'original_status': network.status,
                    'router:external': network['router:external']}
-            self.add_resource_url('horizon:project:networks:subnets:detail',
-                                  obj['subnets'])
             networks.append(obj)
 
         # Add public networks to the networks list
@@ -298,8 +307,6 @@ class JSONView(View):
                     subnets = [{'id': subnet.id,
                                 'cidr': subnet.cidr}
                                for subnet in publicnet.subnets]
-                    self.add_resource_url(
-                        'horizon:project:networks:subnets:detail', subnets)
                 except Exception:
                     subnets = []
                 networks.append({
@@ -310,9 +317,6 @@ class JSONView(View):
                     'original_status': publicnet.status,
                     'router:external': publicnet['router:external']})
 
-        self.add_resource_url('horizon:project:networks:detail',
-                              networks)
-
         return sorted(networks,
                       key=lambda x: x.get('router:external'),
                       reverse=True)
@@ -333,18 +337,21 @@ class JSONView(View):
                     'original_status': router.status,
                     'external_gateway_info': router.external_gateway_info}
                    for router in neutron_routers]
-        self.add_resource_url('horizon:project:routers:detail', routers)
         return routers
 
     def _get_ports(self, request, networks):
+        # we should filter out ports connected to non tenant networks
+        # which they have no visibility to
+        tenant_network_ids = tuple(network['id'] for network in networks)
+        if not tenant_network_ids:
+            return []
         try:
-            neutron_ports = api.neutron.port_list(request)
+            neutron_ports = api.neutron.list_resources_with_long_filters(
+                api.neutron.port_list, 'network_id', tenant_network_ids,
+                request=request)
         except Exception:
             neutron_ports = []
 
-        # we should filter out ports connected to non tenant networks
-        # which they have no visibility to
-        tenant_network_ids = [network['id'] for network in networks]
         ports = [{'id': port.id,
                   'network_id': port.network_id,
                   'device_id': port.device_id,
@@ -353,12 +360,25 @@ class JSONView(View):
                   'status': self.trans.port[port.status],
                   'original_status': port.status}
                  for port in neutron_ports
-                 if port.device_owner != 'network:router_ha_interface'
-                 and port.network_id in tenant_network_ids]
-        self.add_resource_url('horizon:project:networks:ports:detail',
-                              ports)
+                 if port.device_owner != 'network:router_ha_interface']
         return ports
 
+    def _add_resource_urls(self, data):
+        # reverse() uses the script prefix of the current thread, which is
+        # only set in the request thread, so the URLs are not added by the
+        # calls run on the worker pool.
+        self.add_resource_url('horizon:project:instances:detail',
+                              data['servers'])
+        for network in data['networks']:
+            self.add_resource_url('horizon:project:networks:subnets:detail',
+                                  network['subnets'])
+        self.add_resource_url('horizon:project:networks:detail',
+                              data['networks'])
+        self.add_resource_url('horizon:project:routers:detail',
+                              data['routers'])
+        self.add_resource_url('horizon:project:networks:ports:detail',
+                              data['ports'])
+
     def _prepare_gateway_ports(self, routers, ports):
         # user can't see port on external network. so we are
         # adding fake port based on router information
@@ -380,13 +400,58 @@ class JSONView(View):
                          'fixed_ips': []}
             ports.append(fake_port)
 
-    def get(self, request, *args, **kwargs):
+    def _get_networks_and_ports(self, request):
         networks = self._get_networks(request)
-        data = {'servers': self._get_servers(request),
+        return networks, self._get_ports(request, networks)
+
+    def get(self, request, *args, **kwargs):
+        # The ports are filtered by the networks, so they are fetched
+        # together while the servers and routers are fetched alongside.
+        results = workers.gather(
+            {'servers': (self._get_servers, request),
+             'networks': (self._get_networks_and_ports, request),
+             'routers': (self._get_routers, request)},
+            name=request.path)
+        networks, ports = results.get('networks', ([], []))
+        data = {'servers': results.get('servers', []),
                 'networks': networks,
-                'ports': self._get_ports(request, networks),
-                'routers': self._get_routers(request)}
+                'ports': ports,
+                'routers': results.get('routers', [])}
+        self._add_resource_urls(data)
         self._prepare_gateway_ports(data['routers'], data['ports'])
         json_string = json.dumps(data, cls=LazyTranslationEncoder,
                                  ensure_ascii=False)
-        return HttpResponse(json_string, content_type='text/json')
+
+        # The topology is polled, answer 304 when it did not change since
+        # the last poll so the browser does not download and redraw it.
+        snapshot_id = hashlib.md5(json_string.encode('utf-8')).hexdigest()
+        etag = quote_etag(snapshot_id)
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            timeout = getattr(settings, 'NETWORK_TOPOLOGY_SNAPSHOT_TIMEOUT',
+                              300)
+            if timeout:
+                cache.set(self._snapshot_key(request, snapshot_id),
+                          json_string, timeout)
+                json_string = self._get_delta(request, json_string)
+            response = HttpResponse(json_string, content_type='text/json')
+        response['ETag'] = etag
+        return response
+
+    def _snapshot_key(self, request, snapshot_id):
+        return 'network_topology:%s:%s:%s' % (
+            request.user.id, request.user.tenant_id, snapshot_id)
+
+    def _get_delta(self, request, json_string):
+        since = request.GET.get('since')
+        if not since:
+            return json_string
+        old = cache.get(self._snapshot_key(request, since))
+        if old is None:
+            return json_string
+        delta = utils.get_topology_delta(json.loads(old),
+                                         json.loads(json_string))
+        if delta is None:
+            return json_string
+        return json.dumps({'since': since, 'delta': delta},
+                          ensure_ascii=False)
@@ -37,11 +37,13 @@ INDEX_URL = reverse('horizon:project:overview:index')
 class UsageViewTests(test.TestCase):
 
     @test.create_stubs({api.nova: ('usage_get',
+                                   'usage_get_iter',
                                    'tenant_absolute_limits',
                                    'extension_supported')})
     def _stub_nova_api_calls(self, nova_stu_enabled=True,
                              tenant_limits_exception=False,
-                             stu_exception=False, overview_days_range=None):
+                             stu_exception=False, overview_days_range=None,
+                             stream=False):
         api.nova.extension_supported(
             'SimpleTenantUsage', IsA(http.HttpRequest)) \
             .AndReturn(nova_stu_enabled)
@@ -60,7 +62,8 @@ class UsageViewTests(test.TestCase):
 
         if nova_stu_enabled:
             self._nova_stu_enabled(stu_exception,
-                                   overview_days_range=overview_days_range)
+                                   overview_days_range=overview_days_range,
+                                   stream=stream)
 
     @test.create_stubs({api.cinder: ('tenant_absolute_limits',)})
     def _stub_cinder_api_calls(self):
@@ -83,7 +86,8 @@ class UsageViewTests(test.TestCase):
             api.neutron.security_group_list(IsA(http.HttpRequest)) \
                 .AndReturn(self.security_groups.list())
 
-    def _nova_stu_enabled(self, exception=False, overview_days_range=1):
+    def _nova_stu_enabled(self, exception=False, overview_days_range=1,
+                          stream=False):
         now = timezone.now()
         if overview_days_range:
             start_day = now - datetime.timedelta(days=overview_days_range)
@@ -93,7 +97,11 @@ class UsageViewTests(test.TestCase):
                                   start_day.day, 0, 0, 0, 0)
         end = datetime.datetime(now.year, now.month, now.day, 23, 59, 59, 0)
 
-        if exception:
+        if stream:
+            api.nova.usage_get_iter(IsA(http.HttpRequest), self.tenant.id,
+                                    start, end) \
+                .AndReturn(iter([api.nova.NovaUsage(self.usages.first())]))
+        elif exception:
             api.nova.usage_get(IsA(http.HttpRequest), self.tenant.id,
                                start, end) \
                 .AndRaise(exception)
@@ -190,7 +198,8 @@ class UsageViewTests(test.TestCase):
 
     def _test_usage_csv(self, nova_stu_enabled=True, overview_days_range=None):
         self._stub_nova_api_calls(nova_stu_enabled,
-                                  overview_days_range=overview_days_range)
+                                  overview_days_range=overview_days_range,
+                                  stream=True)
         self._stub_neutron_api_calls()
         self._stub_cinder_api_calls()
         self.mox.ReplayAll()
@@ -198,6 +207,12 @@ class UsageViewTests(test.TestCase):
                               "?format=csv")
         self.assertTemplateUsed(res, 'project/overview/usage.csv')
         self.assertIsInstance(res.context['usage'], usage.ProjectUsage)
+        content = b''.join(res.streaming_content).decode('utf-8')
+        if nova_stu_enabled:
+            for inst in self.usages.first().server_usages:
+                if inst['ended_at'] is None:
+                    self.assertIn(inst['name'], content)
+        self.assertIn('Total Disk Usage (Hours):', content)
 
     def test_usage_exception_usage(self):
         self._stub_nova_api_calls(stu_exception=self.exceptions.nova)
@@ -32,7 +32,7 @@ from openstack_dashboard.dashboards.project.instances \
 from openstack_dashboard.utils import filters
 
 
-class ProjectUsageCsvRenderer(csvbase.BaseCsvResponse):
+class ProjectUsageCsvRenderer(csvbase.BaseCsvStreamingResponse):
 
     columns = [_("Instance Name"), _("VCPUs"), _("RAM (MB)"),
                _("Disk (GB)"), _("Usage (Hours)"),
@@ -41,16 +41,17 @@ class ProjectUsageCsvRenderer(csvbase.BaseCsvResponse):
     def get_row_data(self):
 
         choices = project_tables.STATUS_DISPLAY_CHOICES
-        for inst in self.context['usage'].get_instances():
-            state_label = (
-                filters.get_display_label(choices, inst['state']))
-            yield (inst['name'],
-                   inst['vcpus'],
-                   inst['memory_mb'],
-                   inst['local_gb'],
-                   floatformat(inst['hours'], 2),
-                   inst['uptime'],
-                   capfirst(state_label))
+        for usage in self.context['usage'].usage_iter:
+            for inst in usage.server_usages:
+                state_label = (
+                    filters.get_display_label(choices, inst['state']))
+                yield (inst['name'],
+                       inst['vcpus'],
+                       inst['memory_mb'],
+                       inst['local_gb'],
+                       floatformat(inst['hours'], 2),
+                       inst['uptime'],
+                       capfirst(state_label))
 
 
 class ProjectOverview(usage.ProjectUsageView):
@@ -402,6 +402,7 @@ class CreateForm(forms.SelfHandlingForm):
                                           metadata=metadata,
                                           availability_zone=az,
                                           source_volid=volume_id)
+            quotas.invalidate_tenant_quota_usages(request)
             message = _('Creating volume "%s"') % data['name']
             messages.info(request, message)
             return volume
@@ -13,6 +13,38 @@ ADCAAS_ENDPOINT="%s://%s:%s" % (
     os.environ['ADCAAS_APP_PROTOCOL'], 
     os.environ['ADCAAS_APP_HOST'], 
     os.environ['ADCAAS_APP_PORT'])
+
+# Tuning for the pooled HTTP session shared by all ADCaaS API calls. Retries
+# with exponential backoff are only attempted for idempotent verbs.
+#ADCAAS_CONNECTION = {
+#    'pool_connections': 4,
+#    'pool_maxsize': 16,
+#    'timeout': (3.05, 30),
+#    'retries': 3,
+#    'backoff_factor': 0.3,
+#    'status_forcelist': (502, 503, 504),
+#}
+
+# ADC lists and details fetched from ADCaaS are cached per tenant in the
+# default Django cache for this many seconds (at most 300). Creating,
+# updating or deleting a resource through the dashboard invalidates its
+# cached entries. Set to 0 to disable the cache.
+#ADCAAS_CACHE_TIMEOUT = 10
+
+# Image names and flavors referenced by ADCs are resolved by id and kept in
+# the default Django cache for this many seconds.
+#F5ADC_LOOKUP_CACHE_TIMEOUT = 300
+
+# The f5services pages fetch ADCaaS and OpenStack data concurrently on the
+# horizon worker pool. Calls still running once a request has used up its
+# latency budget, in seconds, are given up and the page is rendered with
+# the data gathered so far.
+#F5SERVICES_LATENCY_BUDGET = 10
+
+# Quota usages of a project are cached for this many seconds, launching or
+# deleting instances and volumes from the dashboard refreshes them at once.
+# Set to 0 to always fetch them from the services.
+#QUOTA_USAGES_CACHE_TIMEOUT = 10
 DEBUG = True
 
 mimetypes.add_type("image/svg+xml", ".svg", True)
@@ -199,6 +231,10 @@ OPENSTACK_HOST = "127.0.0.1"
 OPENSTACK_KEYSTONE_URL = os.environ['OS_AUTH_URL']
 OPENSTACK_KEYSTONE_DEFAULT_ROLE = "_member_"
 
+# Number of seconds the projects of a user are cached across requests, at
+# most until the token of the user expires.
+#OPENSTACK_PROJECT_LIST_CACHE_TIMEOUT = 300
+
 # For setting the default service region on a per-endpoint basis. Note that the
 # default value for this setting is {}, and below is just an example of how it
 # should be specified.
@@ -255,6 +291,11 @@ OPENSTACK_KEYSTONE_DEFAULT_ROLE = "_member_"
 # The CA certificate to use to verify SSL connections
 #OPENSTACK_SSL_CACERT = '/path/to/cacert.pem'
 
+# The number of sessions to the OpenStack services kept for reuse by the
+# requests, and the number of seconds an unused session is kept.
+#OPENSTACK_SESSION_POOL_SIZE = 200
+#OPENSTACK_SESSION_IDLE_TIMEOUT = 300
+
 # The OPENSTACK_KEYSTONE_BACKEND settings can be used to identify the
 # capabilities of the auth backend for Keystone.
 # If Keystone has been configured to use LDAP as the auth backend then set
@@ -327,6 +368,10 @@ OPENSTACK_CINDER_FEATURES = {
     'enable_backup': False,
 }
 
+# Number of seconds each version of the network topology is cached, so that
+# the topology page only downloads what changed since the version it shows.
+#NETWORK_TOPOLOGY_SNAPSHOT_TIMEOUT = 300
+
 # The OPENSTACK_NEUTRON_NETWORK settings can be used to enable optional
 # services provided by neutron. Options currently available are load
 # balancer service, security groups, quotas, VPN service.
@@ -431,6 +476,12 @@ IMAGE_RESERVED_CUSTOM_PROPERTIES = []
 # image form. See documentation for deployment considerations.
 #HORIZON_IMAGES_UPLOAD_MODE = 'legacy'
 
+# In 'legacy' mode, the image data is uploaded to Glance by a pool of
+# IMAGE_UPLOAD_WORKERS threads per dashboard process. With Glance v2, an
+# upload which fails is started over up to IMAGE_UPLOAD_RETRIES times.
+#IMAGE_UPLOAD_WORKERS = 2
+#IMAGE_UPLOAD_RETRIES = 2
+
 # Allow a location to be set when creating or updating Glance images.
 # If using Glance V2, this value should be False unless the Glance
 # configuration and policies allow setting locations.
@@ -462,6 +513,16 @@ API_RESULT_PAGE_SIZE = 20
 # The size of chunk in bytes for downloading objects from Swift
 SWIFT_FILE_TRANSFER_CHUNK_SIZE = 512 * 1024
 
+# Files larger than this are uploaded to Swift in segments of this size, and
+# objects larger than twice the range size are downloaded by ranges. The
+# segments or ranges of one object are transferred SWIFT_TRANSFER_CONCURRENCY
+# at a time, on a pool of SWIFT_TRANSFER_POOL_SIZE threads shared by the
+# transfers of a process.
+#SWIFT_SEGMENT_SIZE = 512 * 1024 * 1024
+#SWIFT_DOWNLOAD_RANGE_SIZE = 16 * 1024 * 1024
+#SWIFT_TRANSFER_CONCURRENCY = 4
+#SWIFT_TRANSFER_POOL_SIZE = 16
+
 # The default number of lines displayed for instance console log.
 INSTANCE_LOG_LENGTH = 35
 
@@ -879,6 +940,15 @@ REST_API_REQUIRED_SETTINGS = ['OPENSTACK_HYPERVISOR_FEATURES',
 # of data fetched by default when rendering the Overview panel.
 #OVERVIEW_DAYS_RANGE = 1
 
+# The Overview panels cache the usage of the days which are over for this many
+# seconds and only fetch the usage of today from Nova again. Set to 0 to fetch
+# the usage of the whole period on every request.
+#OVERVIEW_USAGE_CACHE_TIMEOUT = 86400
+
+# Number of days whose usage the Overview panels fetch from Nova at once when
+# they are not cached.
+#OVERVIEW_USAGE_CONCURRENCY = 4
+
 # To allow operators to require users provide a search criteria first
 # before loading any data into the views, set the following dict
 # attributes to True in each one of the panels you want to enable this feature.
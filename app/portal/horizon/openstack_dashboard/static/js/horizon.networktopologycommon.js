@@ -30,6 +30,8 @@ horizon.networktopologyloader = {
   reload_duration: 10000,
   // timer controlling update intervals
   update_timer: null,
+  // ETag of the data in 'model', sent back to only get changed data
+  etag: null,
 
   init:function() {
     var self = this;
@@ -44,16 +46,72 @@ horizon.networktopologyloader = {
    */
   update:function() {
     var self = this;
-    angular.element.getJSON(
-      angular.element('#networktopology').data('networktopology') + '?' + angular.element.now(),
-      function(data) {
-        self.model = data;
-        $('#networktopology').trigger('change');
+    var headers = {};
+    var url = angular.element('#networktopology').data('networktopology') + '?' +
+      angular.element.now();
+    if (self.etag) {
+      headers['If-None-Match'] = self.etag;
+      // Only ask for the nodes which changed since the model was loaded
+      url += '&since=' + encodeURIComponent(self.etag.replace(/"/g, ''));
+    }
+    clearTimeout(self.update_timer);
+    angular.element.ajax({
+      url: url,
+      dataType: 'json',
+      headers: headers,
+      success: function(data, textStatus, jqXHR) {
+        // A 304 means the topology did not change since the last update
+        if (jqXHR.status !== 304) {
+          if (data.delta) {
+            self.apply_delta(data.delta);
+          } else {
+            self.model = data;
+          }
+          self.etag = jqXHR.getResponseHeader('ETag');
+          $('#networktopology').trigger('change');
+        }
         self.update_timer = setTimeout(function(){
           self.update();
         }, self.reload_duration);
       }
-    );
+    });
+  },
+
+  /**
+   * updates the 'model' with the nodes which changed since it was loaded
+   *
+   * @param {Object} delta maps each kind of node to the nodes added or
+   * changed and to the ids of the nodes removed
+   */
+  apply_delta:function(delta) {
+    var self = this;
+    angular.forEach(delta, function(changes, kind) {
+      var removed = {};
+      var changed = {};
+      angular.forEach(changes.removed, function(id) {
+        removed[id] = true;
+      });
+      angular.forEach(changes.changed, function(node) {
+        changed[node.id] = node;
+      });
+      var nodes = [];
+      angular.forEach(self.model[kind], function(node) {
+        if (removed[node.id]) {
+          return;
+        }
+        if (changed[node.id]) {
+          node = changed[node.id];
+          delete changed[node.id];
+        }
+        nodes.push(node);
+      });
+      angular.forEach(changes.changed, function(node) {
+        if (changed[node.id]) {
+          nodes.push(node);
+        }
+      });
+      self.model[kind] = nodes;
+    });
   },
 
   /**
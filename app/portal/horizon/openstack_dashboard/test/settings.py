@@ -151,6 +151,13 @@ OPENSTACK_API_VERSIONS = {
     "image": 2
 }
 
+ADCAAS_ENDPOINT = "http://localhost:3000"
+
+# Tests stub the quota and usage APIs call by call, do not serve usages from
+# cache.
+QUOTA_USAGES_CACHE_TIMEOUT = 0
+OVERVIEW_USAGE_CACHE_TIMEOUT = 0
+
 OPENSTACK_KEYSTONE_URL = "http://localhost:5000/v3"
 OPENSTACK_KEYSTONE_DEFAULT_ROLE = "_member_"
 
@@ -0,0 +1,58 @@
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from openstack_dashboard import api
+from openstack_dashboard.api.rest import f5services
+from openstack_dashboard.test import helpers as test
+
+
+class F5servicesRestTestCase(test.TestCase):
+
+    def _adcs(self):
+        return [
+            api.f5wafaas.ADCInstance(
+                {'id': 'adc1', 'status': 'ONBOARDING', 'lastErr': '',
+                 'management': {'vmId': 'vm1'}}, None),
+            api.f5wafaas.ADCInstance(
+                {'id': 'adc2', 'status': 'ACTIVE'}, None),
+            api.f5wafaas.ADCInstance(
+                {'id': 'adc3', 'status': 'LICENSING'}, None),
+        ]
+
+    @test.create_mocks(api.f5wafaas, ['adc_list'])
+    def test_adc_statuses_get(self):
+        request = self.mock_rest_request(GET={'ids': 'adc1,adc2,gone'})
+        self.mock_adc_list.return_value = self._adcs()[:2]
+
+        response = f5services.ADCStatuses().get(request)
+
+        self.assertStatusCode(response, 200)
+        self.assertItemsCollectionEqual(response, [
+            {'id': 'adc1', 'status': 'ONBOARDING', 'lastErr': '',
+             'management': {'vmId': 'vm1'}},
+            {'id': 'adc2', 'status': 'ACTIVE', 'lastErr': None,
+             'management': None},
+        ])
+        self.mock_adc_list.assert_called_once_with(
+            request, cached=False,
+            where={'id': {'inq': ['adc1', 'adc2', 'gone']}},
+            fields=f5services.STATUS_FIELDS)
+
+    @test.create_mocks(api.f5wafaas, ['adc_list'])
+    def test_adc_statuses_get_no_ids(self):
+        request = self.mock_rest_request(GET={})
+
+        response = f5services.ADCStatuses().get(request)
+
+        self.assertStatusCode(response, 200)
+        self.assertItemsCollectionEqual(response, [])
+        self.mock_adc_list.assert_not_called()
@@ -55,6 +55,26 @@ class ImagesRestTestCase(test.ResetImageAPIVersionMixin, test.TestCase):
         self.assertEqual(response.json, {"a": "1", "b": "2"})
         self.mock_image_get.assert_called_once_with(request, "1")
 
+    @test.create_mocks(api.glance, ['image_upload_progress'])
+    def test_image_upload_progress(self):
+        request = self.mock_rest_request()
+        self.mock_image_upload_progress.return_value = {'status': 'uploading',
+                                                        'uploaded': 10}
+
+        response = glance.ImageUpload().get(request, "1")
+        self.assertStatusCode(response, 200)
+        self.assertEqual(response.json, {'status': 'uploading',
+                                         'uploaded': 10})
+        self.mock_image_upload_progress.assert_called_once_with(request, "1")
+
+    @test.create_mocks(api.glance, ['image_upload_progress'])
+    def test_image_upload_progress_unknown(self):
+        request = self.mock_rest_request()
+        self.mock_image_upload_progress.return_value = None
+
+        response = glance.ImageUpload().get(request, "1")
+        self.assertStatusCode(response, 404)
+
     @test.create_mocks(api.glance, ['image_update_properties'])
     def test_image_edit_metadata(self):
         request = self.mock_rest_request(
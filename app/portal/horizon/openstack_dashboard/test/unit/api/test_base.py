@@ -19,8 +19,12 @@
 from __future__ import absolute_import
 
 from django.conf import settings
+from django.test.utils import override_settings
+import mock
+import requests
 
 from horizon import exceptions
+from horizon.utils import workers
 
 from openstack_dashboard.api import base as api_base
 from openstack_dashboard.api import cinder
@@ -287,6 +291,95 @@ class ApiHelperTests(test.TestCase):
         with self.assertRaises(exceptions.ServiceCatalogException):
             url = api_base.url_for(self.request, 'image')
 
+    def test_get_catalog_index(self):
+        index = api_base.get_catalog_index(self.request)
+        self.assertIs(index, self.request.user.token.catalog_index)
+        self.assertIs(index, api_base.get_catalog_index(self.request))
+
+        # Another catalog is indexed again.
+        self.request.user.service_catalog = [
+            service for service in self.request.user.service_catalog
+            if service['type'] != 'image']
+        index = api_base.get_catalog_index(self.request)
+        self.assertIsNone(index.url_for('image', 'RegionOne', 'publicURL'))
+        self.assertFalse(api_base.is_service_enabled(self.request, 'image'))
+        self.assertTrue(api_base.is_service_enabled(self.request, 'compute'))
+
+
+class SessionPoolTests(test.TestCase):
+    def test_get_reuses_sessions(self):
+        pool = api_base.SessionPool(10, 300)
+        session = pool.get('http://compute', 'token')
+        self.assertIs(session, pool.get('http://compute', 'token'))
+        self.assertIsNot(session, pool.get('http://compute', 'other'))
+        self.assertIsNot(session, pool.get('http://network', 'token'))
+        self.assertEqual('http://compute', session.get_endpoint())
+        self.assertEqual('token', session.get_token())
+        # The sessions share their connection pools, not their cookies.
+        other = pool.get('http://network', 'token')
+        self.assertIsNot(session.session, other.session)
+        self.assertIs(session.session.get_adapter('https://compute'),
+                      other.session.get_adapter('https://network'))
+
+    @override_settings(HORIZON_WORKER_CALL_TIMEOUT=5)
+    @mock.patch.object(api_base.ks_session.Session, 'request')
+    def test_requests_of_workers_time_out(self, mock_request):
+        pool = api_base.SessionPool(10, 300)
+        session = pool.get('http://compute', 'token')
+
+        session.request('http://compute/servers', 'GET')
+        mock_request.assert_called_with('http://compute/servers', 'GET')
+        workers.gather({'call': (session.request, 'http://compute/servers',
+                                 'GET')}, raise_errors=True)
+        mock_request.assert_called_with('http://compute/servers', 'GET',
+                                        timeout=5)
+
+    def test_sessions_reject_cookies(self):
+        pool = api_base.SessionPool(10, 300)
+        http = pool.get('http://compute', 'token').session
+        request = requests.cookies.MockRequest(
+            requests.Request('GET', 'http://compute/').prepare())
+        http.cookies.set_cookie_if_ok(
+            requests.cookies.create_cookie('lb', 'node1'), request)
+        self.assertEqual(0, len(http.cookies))
+
+    @override_settings(OPENSTACK_SSL_NO_VERIFY=True,
+                       OPENSTACK_SSL_CACERT='/etc/ssl/ca.pem')
+    def test_insecure_overrides_cacert(self):
+        pool = api_base.SessionPool(10, 300)
+        self.assertFalse(pool.get('http://compute', 'token').verify)
+
+    @override_settings(OPENSTACK_SSL_CACERT='/etc/ssl/ca.pem')
+    def test_cacert(self):
+        pool = api_base.SessionPool(10, 300)
+        self.assertEqual('/etc/ssl/ca.pem',
+                         pool.get('http://compute', 'token').verify)
+
+    def test_get_evicts_least_recently_used(self):
+        pool = api_base.SessionPool(2, 300)
+        first = pool.get('http://compute', 'first')
+        second = pool.get('http://compute', 'second')
+        pool.get('http://compute', 'first')
+        pool.get('http://compute', 'third')
+
+        self.assertIs(first, pool.get('http://compute', 'first'))
+        self.assertIsNot(second, pool.get('http://compute', 'second'))
+
+    @mock.patch.object(api_base.time, 'time')
+    def test_get_evicts_idle_sessions(self, mock_time):
+        pool = api_base.SessionPool(10, 300)
+        mock_time.return_value = 1000
+        session = pool.get('http://compute', 'token')
+        mock_time.return_value = 1299
+        self.assertIs(session, pool.get('http://compute', 'token'))
+        mock_time.return_value = 1600
+        self.assertIsNot(session, pool.get('http://compute', 'token'))
+
+    def test_get_session(self):
+        session = api_base.get_session(self.request, 'http://compute')
+        self.assertIs(session, api_base.get_session_pool().get(
+            'http://compute', self.request.user.token.id))
+
 
 class QuotaSetTests(test.TestCase):
 
@@ -0,0 +1,341 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import json
+
+from django.core.cache import cache
+from django.test.utils import override_settings
+import mock
+
+from openstack_dashboard.api import f5wafaas
+from openstack_dashboard.api.rest import f5services
+from openstack_dashboard.test import helpers as test
+
+
+def _response(status_code=200, body=None):
+    response = mock.Mock(status_code=status_code, reason='reason')
+    response.content = json.dumps(body or {})
+    return response
+
+
+class F5wafaasSessionTests(test.TestCase):
+    def setUp(self):
+        super(F5wafaasSessionTests, self).setUp()
+        f5wafaas.reset_session()
+        self.addCleanup(f5wafaas.reset_session)
+        cache.clear()
+
+    def test_session_is_shared(self):
+        self.assertIs(f5wafaas.get_session(), f5wafaas.get_session())
+
+    @override_settings(ADCAAS_CONNECTION={'pool_maxsize': 3, 'retries': 5})
+    def test_session_pool_settings(self):
+        adapter = f5wafaas.get_session().get_adapter('http://localhost')
+        self.assertEqual(3, adapter._pool_maxsize)
+        self.assertEqual(5, adapter.max_retries.total)
+        self.assertTrue(adapter.max_retries.is_retry('GET', 503))
+        self.assertFalse(adapter.max_retries.is_retry('POST', 503))
+
+    def test_reset_session(self):
+        session = f5wafaas.get_session()
+        f5wafaas.reset_session()
+        self.assertIsNot(session, f5wafaas.get_session())
+
+    @mock.patch.object(f5wafaas, 'get_session')
+    def test_adc_list(self, mock_get_session):
+        adcs = [{'id': 'adc1', 'name': 'one'}, {'id': 'adc2', 'name': 'two'}]
+        mock_request = mock_get_session.return_value.request
+        mock_request.return_value = _response(body={'adcs': adcs})
+
+        ret = f5wafaas.adc_list(self.request)
+
+        self.assertEqual(['adc1', 'adc2'], [adc.id for adc in ret])
+        mock_request.assert_called_once_with(
+            'GET', 'http://localhost:3000/adcaas/v1/adcs',
+            headers=mock.ANY, params={}, timeout=(3.05, 30))
+
+    @mock.patch.object(f5wafaas, 'get_session')
+    def test_adc_delete_failure(self, mock_get_session):
+        mock_request = mock_get_session.return_value.request
+        mock_request.return_value = _response(status_code=404)
+
+        self.assertRaises(Exception, f5wafaas.adc_delete,
+                          self.request, 'adc1')
+
+
+class F5wafaasResourceTests(test.TestCase):
+    def setUp(self):
+        super(F5wafaasResourceTests, self).setUp()
+        cache.clear()
+
+    def _mock_request(self, mock_get_session, status_code=200, body=None):
+        mock_request = mock_get_session.return_value.request
+        mock_request.return_value = _response(status_code, body)
+        return mock_request
+
+    @mock.patch.object(f5wafaas, 'get_session')
+    def test_resource_list_filters(self, mock_get_session):
+        pools = [{'id': 'pool1', 'name': 'one', 'members': []}]
+        mock_request = self._mock_request(mock_get_session,
+                                          body={'pools': pools})
+
+        ret = f5wafaas.resource_list(self.request, f5wafaas.Pool,
+                                     where={'name': 'one'}, limit=10,
+                                     include=['members'])
+
+        self.assertEqual(1, len(ret))
+        self.assertIsInstance(ret[0], f5wafaas.Pool)
+        self.assertEqual([], ret[0].members)
+        params = mock_request.call_args[1]['params']
+        self.assertEqual({'where': {'name': 'one'}, 'limit': 10,
+                          'include': [{'relation': 'members'}]},
+                         json.loads(params['filter']))
+
+    @mock.patch.object(f5wafaas, 'get_session')
+    def test_resource_get_nested(self, mock_get_session):
+        member = {'id': 'member1', 'address': '10.0.0.1', 'port': 80}
+        mock_request = self._mock_request(mock_get_session,
+                                          body={'member': member})
+
+        ret = f5wafaas.resource_get(self.request, f5wafaas.Member,
+                                    'member1', parent_id='pool1')
+
+        self.assertEqual('10.0.0.1', ret.address)
+        mock_request.assert_called_once_with(
+            'GET', 'http://localhost:3000/adcaas/v1/pools/pool1/members/'
+            'member1', headers=mock.ANY, timeout=(3.05, 30))
+
+    def test_resource_nested_requires_parent(self):
+        self.assertRaises(ValueError, f5wafaas.resource_list,
+                          self.request, f5wafaas.Declaration)
+
+    def test_resource_missing_attribute(self):
+        pool = f5wafaas.Pool({'id': 'pool1'}, self.request)
+        self.assertFalse(hasattr(pool, 'loadBalancingMode'))
+
+    @mock.patch.object(f5wafaas, 'get_session')
+    def test_resource_count(self, mock_get_session):
+        mock_request = self._mock_request(mock_get_session,
+                                          body={'count': 3})
+
+        ret = f5wafaas.resource_count(self.request, f5wafaas.Application,
+                                      where={'status': 'DONE'})
+
+        self.assertEqual(3, ret)
+        mock_request.assert_called_once_with(
+            'GET', 'http://localhost:3000/adcaas/v1/applications/count',
+            headers=mock.ANY, params={'where': '{"status": "DONE"}'},
+            timeout=(3.05, 30))
+
+    @mock.patch.object(f5wafaas, 'get_session')
+    def test_resource_update(self, mock_get_session):
+        mock_request = self._mock_request(mock_get_session, status_code=204)
+
+        f5wafaas.resource_update(self.request, f5wafaas.Monitor,
+                                 'monitor1', {'interval': 5})
+
+        mock_request.assert_called_once_with(
+            'PATCH', 'http://localhost:3000/adcaas/v1/monitors/monitor1',
+            headers=mock.ANY, data='{"interval": 5}', timeout=(3.05, 30))
+
+    @mock.patch.object(f5wafaas, 'resource_list')
+    def test_resource_list_many(self, mock_resource_list):
+        mock_resource_list.side_effect = \
+            lambda request, resource_class, **kwargs: [resource_class]
+
+        ret = f5wafaas.resource_list_many(self.request, {
+            'pools': (f5wafaas.Pool, {'include': ['members']}),
+            'monitors': (f5wafaas.Monitor, {}),
+        })
+
+        self.assertEqual({'pools': [f5wafaas.Pool],
+                          'monitors': [f5wafaas.Monitor]}, ret)
+        mock_resource_list.assert_any_call(self.request, f5wafaas.Pool,
+                                           include=['members'])
+
+    @override_settings(API_RESULT_PAGE_SIZE=2)
+    @mock.patch.object(f5wafaas, 'get_session')
+    def test_adc_list_paged(self, mock_get_session):
+        adcs = [{'id': 'adc%d' % i} for i in range(3)]
+        mock_request = self._mock_request(mock_get_session,
+                                          body={'adcs': adcs})
+
+        ret, has_more, has_prev = f5wafaas.adc_list_paged(
+            self.request, offset=2, sort_key='name', sort_dir='asc',
+            filters={'status': 'ACTIVE'}, paginate=True)
+
+        self.assertEqual(['adc0', 'adc1'], [adc.id for adc in ret])
+        self.assertTrue(has_more)
+        self.assertTrue(has_prev)
+        params = mock_request.call_args[1]['params']
+        self.assertEqual({'where': {'status': 'ACTIVE'}, 'limit': 3,
+                          'skip': 2, 'order': ['name ASC', 'id ASC']},
+                         json.loads(params['filter']))
+
+    @override_settings(API_RESULT_PAGE_SIZE=2)
+    @mock.patch.object(f5wafaas, 'get_session')
+    def test_adc_list_paged_last_page(self, mock_get_session):
+        self._mock_request(mock_get_session, body={'adcs': [{'id': 'adc0'}]})
+
+        ret, has_more, has_prev = f5wafaas.adc_list_paged(self.request,
+                                                          paginate=True)
+
+        self.assertEqual(['adc0'], [adc.id for adc in ret])
+        self.assertFalse(has_more)
+        self.assertFalse(has_prev)
+
+    def test_adc_list_paged_invalid_sort_key(self):
+        self.assertRaises(ValueError, f5wafaas.adc_list_paged,
+                          self.request, sort_key='password')
+
+    @mock.patch.object(f5wafaas, 'get_session')
+    def test_adc_iter(self, mock_get_session):
+        body = json.dumps({'adcs': [{'id': 'adc%d' % i, 'name': u'\u00e9'}
+                                    for i in range(20)]}).encode('utf-8')
+        mock_request = self._mock_request(mock_get_session)
+        response = mock_request.return_value
+        response.iter_content.return_value = [body[i:i + 7]
+                                              for i in range(0, len(body), 7)]
+
+        ret = f5wafaas.adc_iter(self.request, fields=['id', 'name'])
+
+        mock_request.assert_not_called()
+        ret = list(ret)
+        self.assertEqual(['adc%d' % i for i in range(20)],
+                         [adc.id for adc in ret])
+        self.assertEqual(u'\u00e9', ret[0].name)
+        self.assertTrue(mock_request.call_args[1]['stream'])
+        response.close.assert_called_once_with()
+
+    @mock.patch.object(f5wafaas, 'get_session')
+    def test_adc_iter_truncated(self, mock_get_session):
+        mock_request = self._mock_request(mock_get_session)
+        response = mock_request.return_value
+        response.iter_content.return_value = [b'{"adcs": [{"id": "adc1"},',
+                                              b' {"id": "ad']
+
+        ret = f5wafaas.adc_iter(self.request)
+
+        self.assertEqual('adc1', next(ret).id)
+        self.assertRaises(ValueError, next, ret)
+        response.close.assert_called_once_with()
+
+    def test_adc_instance_attributes(self):
+        adc = f5wafaas.ADCInstance({'id': 'adc1', 'status': 'ACTIVE',
+                                    'license': 'XXXX'}, self.request)
+
+        self.assertEqual('ACTIVE', adc.status)
+        self.assertEqual('XXXX', adc.license)
+        self.assertFalse(hasattr(adc, 'lastErr'))
+        self.assertFalse(hasattr(adc, 'full_flavor'))
+        adc.image_name = 'bigip'
+        self.assertEqual('bigip', adc.image_name)
+        self.assertRaises(AttributeError, setattr, adc, 'foo', 'bar')
+        self.assertEqual({'id': 'adc1', 'status': 'ACTIVE',
+                          'license': 'XXXX'}, adc.to_dict())
+
+
+class F5wafaasCacheTests(test.TestCase):
+    def setUp(self):
+        super(F5wafaasCacheTests, self).setUp()
+        cache.clear()
+
+    def _mock_request(self, mock_get_session, body):
+        mock_request = mock_get_session.return_value.request
+        mock_request.return_value = _response(body=body)
+        return mock_request
+
+    @mock.patch.object(f5wafaas, 'get_session')
+    def test_adc_list_cached(self, mock_get_session):
+        mock_request = self._mock_request(mock_get_session,
+                                          {'adcs': [{'id': 'adc1'}]})
+
+        f5wafaas.adc_list(self.request)
+        ret = f5wafaas.adc_list(self.request)
+
+        self.assertEqual(['adc1'], [adc.id for adc in ret])
+        self.assertEqual(1, mock_request.call_count)
+
+    @override_settings(ADCAAS_CACHE_TIMEOUT=0)
+    @mock.patch.object(f5wafaas, 'get_session')
+    def test_adc_list_cache_disabled(self, mock_get_session):
+        mock_request = self._mock_request(mock_get_session,
+                                          {'adcs': [{'id': 'adc1'}]})
+
+        f5wafaas.adc_list(self.request)
+        f5wafaas.adc_list(self.request)
+
+        self.assertEqual(2, mock_request.call_count)
+
+    @mock.patch.object(f5wafaas, 'get_session')
+    def test_adc_status_poll_not_cached(self, mock_get_session):
+        mock_request = self._mock_request(
+            mock_get_session, {'adcs': [{'id': 'adc1', 'status': 'POWERON'}]})
+        request = self.mock_rest_request(GET={'ids': 'adc1'})
+
+        response = f5services.ADCStatuses().get(request)
+        self.assertEqual('POWERON',
+                         json.loads(response.content)['items'][0]['status'])
+
+        mock_request.return_value = _response(
+            body={'adcs': [{'id': 'adc1', 'status': 'ACTIVE'}]})
+        response = f5services.ADCStatuses().get(request)
+        self.assertEqual('ACTIVE',
+                         json.loads(response.content)['items'][0]['status'])
+        mock_request.assert_called_with(
+            'GET', 'http://localhost:3000/adcaas/v1/adcs', headers=mock.ANY,
+            params=f5wafaas._filter_params(
+                where={'id': {'inq': ['adc1']}},
+                fields=f5services.STATUS_FIELDS),
+            timeout=(3.05, 30))
+
+    @mock.patch.object(f5wafaas, 'get_session')
+    def test_adc_get_cached_per_tenant(self, mock_get_session):
+        mock_request = self._mock_request(mock_get_session,
+                                          {'adc': {'id': 'adc1'}})
+
+        f5wafaas.adc_get(self.request, 'adc1')
+        f5wafaas.adc_get(self.request, 'adc1')
+        self.assertEqual(1, mock_request.call_count)
+
+        self.request.user.tenant_id = 'other-tenant'
+        f5wafaas.adc_get(self.request, 'adc1')
+        self.assertEqual(2, mock_request.call_count)
+
+    @mock.patch.object(f5wafaas, 'get_session')
+    def test_adc_write_invalidates(self, mock_get_session):
+        mock_request = self._mock_request(mock_get_session,
+                                          {'adcs': [{'id': 'adc1'}]})
+        f5wafaas.adc_list(self.request)
+
+        mock_request.return_value = _response(status_code=204)
+        f5wafaas.adc_update(self.request, 'adc1', {'name': 'new'})
+        f5wafaas.adc_delete(self.request, 'adc1')
+
+        mock_request.return_value = _response(body={'adcs': []})
+        self.assertEqual([], f5wafaas.adc_list(self.request))
+        self.assertEqual(4, mock_request.call_count)
+
+    @mock.patch.object(f5wafaas, 'get_session')
+    def test_member_write_invalidates_pools(self, mock_get_session):
+        mock_request = self._mock_request(mock_get_session, {'pools': []})
+        f5wafaas.resource_list(self.request, f5wafaas.Pool,
+                               include=['members'])
+
+        mock_request.return_value = _response(status_code=204)
+        f5wafaas.resource_delete(self.request, f5wafaas.Member, 'member1',
+                                 parent_id='pool1')
+
+        mock_request.return_value = _response(body={'pools': []})
+        f5wafaas.resource_list(self.request, f5wafaas.Pool,
+                               include=['members'])
+        self.assertEqual(3, mock_request.call_count)
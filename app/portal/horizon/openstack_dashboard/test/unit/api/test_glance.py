@@ -16,9 +16,15 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import os
+
 from django.conf import settings
+from django.core.cache import cache
+from django.core.files.uploadedfile import InMemoryUploadedFile
 from django.test.utils import override_settings
+import futurist
 import mock
+from six import BytesIO
 
 from openstack_dashboard import api
 from openstack_dashboard.api import base
@@ -350,6 +356,63 @@ class GlanceApiTests(test.APIMockTestCase):
     def test_image_create_v2_external_upload(self):
         self._test_image_create_external_upload()
 
+    def _upload_file(self, content):
+        return InMemoryUploadedFile(BytesIO(content), 'data', 'image.iso',
+                                    'application/octet-stream', len(content),
+                                    None)
+
+    @mock.patch.object(api.glance, '_get_upload_executor',
+                       return_value=futurist.SynchronousExecutor())
+    def test_image_create_upload(self, mock_executor):
+        self.addCleanup(cache.clear)
+        expected_image = self.images.first()
+        uploaded = []
+        glanceclient = self.stub_glanceclient()
+        glanceclient.images.create.return_value = expected_image
+
+        def upload(image_id, data):
+            uploaded.append(data.temporary_file_path())
+            while data.read(4):
+                pass
+        glanceclient.images.upload.side_effect = upload
+
+        api.glance.image_create(self.request,
+                                data=self._upload_file(b'0123456789'))
+
+        glanceclient.images.upload.assert_called_once_with(
+            expected_image.id, mock.ANY)
+        # The in-memory file was spooled to a temporary file, which is
+        # removed once uploaded.
+        self.assertFalse(os.path.exists(uploaded[0]))
+        progress = api.glance.image_upload_progress(self.request,
+                                                    expected_image.id)
+        self.assertEqual('active', progress['status'])
+        self.assertEqual(10, progress['size'])
+        self.assertEqual(10, progress['uploaded'])
+        self.assertEqual(100, progress['percent'])
+        self.assertEqual(1, progress['attempt'])
+
+    @override_settings(IMAGE_UPLOAD_RETRIES=1)
+    @mock.patch.object(api.glance, '_get_upload_executor',
+                       return_value=futurist.SynchronousExecutor())
+    def test_image_create_upload_retry(self, mock_executor):
+        self.addCleanup(cache.clear)
+        expected_image = self.images.first()
+        glanceclient = self.stub_glanceclient()
+        glanceclient.images.create.return_value = expected_image
+        glanceclient.images.upload.side_effect = [IOError('reset'),
+                                                  IOError('reset')]
+
+        api.glance.image_create(self.request,
+                                data=self._upload_file(b'0123456789'))
+
+        self.assertEqual(2, glanceclient.images.upload.call_count)
+        progress = api.glance.image_upload_progress(self.request,
+                                                    expected_image.id)
+        self.assertEqual('failed', progress['status'])
+        self.assertEqual(2, progress['attempt'])
+        self.assertEqual('reset', progress['error'])
+
     @override_settings(OPENSTACK_API_VERSIONS={'image': 1})
     def test_create_image_metadata_docker_v1(self):
         form_data = {
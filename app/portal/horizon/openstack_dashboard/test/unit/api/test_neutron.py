@@ -659,6 +659,18 @@ class NeutronApiTests(test.APITestCase):
         for n in ret_val:
             self.assertIsInstance(n, api.neutron.Router)
 
+    def test_resource_count(self):
+        routers = {'routers': self.api_routers.list()}
+
+        neutronclient = self.stub_neutronclient()
+        neutronclient.list_routers(fields='id', tenant_id='1') \
+            .AndReturn(routers)
+        self.mox.ReplayAll()
+
+        ret_val = api.neutron.resource_count(self.request, 'routers',
+                                             tenant_id='1')
+        self.assertEqual(len(self.api_routers.list()), ret_val)
+
     def test_router_get(self):
         router = {'router': self.api_routers.first()}
         router_id = self.api_routers.first()['id']
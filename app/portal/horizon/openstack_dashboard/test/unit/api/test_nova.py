@@ -19,15 +19,19 @@
 
 from __future__ import absolute_import
 
+import datetime
+
 from django.conf import settings
+from django.core.cache import cache
 from django import http
 from django.test.utils import override_settings
-
+import mock
 from mox3.mox import IsA
 from novaclient import api_versions
 from novaclient import exceptions as nova_exceptions
 from novaclient.v2 import flavor_access as nova_flavor_access
 from novaclient.v2 import servers
+from novaclient.v2 import usage as nova_usage
 
 from horizon import exceptions as horizon_exceptions
 from openstack_dashboard import api
@@ -289,6 +293,112 @@ class ComputeApiTests(test.APITestCase):
         for usage in ret_val:
             self.assertIsInstance(usage, api.nova.NovaUsage)
 
+    def test_usage_list_iter_paginated(self):
+        usages = self.usages.list()
+        # The servers of the last tenant continue on the next page.
+        next_usage = nova_usage.Usage(nova_usage.UsageManager(None),
+                                      usages[-1].to_dict())
+        marker = u'063cf7f3-ded1-4297-bc4c-31eae876cc93'
+
+        novaclient = self.stub_novaclient()
+        novaclient.versions = self.mox.CreateMockAnything()
+        novaclient.versions.get_current().AndReturn(
+            api_versions.APIVersion('2.40'))
+        novaclient.api_version = api_versions.APIVersion('2.40')
+        novaclient.usage = self.mox.CreateMockAnything()
+        novaclient.usage.list('start', 'end', True).AndReturn(usages)
+        novaclient.usage.list('start', 'end', True,
+                              marker=marker).AndReturn([next_usage])
+        novaclient.usage.list('start', 'end', True,
+                              marker=marker).AndReturn([])
+        self.mox.ReplayAll()
+
+        total_vcpus_usage = usages[-1].total_vcpus_usage
+        ret_val = api.nova.usage_list_iter(self.request, 'start', 'end')
+        first = next(ret_val)
+        self.assertIsInstance(first, api.nova.NovaUsage)
+        self.assertEqual(usages[0].tenant_id, first.tenant_id)
+        ret_val = list(ret_val)
+        self.assertEqual([usages[-1].tenant_id],
+                         [u.tenant_id for u in ret_val])
+        self.assertEqual(2 * total_vcpus_usage, ret_val[0].vcpu_hours)
+
+    @override_settings(OVERVIEW_USAGE_CACHE_TIMEOUT=3600)
+    def test_usage_list_by_day(self):
+        self.addCleanup(cache.clear)
+        usages = [api.nova.NovaUsage(u) for u in self.usages.list()]
+        day = datetime.timedelta(days=1)
+        today = datetime.datetime.combine(datetime.datetime.utcnow().date(),
+                                          datetime.time())
+        start = today - 2 * day
+        end = today + datetime.timedelta(hours=23, minutes=59, seconds=59)
+
+        self.mox.StubOutWithMock(api.nova, 'usage_list')
+        for period_start, period_end in ((start, start + day),
+                                         (start + day, today),
+                                         (today, end)):
+            api.nova.usage_list(IsA(http.HttpRequest), period_start,
+                                period_end).InAnyOrder().AndReturn(usages)
+        # Only today is fetched again, the days before come from the cache.
+        api.nova.usage_list(IsA(http.HttpRequest), today,
+                            end).AndReturn(usages)
+        self.mox.ReplayAll()
+
+        for i in range(2):
+            ret_val = api.nova.usage_list_by_day(self.request, start, end)
+
+            self.assertEqual([u.tenant_id for u in usages],
+                             [u.tenant_id for u in ret_val])
+            for usage, merged in zip(usages, ret_val):
+                self.assertIsInstance(merged, api.nova.NovaUsage)
+                self.assertAlmostEqual(3 * usage.total_vcpus_usage,
+                                       merged.vcpu_hours)
+                self.assertEqual(usage.start, merged.start)
+                self.assertEqual(len(usage.server_usages),
+                                 len(merged.server_usages))
+                self.assertAlmostEqual(3 * usage.server_usages[0]['hours'],
+                                       merged.server_usages[0]['hours'])
+                self.assertEqual(usage.vcpus, merged.vcpus)
+
+    @override_settings(OVERVIEW_USAGE_CACHE_TIMEOUT=3600,
+                       OVERVIEW_USAGE_CONCURRENCY=2)
+    def test_usage_get_by_day_batches(self):
+        self.addCleanup(cache.clear)
+        usage = api.nova.NovaUsage(self.usages.first())
+        day = datetime.timedelta(days=1)
+        today = datetime.datetime.combine(datetime.datetime.utcnow().date(),
+                                          datetime.time())
+        start = today - 4 * day
+        end = today + datetime.timedelta(hours=23, minutes=59, seconds=59)
+
+        self.mox.StubOutWithMock(api.nova, 'usage_get')
+        api.nova.usage_get(IsA(http.HttpRequest), self.tenant.id,
+                           IsA(datetime.datetime), IsA(datetime.datetime)) \
+            .MultipleTimes().AndReturn(usage)
+        self.mox.ReplayAll()
+
+        with mock.patch.object(api.nova.workers, 'gather',
+                               wraps=api.nova.workers.gather) as gather:
+            ret_val = api.nova.usage_get_by_day(self.request, self.tenant.id,
+                                                start, end)
+
+        # Four days which are over and today, two at a time.
+        self.assertEqual([2, 2, 1], [len(call[0][0])
+                                     for call in gather.call_args_list])
+        self.assertAlmostEqual(5 * usage.total_vcpus_usage,
+                               ret_val.vcpu_hours)
+
+    def test_usage_get_by_day_not_cached(self):
+        usage = api.nova.NovaUsage(self.usages.first())
+        self.mox.StubOutWithMock(api.nova, 'usage_get')
+        api.nova.usage_get(IsA(http.HttpRequest), self.tenant.id,
+                           'start', 'end').AndReturn(usage)
+        self.mox.ReplayAll()
+
+        ret_val = api.nova.usage_get_by_day(self.request, self.tenant.id,
+                                            'start', 'end')
+        self.assertIs(usage, ret_val)
+
     def test_server_get(self):
         server = self.servers.first()
 
@@ -18,7 +18,14 @@
 
 from __future__ import absolute_import
 
+import json
+
+from django.core.cache import cache
+import futurist
+import mock
+from mox3 import mox
 from mox3.mox import IsA
+from six import BytesIO
 
 from horizon import exceptions
 
@@ -244,6 +251,197 @@ class SwiftApiTests(test.APITestCase):
                                                  None)
         self.assertEqual(0, response['bytes'])
 
+    @mock.patch.object(api.swift, 'SEGMENT_SIZE', 4)
+    @mock.patch.object(api.swift, '_get_transfer_executor',
+                       side_effect=futurist.SynchronousExecutor)
+    def test_swift_upload_object_segmented(self, mock_executor):
+        container = self.containers.first()
+        obj = self.objects.first()
+        test_file = BytesIO(b'0123456789')
+        test_file.name = 'fake_object.jpg'
+        test_file.size = 10
+        segments_container = container.name + '_segments'
+
+        def check_manifest(manifest):
+            manifest = json.loads(manifest)
+            self.assertEqual(['etag0', 'etag1', 'etag2'],
+                             [s['etag'] for s in manifest])
+            self.assertEqual([4, 4, 2], [s['size_bytes'] for s in manifest])
+            self.assertTrue(manifest[2]['path'].startswith(
+                '/%s/%s/slo/' % (segments_container, obj.name)))
+            return True
+
+        swift_api = self.stub_swiftclient(6)
+        swift_api.put_container(segments_container)
+        for i in range(3):
+            swift_api.put_object(
+                segments_container, mox.StrContains('/%08d' % i),
+                IsA(api.swift._SegmentReader),
+                chunk_size=api.swift.CHUNK_SIZE).AndReturn('etag%d' % i)
+        swift_api.get_capabilities().AndReturn({'slo': {}})
+        swift_api.put_object(
+            container.name, obj.name, mox.Func(check_manifest),
+            query_string='multipart-manifest=put',
+            headers={'X-Object-Meta-Orig-Filename': 'fake_object.jpg'}) \
+            .AndReturn('manifest_etag')
+        self.mox.ReplayAll()
+
+        response = api.swift.swift_upload_object(self.request,
+                                                 container.name,
+                                                 obj.name,
+                                                 test_file)
+        self.assertEqual(10, response['bytes'])
+        self.assertEqual('manifest_etag', response['etag'])
+
+    @mock.patch.object(api.swift, 'SEGMENT_SIZE', 8)
+    @mock.patch.object(api.swift, '_get_transfer_executor',
+                       side_effect=futurist.SynchronousExecutor)
+    def test_swift_upload_object_segmented_dlo(self, mock_executor):
+        container = self.containers.first()
+        obj = self.objects.first()
+        test_file = BytesIO(b'0123456789')
+        test_file.name = 'fake_object.jpg'
+        test_file.size = 10
+
+        def check_headers(headers):
+            return headers['X-Object-Manifest'].startswith(
+                container.name + '_segments/')
+
+        swift_api = self.stub_swiftclient(5)
+        swift_api.put_container(container.name + '_segments')
+        swift_api.put_object(
+            container.name + '_segments', mox.IgnoreArg(),
+            IsA(api.swift._SegmentReader),
+            chunk_size=api.swift.CHUNK_SIZE).MultipleTimes()
+        swift_api.get_capabilities().AndReturn({})
+        swift_api.put_object(container.name, obj.name, '', content_length=0,
+                             headers=mox.Func(check_headers))
+        self.mox.ReplayAll()
+
+        api.swift.swift_upload_object(self.request,
+                                      container.name,
+                                      obj.name,
+                                      test_file)
+
+    def test_swift_segment_reader(self):
+        shared = BytesIO(b'0123456789')
+        lock = mock.MagicMock()
+        first = api.swift._SegmentReader(shared, lock, 0, 4)
+        second = api.swift._SegmentReader(shared, lock, 4, 4)
+
+        self.assertEqual(b'45', second.read(2))
+        self.assertEqual(b'0123', first.read())
+        self.assertEqual(b'67', second.read(8))
+        self.assertEqual(b'', second.read())
+
+    @mock.patch.object(api.swift, 'DOWNLOAD_RANGE_SIZE', 4)
+    @mock.patch.object(api.swift, '_get_transfer_executor',
+                       side_effect=futurist.SynchronousExecutor)
+    def test_swift_get_object_ranges(self, mock_executor):
+        container = self.containers.first()
+        obj = self.objects.first()
+        body = mock.MagicMock()
+        body.__iter__.return_value = iter([b'ab', b'cdef', b'ghij'])
+        headers = {'content-length': '10', 'etag': 'object_etag'}
+
+        swift_api = self.stub_swiftclient(3)
+        swift_api.get_object(
+            container.name, obj.name, resp_chunk_size=api.swift.CHUNK_SIZE
+        ).AndReturn([headers, body])
+        swift_api.get_object(
+            container.name, obj.name,
+            headers={'Range': 'bytes=4-7', 'If-Match': 'object_etag'}
+        ).AndReturn([headers, b'efgh'])
+        swift_api.get_object(
+            container.name, obj.name,
+            headers={'Range': 'bytes=8-9', 'If-Match': 'object_etag'}
+        ).AndReturn([headers, b'ij'])
+        self.mox.ReplayAll()
+
+        response = api.swift.swift_get_object(self.request, container.name,
+                                              obj.name)
+        self.assertEqual(b'abcdefghij', b''.join(response.data))
+        body.close.assert_called_once_with()
+
+    @mock.patch.object(api.swift, 'DOWNLOAD_RANGE_SIZE', 4)
+    @mock.patch.object(api.swift, '_get_transfer_executor',
+                       side_effect=futurist.SynchronousExecutor)
+    def test_swift_get_manifest_object_ranges(self, mock_executor):
+        container = self.containers.first()
+        obj = self.objects.first()
+        body = mock.MagicMock()
+        body.__iter__.return_value = iter([b'abcd'])
+        headers = {'content-length': '10', 'etag': '"manifest_etag"',
+                   'x-static-large-object': 'True'}
+
+        # The ETag of the manifest is not checked against its ranges.
+        swift_api = self.stub_swiftclient(3)
+        swift_api.get_object(
+            container.name, obj.name, resp_chunk_size=api.swift.CHUNK_SIZE
+        ).AndReturn([headers, body])
+        swift_api.get_object(
+            container.name, obj.name, headers={'Range': 'bytes=4-7'}
+        ).AndReturn([headers, b'efgh'])
+        swift_api.get_object(
+            container.name, obj.name, headers={'Range': 'bytes=8-9'}
+        ).AndReturn([headers, b'ij'])
+        self.mox.ReplayAll()
+
+        response = api.swift.swift_get_object(self.request, container.name,
+                                              obj.name)
+        self.assertEqual(b'abcdefghij', b''.join(response.data))
+
+    def test_swift_transfer_queued_runs_inline(self):
+        executor = mock.Mock()
+        # A future which no worker picked up yet.
+        executor.submit.return_value = futurist.Future()
+        transfer = api.swift._submit(executor, pow, 2, 5)
+
+        self.assertEqual(32, api.swift._result(transfer))
+        self.assertTrue(executor.submit.return_value.cancelled())
+
+    def test_swift_transfer_executor_is_shared(self):
+        self.assertIs(api.swift._get_transfer_executor(),
+                      api.swift._get_transfer_executor())
+
+    def test_swift_delete_object_slo_cluster(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        container = self.containers.first()
+        obj = self.objects.first()
+
+        swift_api = self.stub_swiftclient(3)
+        swift_api.get_capabilities().AndReturn({'slo': {}})
+        # The capabilities are cached and no object is looked up first.
+        swift_api.delete_object(container.name, obj.name,
+                                query_string='multipart-manifest=delete') \
+            .MultipleTimes()
+        self.mox.ReplayAll()
+
+        for i in range(2):
+            self.assertTrue(api.swift.swift_delete_object(
+                self.request, container.name, obj.name))
+
+    def test_swift_delete_dlo_object(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        container = self.containers.first()
+        obj = self.objects.first()
+
+        swift_api = self.stub_swiftclient(2)
+        swift_api.get_capabilities().AndReturn({})
+        swift_api.head_object(container.name, obj.name) \
+            .AndReturn({'x-object-manifest': 'segments/prefix/'})
+        swift_api.delete_object(container.name, obj.name)
+        swift_api.get_container('segments', prefix='prefix/',
+                                full_listing=True) \
+            .AndReturn([{}, [{'name': 'prefix/00000000'}]])
+        swift_api.delete_object('segments', 'prefix/00000000')
+        self.mox.ReplayAll()
+
+        self.assertTrue(api.swift.swift_delete_object(
+            self.request, container.name, obj.name))
+
     def test_swift_object_exists(self):
         container = self.containers.first()
         obj = self.objects.first()
@@ -19,9 +19,11 @@
 
 from __future__ import absolute_import
 
+from django.core.cache import cache
 from django import http
 from django.test.utils import override_settings
 from django.utils.translation import ugettext_lazy as _
+import mock
 from mox3.mox import IsA
 
 from horizon import exceptions
@@ -460,15 +462,11 @@ class QuotaTests(test.APITestCase):
 
     @test.create_stubs({api.base: ('is_service_enabled',),
                         api.neutron: ('floating_ip_supported',
-                                      'tenant_floating_ip_list',
-                                      'security_group_list',
                                       'is_extension_supported',
                                       'is_router_enabled',
                                       'is_quotas_extension_supported',
                                       'tenant_quota_get',
-                                      'network_list',
-                                      'subnet_list',
-                                      'router_list'),
+                                      'resource_count'),
                         cinder: ('is_volume_service_enabled',)})
     def _test_tenant_quota_usages_neutron_with_target(
             self, targets):
@@ -487,24 +485,19 @@ class QuotaTests(test.APITestCase):
                                            'quota_details').AndReturn(False)
         api.neutron.tenant_quota_get(IsA(http.HttpRequest), '1') \
             .AndReturn(self.neutron_quotas.first())
-        if 'network' in targets:
-            api.neutron.network_list(IsA(http.HttpRequest),
-                                     tenant_id=self.request.user.tenant_id) \
-                .AndReturn(self.networks.list())
-        if 'subnet' in targets:
-            api.neutron.subnet_list(IsA(http.HttpRequest),
-                                    tenant_id=self.request.user.tenant_id) \
-                .AndReturn(self.subnets.list())
-        if 'router' in targets:
-            api.neutron.router_list(IsA(http.HttpRequest),
-                                    tenant_id=self.request.user.tenant_id) \
-                .AndReturn(self.routers.list())
-        if 'floatingip' in targets:
-            api.neutron.tenant_floating_ip_list(IsA(http.HttpRequest)) \
-                .AndReturn(self.floating_ips.list())
-        if 'security_group' in targets:
-            api.neutron.security_group_list(IsA(http.HttpRequest)) \
-                .AndReturn(self.security_groups.list())
+        resources = (
+            ('network', 'networks', self.networks),
+            ('subnet', 'subnets', self.subnets),
+            ('router', 'routers', self.routers),
+            ('floatingip', 'floatingips', self.floating_ips),
+            ('security_group', 'security_groups', self.security_groups),
+        )
+        for quota_name, resource, data in resources:
+            if quota_name in targets:
+                api.neutron.resource_count(
+                    IsA(http.HttpRequest), resource,
+                    tenant_id=self.request.user.tenant_id) \
+                    .InAnyOrder().AndReturn(len(data.list()))
 
         self.mox.ReplayAll()
 
@@ -534,3 +527,41 @@ class QuotaTests(test.APITestCase):
         self.assertEqual(expected, quota_usages.usages)
         # Compare available resources
         self.assertAvailableQuotasEqual(expected, quota_usages.usages)
+
+    @override_settings(QUOTA_USAGES_CACHE_TIMEOUT=10)
+    @mock.patch.object(quotas, 'get_disabled_quotas', return_value=set())
+    @mock.patch.object(quotas, '_get_tenant_volume_usages')
+    @mock.patch.object(quotas, '_get_tenant_network_usages')
+    @mock.patch.object(quotas, '_get_tenant_compute_usages')
+    def test_tenant_quota_usages_cached(self, mock_compute, mock_network,
+                                        mock_volume, mock_disabled):
+        def compute_usages(request, usages, disabled_quotas, tenant_id):
+            usages.add_quota(api.base.Quota('instances', 10))
+            usages.tally('instances', 2)
+
+        def volume_usages(request, usages, disabled_quotas, tenant_id):
+            usages.add_quota(api.base.Quota('volumes', 5))
+            usages.tally('volumes', 1)
+
+        mock_compute.side_effect = compute_usages
+        mock_volume.side_effect = volume_usages
+        cache.clear()
+        self.addCleanup(cache.clear)
+
+        quota_usages = quotas.tenant_quota_usages(self.request)
+        self.assertEqual({'quota': 10, 'used': 2, 'available': 8},
+                         quota_usages['instances'])
+        self.assertEqual({'quota': 5, 'used': 1, 'available': 4},
+                         quota_usages['volumes'])
+
+        # Skip the per request memoization to reach the cache.
+        quotas.tenant_quota_usages.cache_clear()
+        quota_usages = quotas.tenant_quota_usages(self.request)
+        self.assertEqual(2, quota_usages['instances']['used'])
+        self.assertEqual(1, mock_compute.call_count)
+
+        quotas.invalidate_tenant_quota_usages(self.request)
+        quotas.tenant_quota_usages.cache_clear()
+        quotas.tenant_quota_usages(self.request)
+        self.assertEqual(2, mock_compute.call_count)
+        self.assertEqual(2, mock_network.call_count)
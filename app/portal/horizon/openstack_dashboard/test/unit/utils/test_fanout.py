@@ -0,0 +1,65 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import threading
+
+from django.test.utils import override_settings
+
+from horizon.utils import workers
+
+from openstack_dashboard.test import helpers as test
+from openstack_dashboard.utils import fanout
+
+
+def _fail():
+    raise ValueError('failed')
+
+
+class FanoutTests(test.TestCase):
+    def setUp(self):
+        super(FanoutTests, self).setUp()
+        workers.reset_executor()
+        self.addCleanup(workers.reset_executor)
+
+    def test_gather(self):
+        ret = fanout.gather(self.request, {'one': lambda: 1,
+                                           'two': (pow, 2, 5),
+                                           'fail': _fail})
+
+        self.assertEqual({'one': 1, 'two': 32}, ret)
+
+    def test_gather_raise_errors(self):
+        self.assertRaises(ValueError, fanout.gather, self.request,
+                          {'one': lambda: 1, 'fail': _fail},
+                          raise_errors=True)
+
+    @override_settings(F5SERVICES_LATENCY_BUDGET=0.1)
+    def test_gather_deadline(self):
+        release = threading.Event()
+        self.addCleanup(release.set)
+
+        ret = fanout.gather(self.request, {'fast': lambda: 1,
+                                           'slow': release.wait})
+
+        self.assertEqual({'fast': 1}, ret)
+        # The deadline is shared by all the calls of the same request.
+        ret = fanout.gather(self.request, {'slow': release.wait})
+        self.assertEqual({}, ret)
+
+    @override_settings(F5SERVICES_LATENCY_BUDGET=0.1)
+    def test_gather_deadline_raise_errors(self):
+        release = threading.Event()
+        self.addCleanup(release.set)
+
+        self.assertRaises(fanout.DeadlineExceeded, fanout.gather,
+                          self.request, {'slow': release.wait},
+                          raise_errors=True)
@@ -13,6 +13,7 @@
 from __future__ import division
 
 import datetime
+import logging
 
 from django.conf import settings
 from django.utils import timezone
@@ -24,6 +25,8 @@ from horizon import messages
 
 from openstack_dashboard import api
 
+LOG = logging.getLogger(__name__)
+
 
 class BaseUsage(object):
     show_deleted = False
@@ -33,6 +36,7 @@ class BaseUsage(object):
         self.request = request
         self.summary = {}
         self.usage_list = []
+        self.usage_iter = iter(())
 
     @property
     def today(self):
@@ -112,20 +116,15 @@ class BaseUsage(object):
     def get_usage_list(self, start, end):
         return []
 
-    def summarize(self, start, end):
-        if not api.nova.extension_supported('SimpleTenantUsage', self.request):
-            return
+    def get_usage_iter(self, start, end):
+        return iter(self.get_usage_list(start, end))
 
+    def _get_period(self, start, end):
         if start <= end and start <= self.today:
             # The API can't handle timezone aware datetime, so convert back
             # to naive UTC just for this last step.
-            start = timezone.make_naive(start, timezone.utc)
-            end = timezone.make_naive(end, timezone.utc)
-            try:
-                self.usage_list = self.get_usage_list(start, end)
-            except Exception:
-                exceptions.handle(self.request,
-                                  _('Unable to retrieve usage information.'))
+            return (timezone.make_naive(start, timezone.utc),
+                    timezone.make_naive(end, timezone.utc))
         elif end < start:
             messages.error(self.request,
                            _("Invalid time period. The end date should be "
@@ -135,11 +134,56 @@ class BaseUsage(object):
                            _("Invalid time period. You are requesting "
                              "data from the future which may not exist."))
 
+    def _add_to_summary(self, project_usage):
+        project_summary = project_usage.get_summary()
+        for key, value in project_summary.items():
+            self.summary.setdefault(key, 0)
+            self.summary[key] += value
+
+    def summarize(self, start, end):
+        if not api.nova.extension_supported('SimpleTenantUsage', self.request):
+            return
+
+        period = self._get_period(start, end)
+        if period:
+            try:
+                self.usage_list = self.get_usage_list(*period)
+            except Exception:
+                exceptions.handle(self.request,
+                                  _('Unable to retrieve usage information.'))
+
         for project_usage in self.usage_list:
-            project_summary = project_usage.get_summary()
-            for key, value in project_summary.items():
-                self.summary.setdefault(key, 0)
-                self.summary[key] += value
+            self._add_to_summary(project_usage)
+
+    def iter_usage_list(self, start, end):
+        """Return an iterator over the usages of the given period.
+
+        Unlike :meth:`summarize`, the usages are fetched from Nova only as
+        the iterator is consumed and are not kept in ``usage_list``.  The
+        summary is added up as they are yielded and is complete once the
+        iterator is exhausted.  An invalid period is reported right away,
+        errors fetching the usages are raised by the iterator.
+        """
+        if not api.nova.extension_supported('SimpleTenantUsage', self.request):
+            return iter(())
+
+        period = self._get_period(start, end)
+        if not period:
+            return iter(())
+        return self._iter_usages(*period)
+
+    def _iter_usages(self, start, end):
+        try:
+            for project_usage in self.get_usage_iter(start, end):
+                self._add_to_summary(project_usage)
+                yield project_usage
+        except Exception:
+            # The response is already being sent, so the error can not be
+            # shown to the user any more.  It is raised again to abort the
+            # stream, rather than end it with the totals of part of the
+            # usages as if they were complete.
+            LOG.exception('Unable to retrieve usage information.')
+            raise
 
     def csv_link(self):
         form = self.get_form()
@@ -156,7 +200,10 @@ class GlobalUsage(BaseUsage):
     show_deleted = True
 
     def get_usage_list(self, start, end):
-        return api.nova.usage_list(self.request, start, end)
+        return api.nova.usage_list_by_day(self.request, start, end)
+
+    def get_usage_iter(self, start, end):
+        return api.nova.usage_list_iter(self.request, start, end)
 
 
 class ProjectUsage(BaseUsage):
@@ -169,11 +216,20 @@ class ProjectUsage(BaseUsage):
         self.quotas = {}
 
     def get_usage_list(self, start, end):
+        usage = api.nova.usage_get_by_day(self.request, self.project_id,
+                                          start, end)
+        return (self._filter_instances(usage),)
+
+    def get_usage_iter(self, start, end):
+        for usage in api.nova.usage_get_iter(self.request, self.project_id,
+                                             start, end):
+            yield self._filter_instances(usage)
+
+    def _filter_instances(self, usage):
         show_deleted = self.request.GET.get('show_deleted',
                                             self.show_deleted)
         instances = []
         deleted_instances = []
-        usage = api.nova.usage_get(self.request, self.project_id, start, end)
         # Attribute may not exist if there are no instances
         if hasattr(usage, 'server_usages'):
             now = self.today
@@ -188,7 +244,7 @@ class ProjectUsage(BaseUsage):
                 else:
                     instances.append(server_usage)
         usage.server_usages = instances
-        return (usage,)
+        return usage
 
     def get_limits(self):
         try:
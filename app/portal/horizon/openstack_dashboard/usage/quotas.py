@@ -14,10 +14,13 @@ from collections import defaultdict
 import itertools
 import logging
 
+from django.conf import settings
+from django.core.cache import cache
 from django.utils.translation import ugettext_lazy as _
 
 from horizon import exceptions
 from horizon.utils.memoized import memoized
+from horizon.utils import workers
 
 from openstack_dashboard.api import base
 from openstack_dashboard.api import cinder
@@ -349,24 +352,24 @@ def _get_tenant_network_usages_legacy(request, usages, disabled_quotas,
         usages.add_quota(quota)
 
     # TODO(amotoki): Add security_group_rule?
-    resource_lister = {
-        'network': (neutron.network_list, {'tenant_id': tenant_id}),
-        'subnet': (neutron.subnet_list, {'tenant_id': tenant_id}),
-        'port': (neutron.port_list, {'tenant_id': tenant_id}),
-        'router': (neutron.router_list, {'tenant_id': tenant_id}),
-        'floatingip': (neutron.tenant_floating_ip_list, {}),
-        'security_group': (neutron.security_group_list, {}),
+    # Only the ids of the resources are retrieved to count them.
+    resources = {
+        'network': 'networks',
+        'subnet': 'subnets',
+        'port': 'ports',
+        'router': 'routers',
+        'floatingip': 'floatingips',
+        'security_group': 'security_groups',
     }
 
-    for quota_name, lister_info in resource_lister.items():
+    for quota_name, resource in resources.items():
         if quota_name not in disabled_quotas:
-            lister = lister_info[0]
-            kwargs = lister_info[1]
             try:
-                resources = lister(request, **kwargs)
+                count = neutron.resource_count(request, resource,
+                                               tenant_id=tenant_id)
             except Exception:
-                resources = []
-            usages.tally(quota_name, len(resources))
+                count = 0
+            usages.tally(quota_name, count)
 
 
 @profiler.trace
@@ -388,6 +391,42 @@ def _get_tenant_volume_usages(request, usages, disabled_quotas, tenant_id):
                              disabled_quotas)
 
 
+def _usages_generation_key(request, tenant_id):
+    return 'quota_usages:%s:%s:generation' % (request.user.services_region,
+                                             tenant_id)
+
+
+def _usages_cache_key(request, tenant_id, targets):
+    generation = cache.get(_usages_generation_key(request, tenant_id), 0)
+    return 'quota_usages:%s:%s:%s:%s' % (
+        request.user.services_region, tenant_id, generation,
+        ','.join(sorted(targets or ())))
+
+
+def invalidate_tenant_quota_usages(request, tenant_id=None):
+    """Drop the cached quota usages of a project.
+
+    Call this after creating or deleting resources which count against the
+    quotas of the project, so the next forms and overview pages show the
+    new usage.
+    """
+    key = _usages_generation_key(request,
+                                 tenant_id or request.user.project_id)
+    # Bump the generation instead of deleting the entries, as the usages
+    # are cached separately for every set of targets.
+    if not cache.add(key, 1, None):
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, 1, None)
+
+
+def _collect_usages(collector, request, disabled_quotas, tenant_id):
+    usages = QuotaUsage()
+    collector(request, usages, disabled_quotas, tenant_id)
+    return usages
+
+
 # TODO(amotoki): Merge tenant_quota_usages and tenant_limit_usages.
 # These two functions are similar. There seems no reason to have both.
 
@@ -396,6 +435,10 @@ def _get_tenant_volume_usages(request, usages, disabled_quotas, tenant_id):
 def tenant_quota_usages(request, tenant_id=None, targets=None):
     """Get our quotas and construct our usage object.
 
+    Compute, network and volume usages are retrieved concurrently.  The
+    result is cached for QUOTA_USAGES_CACHE_TIMEOUT seconds, see
+    :func:`invalidate_tenant_quota_usages`.
+
     :param tenant_id: Target tenant ID. If no tenant_id is provided,
         a the request.user.project_id is assumed to be used.
     :param targets: A tuple of quota names to be retrieved.
@@ -404,8 +447,14 @@ def tenant_quota_usages(request, tenant_id=None, targets=None):
     if not tenant_id:
         tenant_id = request.user.project_id
 
+    timeout = getattr(settings, 'QUOTA_USAGES_CACHE_TIMEOUT', 10)
+    if timeout:
+        cache_key = _usages_cache_key(request, tenant_id, targets)
+        usages = cache.get(cache_key)
+        if usages is not None:
+            return usages
+
     disabled_quotas = get_disabled_quotas(request)
-    usages = QuotaUsage()
 
     if targets:
         if set(targets) - QUOTA_FIELDS:
@@ -415,10 +464,23 @@ def tenant_quota_usages(request, tenant_id=None, targets=None):
         enabled_quotas &= set(targets)
         disabled_quotas = set(QUOTA_FIELDS) - enabled_quotas
 
-    _get_tenant_compute_usages(request, usages, disabled_quotas, tenant_id)
-    _get_tenant_network_usages(request, usages, disabled_quotas, tenant_id)
-    _get_tenant_volume_usages(request, usages, disabled_quotas, tenant_id)
+    collectors = {
+        'compute': _get_tenant_compute_usages,
+        'network': _get_tenant_network_usages,
+        'volume': _get_tenant_volume_usages,
+    }
+    results = workers.gather(
+        dict((name, (_collect_usages, collector, request, disabled_quotas,
+                     tenant_id))
+             for name, collector in collectors.items()),
+        raise_errors=True, name='tenant_quota_usages')
+
+    usages = QuotaUsage()
+    for name in sorted(results):
+        usages.usages.update(results[name].usages)
 
+    if timeout:
+        cache.set(cache_key, usages, timeout)
     return usages
 
 
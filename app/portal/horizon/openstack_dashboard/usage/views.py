@@ -15,6 +15,7 @@ from django.utils.translation import ugettext_lazy as _
 
 from horizon import exceptions
 from horizon import tables
+from horizon.utils import csvbase
 from openstack_dashboard import api
 from openstack_dashboard.usage import base
 
@@ -37,16 +38,31 @@ class UsageView(tables.DataTableView):
                     ".".join((self.template_name.rsplit('.', 1)[0], 'csv')))
         return self.template_name
 
+    def get_csv_footer_template_name(self):
+        return "%s_summary.csv" % self.get_template_names().rsplit('.', 1)[0]
+
     def get_content_type(self):
         if self.request.GET.get('format', 'html') == 'csv':
             return "text/csv"
         return "text/html"
 
+    def streams_csv(self):
+        return (self.request.GET.get('format', 'html') == 'csv' and
+                issubclass(self.csv_response_class,
+                           csvbase.BaseCsvStreamingResponse))
+
     def get_data(self):
         try:
             project_id = self.kwargs.get('project_id',
                                          self.request.user.tenant_id)
             self.usage = self.usage_class(self.request, project_id)
+            if self.streams_csv():
+                # The CSV rows are written as the usages are fetched, the
+                # summary follows them.
+                self.usage.usage_iter = self.usage.iter_usage_list(
+                    *self.usage.get_date_range())
+                self.kwargs['usage'] = self.usage
+                return []
             self.usage.summarize(*self.usage.get_date_range())
             self.kwargs['usage'] = self.usage
             return self.usage.usage_list
@@ -72,6 +88,9 @@ class UsageView(tables.DataTableView):
         if self.request.GET.get('format', 'html') == 'csv':
             render_class = self.csv_response_class
             response_kwargs.setdefault("filename", "usage.csv")
+            if self.streams_csv():
+                response_kwargs.setdefault(
+                    "footer_template", self.get_csv_footer_template_name())
         else:
             render_class = self.response_class
         context = self.render_context_with_title(context)
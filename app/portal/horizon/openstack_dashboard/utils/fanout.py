@@ -0,0 +1,53 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Concurrent calls to ADCaaS and OpenStack APIs bounded by a page deadline.
+
+The f5services views gather data from ADCaaS, Nova, Glance and Neutron for
+a single page.  :func:`gather` runs such calls on the horizon worker pool
+and stops waiting for them once the latency budget of the current request,
+F5SERVICES_LATENCY_BUDGET seconds, is used up.  Calls that did not finish
+in time are left out of the results so the page can render with partial
+data, and calls that did not start yet are cancelled.
+"""
+
+import time
+
+from django.conf import settings
+
+from horizon.utils import workers
+
+DeadlineExceeded = workers.DeadlineExceeded
+
+
+def get_deadline(request):
+    """Return the time by which the data for ``request`` must be gathered.
+
+    The deadline is set when it is first asked for, and is shared by all
+    later :func:`gather` calls made while handling the same request.
+    """
+    deadline = getattr(request, '_fanout_deadline', None)
+    if deadline is None:
+        deadline = (time.time() +
+                    getattr(settings, 'F5SERVICES_LATENCY_BUDGET', 10))
+        request._fanout_deadline = deadline
+    return deadline
+
+
+def gather(request, calls, raise_errors=False):
+    """Run ``calls`` concurrently within the deadline of ``request``.
+
+    See :func:`horizon.utils.workers.gather` for ``calls``, the returned
+    results and ``raise_errors``.
+    """
+    return workers.gather(calls, deadline=get_deadline(request),
+                          raise_errors=raise_errors, name=request.path)
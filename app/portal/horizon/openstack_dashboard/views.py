@@ -28,6 +28,7 @@ import horizon
 from horizon import base
 from horizon import exceptions
 from horizon import notifications
+from horizon.utils import urls
 
 LOG = logging.getLogger(__name__)
 
@@ -74,7 +75,7 @@ def splash(request):
 def get_url_with_pagination(request, marker_name, prev_marker_name, url_string,
                             object_id=None):
     if object_id:
-        url = urlresolvers.reverse(url_string, args=(object_id,))
+        url = urls.reverse_with_id(request, url_string, object_id)
     else:
         url = urlresolvers.reverse(url_string)
     marker = request.GET.get(marker_name, None)
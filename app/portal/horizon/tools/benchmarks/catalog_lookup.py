@@ -0,0 +1,126 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Benchmark service catalog endpoint lookups.
+
+Compares walking the catalog with ``get_service_from_catalog`` and
+``get_url_for_service``, as ``url_for`` did before, with lookups in the
+``ServiceCatalogIndex`` of the catalog.  The catalogs have one endpoint per
+interface for each service in each region, and the lookups ask for the
+services of the last region, the worst case of the walk.
+
+Run from the horizon directory::
+
+    python tools/benchmarks/catalog_lookup.py --regions 1 --regions 20
+"""
+
+from __future__ import print_function
+
+import argparse
+import json
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE',
+                      'openstack_dashboard.test.settings')
+
+import django  # noqa: E402
+
+django.setup()
+
+from openstack_dashboard.api import base  # noqa: E402
+
+SERVICE_TYPES = ('identity', 'compute', 'network', 'image', 'volumev3',
+                 'object-store', 'orchestration', 'metering', 'dns',
+                 'load-balancer', 'key-manager', 'placement')
+INTERFACES = ('public', 'internal', 'admin')
+
+
+def make_catalog(regions, services):
+    catalog = []
+    for service_type in SERVICE_TYPES[:services]:
+        endpoints = []
+        for region in range(regions):
+            for interface in INTERFACES:
+                endpoints.append({
+                    'region_id': 'Region%d' % region,
+                    'interface': interface,
+                    'url': 'http://%s.%s.%d.example.com' % (
+                        interface, service_type, region)})
+        catalog.append({'type': service_type, 'name': service_type,
+                        'endpoints': endpoints})
+    return catalog
+
+
+def walk(catalog, lookups):
+    for service_type, region in lookups:
+        service = base.get_service_from_catalog(catalog, service_type)
+        base.get_url_for_service(service, region, 'internalURL')
+
+
+def indexed(index, lookups):
+    for service_type, region in lookups:
+        index.url_for(service_type, region, 'internalURL')
+
+
+def best_of(func, repeat, number):
+    return min(timeit.repeat(func, number=number, repeat=repeat)) / number
+
+
+def run(regions, services, repeat):
+    catalog = make_catalog(regions, services)
+    region = 'Region%d' % (regions - 1)
+    lookups = [(service_type, region)
+               for service_type in SERVICE_TYPES[:services]]
+    index = base.ServiceCatalogIndex(catalog)
+    results = {'regions': regions, 'services': services,
+               'endpoints': regions * services * len(INTERFACES)}
+    results['walk_us'] = best_of(lambda: walk(catalog, lookups),
+                                 repeat, 100) / len(lookups) * 1e6
+    results['index_us'] = best_of(lambda: indexed(index, lookups),
+                                  repeat, 100) / len(lookups) * 1e6
+    results['build_us'] = best_of(lambda: base.ServiceCatalogIndex(catalog),
+                                  repeat, 10) * 1e6
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--regions', type=int, action='append',
+                        help='Number of regions in the catalog, may be given '
+                             'several times (default: 1, 5, 20 and 50)')
+    parser.add_argument('--services', type=int, default=len(SERVICE_TYPES),
+                        help='Number of services in the catalog, at most %d'
+                             % len(SERVICE_TYPES))
+    parser.add_argument('--repeat', type=int, default=5,
+                        help='Runs per measurement, the best one is kept')
+    parser.add_argument('--json', action='store_true',
+                        help='Print the results as JSON')
+    parsed_args = parser.parse_args()
+
+    results = [run(regions, parsed_args.services, parsed_args.repeat)
+               for regions in parsed_args.regions or [1, 5, 20, 50]]
+    if parsed_args.json:
+        print(json.dumps(results, indent=2, sort_keys=True))
+        return
+    for result in results:
+        print('%(regions)d regions, %(services)d services, '
+              '%(endpoints)d endpoints' % result)
+        print('  per lookup: walk %(walk_us).2f us, '
+              'index %(index_us).2f us' % result)
+        print('  index build: %(build_us).1f us' % result)
+
+
+if __name__ == '__main__':
+    main()
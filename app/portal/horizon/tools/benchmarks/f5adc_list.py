@@ -0,0 +1,156 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Benchmark decoding and wrapping of ADCaaS ADC list responses.
+
+Compares the former ``__getattribute__`` based ADC wrapper and the plain
+``json.loads`` decoding with the slotted ``ADCInstance`` wrapper and the
+streamed decoding of ``f5wafaas.adc_iter``.  The row cost reads the
+attributes the ADC index table reads for every row.
+
+Run from the horizon directory::
+
+    python tools/benchmarks/f5adc_list.py --rows 1000 --rows 5000
+"""
+
+from __future__ import print_function
+
+import argparse
+import json
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE',
+                      'openstack_dashboard.test.settings')
+
+import django  # noqa: E402
+
+django.setup()
+
+from openstack_dashboard.api import base  # noqa: E402
+from openstack_dashboard.api import f5wafaas  # noqa: E402
+
+# Attributes read per row by f5adc.tables.InstancesTable.
+ROW_ATTRS = ('id', 'name', 'type', 'status', 'lastErr', 'createdAt',
+             'management')
+ROW_OPTIONAL_ATTRS = ('image_name', 'full_flavor')
+
+
+class LegacyADCInstance(base.APIResourceWrapper):
+    """The ADC wrapper as it was before ADCInstance used slots."""
+    _attrs = ['id', 'type', 'name', 'networks', 'compute', 'management',
+              'status', 'lastErr', 'tenantId']
+
+    def __init__(self, apiresource, request):
+        super(LegacyADCInstance, self).__init__(apiresource)
+        self.request = request
+
+    def __getattribute__(self, attr):
+        try:
+            return object.__getattribute__(self, attr)
+        except AttributeError:
+            try:
+                return self._apiresource[attr]
+            except KeyError:
+                raise AttributeError(attr)
+
+
+def make_body(rows):
+    adcs = []
+    for i in range(rows):
+        adcs.append({
+            'id': 'adc-%06d' % i,
+            'name': 'adc %d' % i,
+            'type': 'HW' if i % 2 else 'VE',
+            'status': 'ACTIVE',
+            'lastErr': '',
+            'createdAt': '2019-01-01T00:00:00.000Z',
+            'tenantId': 'tenant',
+            'networks': {'mgmt1': {'type': 'mgmt', 'networkId': 'net'}},
+            'compute': {'imageRef': 'image', 'flavorRef': 'flavor',
+                        'userData': 'x' * 256},
+            'management': {'vmId': 'vm-%d' % i,
+                           'connection': {'ipAddress': '10.0.0.1'},
+                           'networks': {}},
+        })
+    return json.dumps({'adcs': adcs}).encode('utf-8')
+
+
+def decode_full(body, wrapper):
+    items = json.loads(body.decode('utf-8'))['adcs']
+    return [wrapper(item, None) for item in items]
+
+
+def decode_streamed(body, wrapper):
+    size = f5wafaas.STREAM_CHUNK_SIZE
+    chunks = (body[i:i + size].decode('utf-8')
+              for i in range(0, len(body), size))
+    return [wrapper(item, None)
+            for item in f5wafaas._iter_collection(chunks, 'adcs')]
+
+
+def render_rows(adcs):
+    for adc in adcs:
+        for attr in ROW_ATTRS:
+            getattr(adc, attr)
+        for attr in ROW_OPTIONAL_ATTRS:
+            hasattr(adc, attr)
+
+
+def best_of(func, repeat):
+    return min(timeit.repeat(func, number=1, repeat=repeat))
+
+
+def run(rows, repeat):
+    body = make_body(rows)
+    results = {'rows': rows, 'body_bytes': len(body)}
+    for label, wrapper in (('legacy', LegacyADCInstance),
+                           ('slotted', f5wafaas.ADCInstance)):
+        adcs = decode_full(body, wrapper)
+        results['%s_row_us' % label] = best_of(
+            lambda: render_rows(adcs), repeat) / rows * 1e6
+        results['%s_wrap_ms' % label] = best_of(
+            lambda: decode_full(body, wrapper), repeat) * 1e3
+    results['streamed_wrap_ms'] = best_of(
+        lambda: decode_streamed(body, f5wafaas.ADCInstance), repeat) * 1e3
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, action='append',
+                        help='Number of ADCs in the response, may be given '
+                             'several times (default: 1000 and 5000)')
+    parser.add_argument('--repeat', type=int, default=5,
+                        help='Runs per measurement, the best one is kept')
+    parser.add_argument('--json', action='store_true',
+                        help='Print the results as JSON')
+    parsed_args = parser.parse_args()
+
+    results = [run(rows, parsed_args.repeat)
+               for rows in parsed_args.rows or [1000, 5000]]
+    if parsed_args.json:
+        print(json.dumps(results, indent=2, sort_keys=True))
+        return
+    for result in results:
+        print('%(rows)d ADCs, %(body_bytes)d bytes' % result)
+        print('  per-row attribute reads: legacy %(legacy_row_us).2f us, '
+              'slotted %(slotted_row_us).2f us' % result)
+        print('  decode and wrap: legacy %(legacy_wrap_ms).1f ms, '
+              'slotted %(slotted_wrap_ms).1f ms, '
+              'streamed %(streamed_wrap_ms).1f ms' % result)
+
+
+if __name__ == '__main__':
+    main()
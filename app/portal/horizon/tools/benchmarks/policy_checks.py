@@ -0,0 +1,123 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Benchmark the policy checks made while rendering a table.
+
+A table render checks the policy rules of every row action for every row,
+with the project of the row as target, like ``PolicyTargetMixin`` does.
+The rows belong to ``--projects`` projects, one for a project view and more
+for an admin view.  The checks are timed with the decisions cached on the
+request, as ``openstack_auth.policy.check`` does, and with the cache dropped
+before each check, as it behaved before.
+
+Run from the horizon directory::
+
+    python tools/benchmarks/policy_checks.py --rows 200 --actions 25
+"""
+
+from __future__ import print_function
+
+import argparse
+import json
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE',
+                      'openstack_dashboard.test.settings')
+
+import django  # noqa: E402
+
+django.setup()
+
+from django import http  # noqa: E402
+from django.conf import settings  # noqa: E402
+import mock  # noqa: E402
+
+from openstack_auth import policy  # noqa: E402
+from openstack_auth import user as auth_user  # noqa: E402
+from openstack_auth import utils as auth_utils  # noqa: E402
+
+
+def make_user(request=None):
+    return auth_user.User(id='user', user='demo', project_id='project0',
+                          project_name='demo', user_domain_id='default',
+                          roles=[{'id': '1', 'name': 'member'}])
+
+
+def get_actions(count):
+    path = os.path.join(settings.POLICY_FILES_PATH,
+                        settings.POLICY_FILES['compute'])
+    with open(path) as f:
+        rules = sorted(rule for rule in json.load(f)
+                       if rule.startswith('os_compute_api:'))
+    return [(('compute', rule),) for rule in rules[:count]]
+
+
+def render(actions, rows, projects, cached):
+    request = http.HttpRequest()
+    for row in range(rows):
+        target = {'project_id': 'project%d' % (row % projects)}
+        for action in actions:
+            if not cached:
+                request._policy_cache = None
+            policy.check(action, request, dict(target))
+    return request
+
+
+def run(rows, actions, projects, repeat):
+    actions = get_actions(actions)
+    results = {'rows': rows, 'actions': len(actions), 'projects': projects,
+               'checks': rows * len(actions)}
+    for name, cached in (('uncached', False), ('cached', True)):
+        results['%s_ms' % name] = min(timeit.repeat(
+            lambda: render(actions, rows, projects, cached),
+            number=1, repeat=repeat)) * 1e3
+    request = render(actions, rows, projects, True)
+    results['enforcements'] = len(request._policy_cache['decisions'])
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, action='append',
+                        help='Number of rows in the table, may be given '
+                             'several times (default: 20, 200 and 1000)')
+    parser.add_argument('--actions', type=int, default=25,
+                        help='Number of row actions of the table')
+    parser.add_argument('--projects', type=int, default=1,
+                        help='Number of projects the rows belong to')
+    parser.add_argument('--repeat', type=int, default=5,
+                        help='Runs per measurement, the best one is kept')
+    parser.add_argument('--json', action='store_true',
+                        help='Print the results as JSON')
+    parsed_args = parser.parse_args()
+
+    policy.reset()
+    with mock.patch.object(auth_utils, 'get_user', side_effect=make_user):
+        results = [run(rows, parsed_args.actions, parsed_args.projects,
+                       parsed_args.repeat)
+                   for rows in parsed_args.rows or [20, 200, 1000]]
+    if parsed_args.json:
+        print(json.dumps(results, indent=2, sort_keys=True))
+        return
+    for result in results:
+        print('%(rows)d rows, %(actions)d actions, %(projects)d projects, '
+              '%(checks)d checks' % result)
+        print('  per render: uncached %(uncached_ms).1f ms, '
+              'cached %(cached_ms).1f ms' % result)
+        print('  enforcements when cached: %(enforcements)d' % result)
+
+
+if __name__ == '__main__':
+    main()
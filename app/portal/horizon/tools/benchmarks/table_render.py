@@ -0,0 +1,330 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Benchmark the rendering of data tables over synthetic datasets.
+
+Builds the rows of real dashboard tables, the part of a table page whose
+cost grows with the data, over generated ADCs or servers.  The API calls
+made by the row actions are mocked.  Each render uses a new request, as a
+page load does, with the policy checks of ``openstack_auth.policy``.
+
+For each table and size the best render time is measured, then one more
+render counts the policy checks and URL reversals per row and traces the
+memory allocated while rendering.  ``--row-cache`` renders with the rows
+cached, after a first render filled the cache.
+
+The JSON output records the commit it was run on.  It can be given to a
+later run with ``--compare`` to print the change of each measurement::
+
+    python tools/benchmarks/table_render.py --json > before.json
+    git checkout other-branch
+    python tools/benchmarks/table_render.py --compare before.json
+
+Run from the horizon directory::
+
+    python tools/benchmarks/table_render.py --table f5adc --rows 1000
+"""
+
+from __future__ import print_function
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import timeit
+
+try:
+    import tracemalloc
+except ImportError:
+    tracemalloc = None
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE',
+                      'openstack_dashboard.test.settings')
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.test.client import RequestFactory  # noqa: E402
+from django.test.utils import override_settings  # noqa: E402
+from django import urls  # noqa: E402
+import mock  # noqa: E402
+
+from openstack_auth import policy  # noqa: E402
+from openstack_auth import user as auth_user  # noqa: E402
+from openstack_auth import utils as auth_utils  # noqa: E402
+
+from openstack_dashboard import api  # noqa: E402
+from openstack_dashboard.dashboards.f5services.f5adc import (  # noqa: E402
+    tables as f5adc_tables)
+from openstack_dashboard.dashboards.project.instances import (  # noqa: E402
+    tables as instances_tables)
+
+ADC_STATUSES = ('ACTIVE', 'ACTIVE', 'ACTIVE', 'POWERERROR', 'INSTALLING')
+SERVER_STATUSES = ('ACTIVE', 'ACTIVE', 'ACTIVE', 'SHUTOFF', 'ERROR')
+
+
+class Resource(object):
+    """A stand-in for the resources returned by the API clients."""
+
+    def __init__(self, info):
+        self.__dict__.update(info)
+
+
+FLAVOR = Resource({'id': 'flavor', 'name': 'm1.medium', 'ram': 4096,
+                   'disk': 40, 'vcpus': 2})
+
+
+def make_adcs(rows, request):
+    adcs = []
+    for i in range(rows):
+        adc = api.f5wafaas.ADCInstance({
+            'id': 'adc-%06d' % i,
+            'name': 'adc %d' % i,
+            'type': 'HW' if i % 2 else 'VE',
+            'status': ADC_STATUSES[i % len(ADC_STATUSES)],
+            'lastErr': '',
+            'createdAt': '2019-01-01T00:00:00.000Z',
+            'tenantId': 'project',
+            'networks': {'mgmt1': {'type': 'mgmt', 'networkId': 'net'},
+                         'ext1': {'type': 'ext', 'networkId': 'net'}},
+            'compute': {'imageRef': 'image', 'flavorRef': 'flavor'},
+            'management': {'vmId': 'vm-%d' % i,
+                           'connection': {'ipAddress': '10.0.0.1'},
+                           'networks': {
+                               'mgmt1': {'fixedIp': '10.0.%d.%d' % (
+                                   i // 250 % 250, i % 250)},
+                               'ext1': {'fixedIp': '172.16.%d.%d' % (
+                                   i // 250 % 250, i % 250)}}},
+        }, request)
+        adc.image_name = 'BIGIP-15.1'
+        adc.full_flavor = FLAVOR
+        adcs.append(adc)
+    return adcs
+
+
+def make_servers(rows, request):
+    servers = []
+    for i in range(rows):
+        server = api.nova.Server(Resource({
+            'id': 'server-%06d' % i,
+            'name': 'server %d' % i,
+            'status': SERVER_STATUSES[i % len(SERVER_STATUSES)],
+            'tenant_id': 'project',
+            'user_id': 'user',
+            'image': {'id': 'image', 'name': 'cirros'},
+            'flavor': {'id': 'flavor'},
+            'key_name': 'keypair',
+            'created': '2019-01-01T00:00:00Z',
+            'locked': False,
+            'addresses': {'private': [{
+                'addr': '10.0.%d.%d' % (i // 250 % 250, i % 250),
+                'version': 4,
+                'OS-EXT-IPS:type': 'fixed'}]},
+            'OS-EXT-STS:power_state': 1,
+            'OS-EXT-STS:task_state': None,
+            'OS-EXT-AZ:availability_zone': 'nova',
+        }), request)
+        server.full_flavor = FLAVOR
+        servers.append(server)
+    return servers
+
+
+# The tables benchmarked, their data and the path they are rendered at.
+TABLES = {
+    'f5adc': (f5adc_tables.InstancesTable, make_adcs, '/f5services/f5adc/'),
+    'f5adc-adcs': (f5adc_tables.ADCsTable, make_adcs, '/f5services/f5adc/'),
+    'instances': (instances_tables.InstancesTable, make_servers,
+                  '/project/instances/'),
+}
+
+# Calls made by the row actions to decide whether they are allowed.
+API_MOCKS = (
+    (api.base, 'is_service_enabled', True),
+    (api.cinder, 'is_volume_service_enabled', True),
+    (api.nova, 'extension_supported', True),
+    (api.nova, 'is_feature_available', True),
+    (api.neutron, 'floating_ip_supported', True),
+    (api.neutron, 'floating_ip_simple_associate_supported', False),
+)
+
+USER = auth_user.User(id='user', user='demo', project_id='project',
+                      project_name='demo', tenant_id='project',
+                      user_domain_id='default', services_region='RegionOne',
+                      roles=[{'id': '1', 'name': 'member'}])
+
+
+def make_request(path):
+    request = RequestFactory().get(path)
+    request.user = USER
+    request.session = {}
+    return request
+
+
+def render(table_class, data, path):
+    table = table_class(make_request(path), data)
+    return [row.render() for row in table.get_rows()]
+
+
+def best_of(func, repeat):
+    return min(timeit.repeat(func, number=1, repeat=repeat))
+
+
+def count_calls(func):
+    """Run ``func`` and count its policy checks and URL reversals."""
+    counts = {'policy': 0, 'reverse': 0}
+    check = policy.check
+    resolver_class = type(urls.get_resolver())
+    reverse = resolver_class._reverse_with_prefix
+
+    def counted_check(*args, **kwargs):
+        counts['policy'] += 1
+        return check(*args, **kwargs)
+
+    def counted_reverse(self, *args, **kwargs):
+        counts['reverse'] += 1
+        return reverse(self, *args, **kwargs)
+
+    with mock.patch.object(policy, 'check', counted_check), \
+            mock.patch.object(resolver_class, '_reverse_with_prefix',
+                              counted_reverse):
+        result = func()
+    return result, counts
+
+
+def trace_memory(func):
+    """Run ``func`` and return the peak of the memory it allocated."""
+    if tracemalloc is None:
+        return None
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def run(name, rows, repeat, row_cache):
+    table_class, make_data, path = TABLES[name]
+    data = make_data(rows, make_request(path))
+
+    def do_render():
+        return render(table_class, data, path)
+
+    results = {'table': name, 'rows': rows, 'row_cache': row_cache}
+    with mock.patch.object(table_class._meta, 'row_cache_timeout',
+                           3600 if row_cache else None):
+        if row_cache:
+            do_render()
+        results['render_ms'] = best_of(do_render, repeat) * 1e3
+        html, counts = count_calls(do_render)
+        peak = trace_memory(do_render)
+    results['row_us'] = results['render_ms'] * 1e3 / rows
+    results['html_kib'] = sum(len(row) for row in html) / 1024.0
+    results['policy_checks_per_row'] = counts['policy'] / float(rows)
+    results['reverses_per_row'] = counts['reverse'] / float(rows)
+    results['peak_kib'] = None if peak is None else peak / 1024.0
+    results['alloc_bytes_per_row'] = None if peak is None else peak / rows
+    return results
+
+
+def get_commit():
+    try:
+        return subprocess.check_output(
+            ['git', 'rev-parse', 'HEAD'],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            stderr=subprocess.STDOUT).decode('utf-8').strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, baseline_path):
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+    before = dict(((result['table'], result['rows'], result['row_cache']),
+                   result) for result in baseline['results'])
+    print('Compared with %s (commit %s)' % (baseline_path,
+                                            baseline.get('commit')))
+    for result in results:
+        old = before.get((result['table'], result['rows'],
+                          result['row_cache']))
+        if old is None:
+            continue
+        print('%(table)s, %(rows)d rows' % result)
+        for key in ('render_ms', 'policy_checks_per_row',
+                    'reverses_per_row', 'alloc_bytes_per_row'):
+            if not old.get(key) or result.get(key) is None:
+                continue
+            print('  %s: %.2f -> %.2f (%+.1f%%)' % (
+                key, old[key], result[key],
+                (result[key] - old[key]) * 100.0 / old[key]))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--table', action='append', choices=sorted(TABLES),
+                        help='Table to render, may be given several times '
+                             '(default: all of them)')
+    parser.add_argument('--rows', type=int, action='append',
+                        help='Number of rows, may be given several times '
+                             '(default: 100, 1000 and 10000)')
+    parser.add_argument('--row-cache', action='store_true',
+                        help='Render with the rows cached')
+    parser.add_argument('--repeat', type=int, default=3,
+                        help='Runs per measurement, the best one is kept')
+    parser.add_argument('--json', action='store_true',
+                        help='Print the results as JSON')
+    parser.add_argument('--compare', metavar='FILE',
+                        help='JSON output of an earlier run to compare with')
+    parsed_args = parser.parse_args()
+
+    patchers = [mock.patch.object(module, attr, return_value=value)
+                for module, attr, value in API_MOCKS]
+    patchers.append(mock.patch.object(auth_utils, 'get_user',
+                                      return_value=USER))
+    for patcher in patchers:
+        patcher.start()
+    try:
+        with override_settings(
+                POLICY_CHECK_FUNCTION='openstack_auth.policy.check'):
+            results = [run(name, rows, parsed_args.repeat,
+                           parsed_args.row_cache)
+                       for name in parsed_args.table or sorted(TABLES)
+                       for rows in parsed_args.rows or [100, 1000, 10000]]
+    finally:
+        for patcher in patchers:
+            patcher.stop()
+
+    if parsed_args.json:
+        print(json.dumps({'commit': get_commit(),
+                          'python': platform.python_version(),
+                          'django': django.get_version(),
+                          'results': results}, indent=2, sort_keys=True))
+        return
+    if parsed_args.compare:
+        compare(results, parsed_args.compare)
+        return
+    for result in results:
+        print('%(table)s, %(rows)d rows: %(render_ms).1f ms, '
+              '%(row_us).1f us per row, %(html_kib).0f KiB' % result)
+        print('  per row: %(policy_checks_per_row).1f policy checks, '
+              '%(reverses_per_row).1f URL reversals' % result)
+        if result['peak_kib'] is not None:
+            print('  allocated: %(peak_kib).0f KiB peak, '
+                  '%(alloc_bytes_per_row).0f bytes per row' % result)
+
+
+if __name__ == '__main__':
+    main()